@@ -0,0 +1,87 @@
+"""
+citydata XML 파싱 마이크로 벤치마크.
+기존 방식(ET.fromstring + './/' 탐색 15회)과 스트리밍 파서(parse_citydata)를 샘플 payload로 비교합니다.
+샘플은 citydata_payload.py로 만든 합성 payload(synthetic_*.xml)입니다. 실제 응답을 캡처한 파일을 같은 디렉토리에 두면 함께 측정합니다.
+
+실행 (fastapi-app 디렉토리에서):
+    python -m benchmarks.bench_citydata_parser [--repeat 200] [--samples benchmarks/samples]
+"""
+import argparse
+import glob
+import os
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from src.data.population.citydata_parser import parse_citydata
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), "samples")
+
+
+def legacy_parse(payload: bytes):
+    # 기존 fetch_population_data의 파싱 방식
+    root = ET.fromstring(payload.decode("utf-8"))
+    rows = []
+    for citydata in root.findall(".//CITYDATA"):
+        rows.append({
+            "datetime": datetime.strptime(citydata.find(".//LIVE_PPLTN_STTS//PPLTN_TIME").text, "%Y-%m-%d %H:%M"),
+            "region_id": citydata.find("AREA_CD").text,
+            "male_rate": float(citydata.find(".//LIVE_PPLTN_STTS//MALE_PPLTN_RATE").text),
+            "female_rate": float(citydata.find(".//LIVE_PPLTN_STTS//FEMALE_PPLTN_RATE").text),
+            "area_congest": citydata.find(".//LIVE_PPLTN_STTS/AREA_CONGEST_LVL").text,
+            "congestion_message": citydata.find(".//LIVE_PPLTN_STTS/AREA_CONGEST_MSG").text,
+            "gen_10": float(citydata.find(".//LIVE_PPLTN_STTS//PPLTN_RATE_10").text),
+            "gen_20": float(citydata.find(".//LIVE_PPLTN_STTS//PPLTN_RATE_20").text),
+            "gen_30": float(citydata.find(".//LIVE_PPLTN_STTS//PPLTN_RATE_30").text),
+            "gen_40": float(citydata.find(".//LIVE_PPLTN_STTS//PPLTN_RATE_40").text),
+            "gen_50": float(citydata.find(".//LIVE_PPLTN_STTS//PPLTN_RATE_50").text),
+            "gen_60": float(citydata.find(".//LIVE_PPLTN_STTS//PPLTN_RATE_60").text),
+            "gen_70": float(citydata.find(".//LIVE_PPLTN_STTS//PPLTN_RATE_70").text),
+            "min_population": int(citydata.find(".//LIVE_PPLTN_STTS/AREA_PPLTN_MIN").text),
+            "max_population": int(citydata.find(".//LIVE_PPLTN_STTS/AREA_PPLTN_MAX").text),
+        })
+    return rows
+
+
+def measure(parse, payload: bytes, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(payload)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    parse(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--samples", default=SAMPLES_DIR)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.samples, "*.xml")))
+    if not paths:
+        raise SystemExit(f"샘플 payload가 없습니다: {args.samples}")
+
+    print(f"{'sample':<32}{'size':>10}{'legacy':>12}{'stream':>12}{'speedup':>9}{'legacy mem':>13}{'stream mem':>13}")
+    for path in paths:
+        with open(path, "rb") as f:
+            payload = f.read()
+
+        assert parse_citydata(payload) == legacy_parse(payload), f"파싱 결과 불일치: {path}"
+
+        legacy_time, legacy_peak = measure(legacy_parse, payload, args.repeat)
+        stream_time, stream_peak = measure(parse_citydata, payload, args.repeat)
+        print(
+            f"{os.path.basename(path):<32}{len(payload) / 1024:>8.1f}KB"
+            f"{legacy_time * 1000:>10.3f}ms{stream_time * 1000:>10.3f}ms{legacy_time / stream_time:>8.1f}x"
+            f"{legacy_peak / 1024:>11.1f}KB{stream_peak / 1024:>11.1f}KB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+수집 파이프라인 처리량 벤치마크 (오프라인).
+로컬 대역 서버(fake_citydata_server)와 임시 SQLite DB를 사용하여 AREA_NM_LIST 전체 사이클을 반복 수집하고,
+초당 처리 지역 수, 사이클 소요 시간(makespan), 지역별 지연 시간 p50/p95, DB 왕복 횟수를 출력합니다.
+실제 서울시 API 키나 MySQL 없이 동시성/속도 제한/배치 크기 설정을 비교할 수 있습니다.
+
+실행 (fastapi-app 디렉토리에서):
+    python -m benchmarks.bench_ingestion --cycles 3 --concurrency 10 --rate-limit 0 --latency 0.2
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import socket
+import statistics
+import tempfile
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=3, help="반복할 수집 사이클 수")
+    parser.add_argument("--concurrency", type=int, default=10, help="INGESTION_CONCURRENCY (워커 수)")
+    parser.add_argument("--rate-limit", type=float, default=0, help="CITYDATA_RATE_LIMIT (초당 요청 수, 0 이하: 제한 없음)")
+    parser.add_argument("--burst", type=int, default=5, help="CITYDATA_RATE_LIMIT_BURST")
+    parser.add_argument("--max-connections", type=int, default=20, help="CITYDATA_MAX_CONNECTIONS")
+    parser.add_argument("--latency", type=float, default=0.2, help="대역 서버 평균 응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.1, help="대역 서버 지연 변동 폭(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="대역 서버 HTTP 500 비율")
+    parser.add_argument("--road-links", type=int, default=120, help="응답 크기: 도로 소통 링크 수")
+    parser.add_argument("--bus-stations", type=int, default=60, help="응답 크기: 버스 정류소 수")
+    parser.add_argument("--verbose", action="store_true", help="수집 로그(print)를 그대로 출력")
+    return parser.parse_args()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def configure_env(args, port: int, db_path: str):
+    # src 모듈은 import 시점에 환경 변수를 읽으므로 import 전에 설정
+    os.environ["SQLALCHEMY_DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    os.environ["CITYDATA_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ.setdefault("API_KEY", "benchmark")
+    os.environ["INGESTION_CONCURRENCY"] = str(args.concurrency)
+    os.environ["CITYDATA_RATE_LIMIT"] = str(args.rate_limit)
+    os.environ["CITYDATA_RATE_LIMIT_BURST"] = str(args.burst)
+    os.environ["CITYDATA_MAX_CONNECTIONS"] = str(args.max_connections)
+
+
+async def run_benchmark(args, port: int):
+    import uvicorn
+    from sqlalchemy import event
+
+    from benchmarks.fake_citydata_server import FakeServerSettings, create_app
+    from src.data.database import Base, engine
+    from src.data.population.areas import AREA_NM_LIST
+    from src.data.population.background_task import run_ingestion_cycle
+    from src.data.population.citydata_client import create_http_client
+    from src.data.population.citydata_parser import shutdown_parser_executor
+    import src.model  # noqa: F401  (테이블 등록)
+
+    settings = FakeServerSettings(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        road_links=args.road_links, bus_stations=args.bus_stations,
+    )
+    fake_app = create_app(settings, seed=0)
+    server = uvicorn.Server(uvicorn.Config(fake_app, host="127.0.0.1", port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    # DB 왕복 횟수 (실행된 SQL 문 수)
+    round_trips = {"count": 0}
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_round_trip(*_):
+        round_trips["count"] += 1
+
+    client = create_http_client()
+    cycles = []
+    try:
+        for cycle in range(args.cycles):
+            # 사이클마다 대역 서버의 시계를 갱신 주기만큼 앞당겨 모든 지역이 새 데이터를 반환하도록 함
+            settings.clock_offset = cycle * settings.update_interval
+            before = round_trips["count"]
+            log = None if args.verbose else io.StringIO()
+            with contextlib.redirect_stdout(log) if log else contextlib.nullcontext():
+                report = await run_ingestion_cycle(client, AREA_NM_LIST)
+            cycles.append((report, round_trips["count"] - before))
+    finally:
+        await client.aclose()
+        shutdown_parser_executor()
+        server.should_exit = True
+        await server_task
+        await engine.dispose()
+
+    print(f"지역 {len(AREA_NM_LIST)}개 / 동시성 {args.concurrency} / 속도 제한 {args.rate_limit or '없음'} / "
+          f"대역 서버 지연 {args.latency}±{args.jitter}초 / 오류율 {args.error_rate}")
+    print(f"{'cycle':>5} {'ok':>5} {'fail':>5} {'makespan':>9} {'areas/s':>8} {'p50':>7} {'p95':>7} {'db rt':>6}")
+    for index, (report, db_round_trips) in enumerate(cycles, start=1):
+        ok = len(report.by_status("ok"))
+        failed = len(report.results) - ok + len(report.skipped)
+        print(f"{index:>5} {ok:>5} {failed:>5} {report.makespan:>8.2f}s {ok / report.makespan:>8.1f} "
+              f"{report.latency_percentile(50):>6.3f}s {report.latency_percentile(95):>6.3f}s {db_round_trips:>6}")
+
+    makespans = [report.makespan for report, _ in cycles]
+    total_ok = sum(len(report.by_status("ok")) for report, _ in cycles)
+    print(f"평균 makespan {statistics.mean(makespans):.2f}s, 전체 처리량 {total_ok / sum(makespans):.1f} areas/s, "
+          f"대역 서버 요청 {fake_app.state.requests}회")
+
+
+def main():
+    args = parse_args()
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        configure_env(args, port, os.path.join(tmp_dir, "bench_ingestion.db"))
+        started = time.perf_counter()
+        asyncio.run(run_benchmark(args, port))
+        print(f"총 소요 시간 {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
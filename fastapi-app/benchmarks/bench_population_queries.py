@@ -0,0 +1,232 @@
+"""
+population 조회 쿼리 벤치마크 (데이터 크기별).
+합성 이력(generate_population_history)을 1M -> 10M -> 50M 행처럼 늘려 가며, /populations 조회 API가 실행하는 쿼리의
+p50/p95 응답 시간과 EXPLAIN 실행 계획을 기록합니다. 인덱스/쿼리 변경은 거의 빈 개발 DB가 아니라 이 크기별 곡선으로 판단합니다.
+쿼리는 라우터와 같은 함수/컬럼 정의로 만들므로 라우터가 바뀌면 벤치마크도 같이 바뀝니다.
+(메모리 캐시를 거치지 않는 경로, 즉 캐시 미스일 때 DB가 하는 일을 측정합니다)
+
+실행 (fastapi-app 디렉토리에서):
+    python -m benchmarks.bench_population_queries --sizes 1000000,10000000,50000000 [--database-url ...] [--explain] [--output bench.json]
+--sizes를 생략하면 현재 DB 그대로 측정합니다. 같은 DB를 다시 쓰면 이미 있는 행은 다시 만들지 않습니다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+from datetime import timedelta
+from typing import Callable, Dict, List
+
+from benchmarks.generate_population_history import DEFAULT_DATABASE_URL, configure_env
+
+# DB별 실행 계획 조회 문
+EXPLAIN_PREFIX = {"sqlite": "EXPLAIN QUERY PLAN ", "mysql": "EXPLAIN ", "postgresql": "EXPLAIN "}
+# 통계 갱신 (데이터를 늘린 뒤 실행 계획이 최신 통계를 쓰도록)
+ANALYZE_STATEMENTS = {
+    "sqlite": ("PRAGMA analysis_limit=1000", "ANALYZE"),
+    "mysql": ("ANALYZE TABLE population",),
+    "postgresql": ("ANALYZE population",),
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="", help="측정할 전체 행 수 (쉼표 구분, 작은 순서로 적재하며 측정)")
+    parser.add_argument("--database-url", default=os.getenv("SQLALCHEMY_DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--repeat", type=int, default=20, help="쿼리별 반복 횟수 (매번 다른 지역)")
+    parser.add_argument("--cases", default="", help="측정할 쿼리 이름 (쉼표 구분, 생략 시 전체)")
+    parser.add_argument("--explain", action="store_true", help="실행 계획을 화면에도 출력")
+    parser.add_argument("--output", default=None, help="결과(JSON) 저장 경로")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-rollups", action="store_true", help="적재 시 시간/일 단위 집계를 채우지 않음 (series_hourly/daily 결과가 비게 됨)")
+    return parser.parse_args()
+
+
+def query_cases(now, region_ids: List[str]) -> Dict[str, Callable]:
+    """쿼리 이름 -> (region_id -> 쿼리). now는 DB의 가장 최근 데이터 시각입니다."""
+    from sqlalchemy.future import select
+
+    from src.data.population.export import EXPORT_COLUMNS
+    from src.data.population.pagination import encode_cursor, paginate_latest_first
+    from src.data.population.population_router import AGE_MIN_COLUMNS, BREAKDOWN_COLUMNS, GENDER_COLUMNS, POPULATION_COLUMNS
+    from src.data.population.rollup import series_query
+    from src.data.population.snapshot_cache import latest_records_query
+    from src.data.population.time_range import build_time_ranges, datetime_in_ranges
+    from src.model.population import PopulationStation, join_congestion_message
+
+    def by_region(columns, region_id):
+        return select(*columns).where(PopulationStation.region_id == region_id)
+
+    def page(region_id):
+        # /region/{region_id}와 같은 쿼리 (혼잡도 메시지 조인)
+        return join_congestion_message(select(*POPULATION_COLUMNS)).where(PopulationStation.region_id == region_id)
+
+    def time_of_day(region_id, ranges):
+        # /gender_population_data와 같은 쿼리
+        return by_region(GENDER_COLUMNS, region_id).where(datetime_in_ranges(ranges)).order_by(PopulationStation.datetime)
+
+    cursor_30d = encode_cursor(now - timedelta(days=30))
+    some_regions = region_ids[:10]
+    return {
+        # /latest (최신 데이터 캐시가 비어 있을 때)
+        "latest_all_regions": lambda region_id: latest_records_query().order_by(PopulationStation.region_id),
+        "latest_10_regions": lambda region_id: latest_records_query(some_regions).order_by(PopulationStation.region_id),
+        # ETag / Last-Modified 검증 값 (get_latest_snapshot 캐시 미스)
+        "region_latest_row": lambda region_id: (
+            select(PopulationStation).where(PopulationStation.region_id == region_id)
+            .order_by(PopulationStation.datetime.desc()).limit(1)
+        ),
+        # /region/{region_id} 최신순 페이징: 첫 페이지, 30일 전 커서, 하위 호환 offset
+        "region_page": lambda region_id: paginate_latest_first(page(region_id), 40),
+        "region_page_cursor_30d": lambda region_id: paginate_latest_first(page(region_id), 40, cursor_30d),
+        "region_page_offset_2000": lambda region_id: paginate_latest_first(page(region_id), 40, None, 2000),
+        # /gender_population_data 시간 범위: 최근 60분, 최근 31일의 같은 시간대
+        "gender_last_hour": lambda region_id: time_of_day(region_id, build_time_ranges(now=now)),
+        "gender_same_hour_31d": lambda region_id: time_of_day(
+            region_id, build_time_ranges(start_time="18:00", end_time="19:00", days=31, now=now)
+        ),
+        # /age_min_population_data, /breakdown 페이징
+        "age_min_page": lambda region_id: paginate_latest_first(by_region(AGE_MIN_COLUMNS, region_id), 40),
+        "breakdown_page": lambda region_id: paginate_latest_first(by_region(BREAKDOWN_COLUMNS, region_id), 40),
+        # /series 해상도별 (원본 2일, 시간 단위 14일, 일 단위 1년)
+        "series_raw_2d": lambda region_id: series_query(region_id, now - timedelta(days=2), now, "raw"),
+        "series_hourly_14d": lambda region_id: series_query(region_id, now - timedelta(days=14), now, "hourly"),
+        "series_daily_365d": lambda region_id: series_query(region_id, now - timedelta(days=365), now, "daily"),
+        # /export 하루치 전체 지역 (기본 키 범위 탐색)
+        "export_1d_all_regions": lambda region_id: (
+            join_congestion_message(select(*EXPORT_COLUMNS))
+            .where(PopulationStation.datetime > now - timedelta(days=1), PopulationStation.datetime <= now)
+            .order_by(PopulationStation.datetime, PopulationStation.region_id)
+        ),
+    }
+
+
+async def explain(db, query) -> List[str]:
+    """쿼리의 실행 계획 (값을 SQL에 넣어 컴파일한 뒤 EXPLAIN)"""
+    dialect = db.get_bind().dialect
+    sql = str(query.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    conn = await db.connection()
+    result = await conn.exec_driver_sql(EXPLAIN_PREFIX[dialect.name] + sql)
+    lines = []
+    for row in result:
+        if dialect.name == "sqlite":
+            lines.append(row[-1])  # (id, parent, notused, detail)
+        elif len(row) == 1:
+            lines.append(str(row[0]))
+        else:
+            lines.append(", ".join(f"{key}={value}" for key, value in row._mapping.items() if value is not None))
+    return lines
+
+
+async def time_case(db, build: Callable, region_ids: List[str], repeat: int, rng: random.Random) -> dict:
+    await db.execute(build(region_ids[0]))  # 준비 실행 (쿼리 컴파일 캐시, DB 페이지 캐시)
+    db.expunge_all()
+    timings, returned = [], []
+    for _ in range(repeat):
+        query = build(rng.choice(region_ids))
+        started = time.perf_counter()
+        result = await db.execute(query)
+        rows = result.all()
+        timings.append(time.perf_counter() - started)
+        returned.append(len(rows))
+        db.expunge_all()
+    timings.sort()
+    return {
+        "rows_returned": statistics.mean(returned),
+        "p50_ms": statistics.median(timings) * 1000,
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+        "max_ms": timings[-1] * 1000,
+    }
+
+
+async def table_state(db):
+    from sqlalchemy import func
+    from sqlalchemy.future import select
+
+    from src.model.population import PopulationStation, join_congestion_message
+
+    count = (await db.execute(select(func.count()).select_from(PopulationStation))).scalar()
+    newest = (await db.execute(select(func.max(PopulationStation.datetime)))).scalar()
+    region_ids = (await db.execute(select(PopulationStation.region_id).where(PopulationStation.datetime == newest))).scalars().all()
+    return count, newest.replace(tzinfo=None) if newest else None, sorted(region_ids)
+
+
+async def analyze(engine):
+    async with engine.begin() as conn:
+        for statement in ANALYZE_STATEMENTS.get(engine.dialect.name, ()):
+            await conn.exec_driver_sql(statement)
+
+
+async def run_benchmark(args) -> List[dict]:
+    from benchmarks.generate_population_history import generate_history
+    from src.data.database import AsyncSessionLocal, engine
+
+    sizes = sorted(int(size) for size in args.sizes.split(",") if size.strip()) or [None]
+    selected = {name.strip() for name in args.cases.split(",") if name.strip()}
+    rng = random.Random(args.seed)
+    results = []
+    for size in sizes:
+        if size is not None:
+            await generate_history(size, seed=args.seed, rollups=not args.skip_rollups)
+            await analyze(engine)
+        async with AsyncSessionLocal() as db:
+            count, now, region_ids = await table_state(db)
+        if not count:
+            raise SystemExit("population 테이블이 비어 있습니다. --sizes로 데이터를 만들어 주세요.")
+
+        print(f"\n== {count:,}행 ({engine.dialect.name}), 최근 데이터 {now:%Y-%m-%d %H:%M}, 지역 {len(region_ids)}개 ==")
+        print(f"{'case':<26}{'rows':>8}{'p50':>10}{'p95':>10}{'max':>10}")
+        cases = query_cases(now, region_ids)
+        for name, build in cases.items():
+            if selected and name not in selected:
+                continue
+            async with AsyncSessionLocal() as db:
+                timing = await time_case(db, build, region_ids, args.repeat, rng)
+                plan = await explain(db, build(region_ids[0]))
+            print(f"{name:<26}{timing['rows_returned']:>8.0f}{timing['p50_ms']:>8.2f}ms{timing['p95_ms']:>8.2f}ms{timing['max_ms']:>8.2f}ms")
+            if args.explain:
+                for line in plan:
+                    print(f"    {line}")
+            results.append({"table_rows": count, "case": name, **timing, "plan": plan})
+    return results
+
+
+def print_scaling(results: List[dict]):
+    """쿼리별 p50을 데이터 크기 순서로 나란히 출력합니다. (x배: 가장 작은 크기 대비. 행 수에 비례해 늘면 인덱스를 타지 않는 쿼리)"""
+    sizes = sorted({result["table_rows"] for result in results})
+    if len(sizes) < 2:
+        return
+    p50 = {(result["case"], result["table_rows"]): result["p50_ms"] for result in results}
+    cases = list(dict.fromkeys(result["case"] for result in results))
+    print("\n== p50 (ms) by table size ==")
+    print(f"{'case':<26}" + "".join(f"{size:>14,}" for size in sizes) + f"{'x':>9}")
+    for case in cases:
+        values = [p50.get((case, size)) for size in sizes]
+        growth = values[-1] / values[0] if values[0] else float("nan")
+        print(f"{case:<26}" + "".join(f"{value:>14.2f}" for value in values) + f"{growth:>8.1f}x")
+
+
+async def main_async(args):
+    from src.data.database import engine
+
+    try:
+        results = await run_benchmark(args)
+    finally:
+        await engine.dispose()
+    print_scaling(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"database": engine.dialect.name, "repeat": args.repeat, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+
+def main():
+    args = parse_args()
+    configure_env(args.database_url)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
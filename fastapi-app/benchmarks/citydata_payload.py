@@ -0,0 +1,160 @@
+"""
+서울시 실시간 도시데이터(citydata) XML 응답을 흉내 낸 payload 생성기.
+실제 응답과 같은 순서(실시간 인구 -> 도로 소통 -> 주차장 -> 지하철 -> 버스 -> 날씨 ...)와 태그 구조를 따르며,
+road_links / bus_stations 등으로 응답 크기를 조절할 수 있습니다.
+"""
+import random
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape
+
+CONGEST_LEVELS = ["여유", "보통", "약간 붐빔", "붐빔"]
+CONGEST_MESSAGES = {
+    "여유": "사람이 몰려있을 가능성이 낮고 붐빔은 거의 느껴지지 않아요. 도보 이동이 자유로워요.",
+    "보통": "사람이 몰려있을 수 있지만 크게 붐비지는 않아요. 도보 이동에 큰 제약이 없어요.",
+    "약간 붐빔": "사람들이 몰려있을 가능성이 크고 붐빈다고 느낄 수 있어요. 인구밀도가 높은 구간에서는 도보 이동시 부딪힘이 발생할 수 있어요.",
+    "붐빔": "사람들이 몰려있을 가능성이 매우 크고 많이 붐빈다고 느낄 수 있어요. 인구밀도가 높은 구간에서는 도보 이동시 부딪힘이 발생할 수 있어요.",
+}
+
+
+def area_code_for(index: int) -> str:
+    return f"POI{index + 1:03d}"
+
+
+def _rates(rng: random.Random, n: int):
+    weights = [rng.random() + 0.1 for _ in range(n)]
+    total = sum(weights)
+    return [round(w / total * 100, 1) for w in weights]
+
+
+def build_live_population(rng: random.Random, area_name: str, area_code: str, ppltn_time: datetime, forecasts: int = 12) -> str:
+    level = rng.choice(CONGEST_LEVELS)
+    ppltn_min = rng.randint(500, 80000)
+    ppltn_max = ppltn_min + rng.randint(500, 5000)
+    male = round(rng.uniform(35, 65), 1)
+    gens = _rates(rng, 8)
+    fcst = "".join(
+        "<FCST_PPLTN>"
+        f"<FCST_TIME>{(ppltn_time + timedelta(hours=h + 1)).strftime('%Y-%m-%d %H:%M')}</FCST_TIME>"
+        f"<FCST_CONGEST_LVL>{rng.choice(CONGEST_LEVELS)}</FCST_CONGEST_LVL>"
+        f"<FCST_PPLTN_MIN>{ppltn_min + rng.randint(-500, 500)}</FCST_PPLTN_MIN>"
+        f"<FCST_PPLTN_MAX>{ppltn_max + rng.randint(-500, 500)}</FCST_PPLTN_MAX>"
+        "</FCST_PPLTN>"
+        for h in range(forecasts)
+    )
+    return (
+        "<LIVE_PPLTN_STTS><LIVE_PPLTN_STTS>"
+        f"<AREA_NM>{escape(area_name)}</AREA_NM><AREA_CD>{area_code}</AREA_CD>"
+        f"<AREA_CONGEST_LVL>{level}</AREA_CONGEST_LVL>"
+        f"<AREA_CONGEST_MSG>{CONGEST_MESSAGES[level]}</AREA_CONGEST_MSG>"
+        f"<AREA_PPLTN_MIN>{ppltn_min}</AREA_PPLTN_MIN><AREA_PPLTN_MAX>{ppltn_max}</AREA_PPLTN_MAX>"
+        f"<MALE_PPLTN_RATE>{male}</MALE_PPLTN_RATE><FEMALE_PPLTN_RATE>{round(100 - male, 1)}</FEMALE_PPLTN_RATE>"
+        + "".join(f"<PPLTN_RATE_{age}>{rate}</PPLTN_RATE_{age}>" for age, rate in zip(range(0, 80, 10), gens))
+        + f"<RESNT_PPLTN_RATE>{round(rng.uniform(10, 60), 1)}</RESNT_PPLTN_RATE>"
+        f"<NON_RESNT_PPLTN_RATE>{round(rng.uniform(40, 90), 1)}</NON_RESNT_PPLTN_RATE>"
+        f"<REPLACE_YN>N</REPLACE_YN><PPLTN_TIME>{ppltn_time.strftime('%Y-%m-%d %H:%M')}</PPLTN_TIME>"
+        f"<FCST_YN>Y</FCST_YN><FCST_PPLTN>{fcst}</FCST_PPLTN>"
+        "</LIVE_PPLTN_STTS></LIVE_PPLTN_STTS>"
+    )
+
+
+def _road_traffic(rng: random.Random, ppltn_time: datetime, links: int) -> str:
+    items = "".join(
+        "<ROAD_TRAFFIC_STTS>"
+        f"<LINK_ID>{1000000000 + rng.randint(0, 99999999)}</LINK_ID><ROAD_NM>도로{i}</ROAD_NM>"
+        f"<START_ND_CD>{rng.randint(1000, 9999)}</START_ND_CD><START_ND_NM>시점{i}</START_ND_NM>"
+        f"<START_ND_XY>{rng.uniform(126.8, 127.2):.7f}_{rng.uniform(37.4, 37.7):.7f}</START_ND_XY>"
+        f"<END_ND_CD>{rng.randint(1000, 9999)}</END_ND_CD><END_ND_NM>종점{i}</END_ND_NM>"
+        f"<END_ND_XY>{rng.uniform(126.8, 127.2):.7f}_{rng.uniform(37.4, 37.7):.7f}</END_ND_XY>"
+        f"<DIST>{rng.randint(50, 2000)}</DIST><SPD>{rng.randint(5, 60)}</SPD>"
+        f"<IDX>{rng.choice(['원활', '서행', '정체'])}</IDX>"
+        "<XYLIST>" + "|".join(f"{rng.uniform(126.8, 127.2):.7f}_{rng.uniform(37.4, 37.7):.7f}" for _ in range(8)) + "</XYLIST>"
+        "</ROAD_TRAFFIC_STTS>"
+        for i in range(links)
+    )
+    return (
+        "<ROAD_TRAFFIC_STTS><AVG_ROAD_DATA>"
+        f"<ROAD_MSG>전체 도로소통평균현황은 서행입니다.</ROAD_MSG><ROAD_TRAFFIC_IDX>서행</ROAD_TRAFFIC_IDX>"
+        f"<ROAD_TRFFIC_TIME>{ppltn_time.strftime('%Y-%m-%d %H:%M')}</ROAD_TRFFIC_TIME>"
+        f"<ROAD_TRAFFIC_SPD>{rng.randint(10, 40)}</ROAD_TRAFFIC_SPD></AVG_ROAD_DATA>"
+        f"{items}</ROAD_TRAFFIC_STTS>"
+    )
+
+
+def _bus_stations(rng: random.Random, stations: int) -> str:
+    items = "".join(
+        "<BUS_STN_STTS>"
+        f"<BUS_STN_ID>{rng.randint(100000000, 199999999)}</BUS_STN_ID><BUS_ARS_ID>{rng.randint(10000, 29999)}</BUS_ARS_ID>"
+        f"<BUS_STN_NM>정류소{i}</BUS_STN_NM><BUS_STN_X>{rng.uniform(126.8, 127.2):.7f}</BUS_STN_X>"
+        f"<BUS_STN_Y>{rng.uniform(37.4, 37.7):.7f}</BUS_STN_Y>"
+        f"<BUS_RESULT_MSG>정상</BUS_RESULT_MSG>"
+        "</BUS_STN_STTS>"
+        for i in range(stations)
+    )
+    return f"<BUS_STN_STTS>{items}</BUS_STN_STTS>"
+
+
+def _weather(rng: random.Random, ppltn_time: datetime) -> str:
+    fcst = "".join(
+        "<FCST24HOURS>"
+        f"<FCST_DT>{(ppltn_time + timedelta(hours=h)).strftime('%Y%m%d%H%M')}</FCST_DT>"
+        f"<TEMP>{rng.randint(-10, 35)}</TEMP><PRECIPITATION>-</PRECIPITATION><PRECPT_TYPE>없음</PRECPT_TYPE>"
+        f"<RAIN_CHANCE>{rng.randint(0, 100)}</RAIN_CHANCE><SKY_STTS>맑음</SKY_STTS>"
+        "</FCST24HOURS>"
+        for h in range(24)
+    )
+    return (
+        "<WEATHER_STTS><WEATHER_STTS>"
+        f"<WEATHER_TIME>{ppltn_time.strftime('%Y-%m-%d %H:%M')}</WEATHER_TIME><TEMP>{rng.randint(-10, 35)}</TEMP>"
+        f"<HUMIDITY>{rng.randint(10, 90)}</HUMIDITY><PM10_INDEX>좋음</PM10_INDEX><PM25_INDEX>좋음</PM25_INDEX>"
+        f"<FCST24HOURS>{fcst}</FCST24HOURS>"
+        "</WEATHER_STTS></WEATHER_STTS>"
+    )
+
+
+def build_citydata_xml(
+    area_name: str,
+    area_code: str,
+    ppltn_time: datetime,
+    road_links: int = 120,
+    bus_stations: int = 60,
+    seed=None,
+) -> bytes:
+    """area_name 하나에 대한 citydata XML 응답 전체를 생성합니다."""
+    rng = random.Random(seed)
+    body = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        "<SeoulRtd.citydata>"
+        "<list_total_count>1</list_total_count>"
+        "<RESULT><RESULT.CODE>INFO-000</RESULT.CODE><RESULT.MESSAGE>정상 처리되었습니다.</RESULT.MESSAGE></RESULT>"
+        "<CITYDATA>"
+        f"<AREA_NM>{escape(area_name)}</AREA_NM><AREA_CD>{area_code}</AREA_CD>"
+        + build_live_population(rng, area_name, area_code, ppltn_time)
+        + _road_traffic(rng, ppltn_time, road_links)
+        + "<PRK_STTS></PRK_STTS><SUB_STTS></SUB_STTS>"
+        + _bus_stations(rng, bus_stations)
+        + "<ACDNT_CNTRL_STTS></ACDNT_CNTRL_STTS><SBIKE_STTS></SBIKE_STTS>"
+        + _weather(rng, ppltn_time)
+        + "<CHARGER_STTS></CHARGER_STTS><EVENT_STTS></EVENT_STTS>"
+        "</CITYDATA>"
+        "</SeoulRtd.citydata>"
+    )
+    return body.encode("utf-8")
+
+
+if __name__ == "__main__":
+    # 벤치마크용 합성 샘플 payload 생성: python -m benchmarks.citydata_payload
+    # (실제 API 응답을 캡처한 것이 아니므로 파일 이름에 synthetic_을 붙임)
+    import os
+
+    samples_dir = os.path.join(os.path.dirname(__file__), "samples")
+    os.makedirs(samples_dir, exist_ok=True)
+    base_time = datetime(2025, 3, 14, 18, 5)
+    for name, area_name, code, road_links, bus_stations in [
+        ("synthetic_citydata_small.xml", "서울역", "POI033", 20, 10),
+        ("synthetic_citydata_medium.xml", "광화문·덕수궁", "POI009", 120, 60),
+        ("synthetic_citydata_large.xml", "강남 MICE 관광특구", "POI001", 400, 150),
+    ]:
+        path = os.path.join(samples_dir, name)
+        with open(path, "wb") as f:
+            f.write(build_citydata_xml(area_name, code, base_time, road_links, bus_stations, seed=name))
+        print(f"{path} 생성")
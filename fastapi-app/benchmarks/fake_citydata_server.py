@@ -0,0 +1,108 @@
+"""
+로컬 테스트용 서울시 실시간 도시데이터(citydata) API 대역 서버.
+AREA_NM_LIST의 모든 지역에 대해 실제와 같은 구조의 XML을 반환하며, 지연 시간/지터/오류율/응답 크기를 조절할 수 있습니다.
+PPLTN_TIME은 update_interval 단위로 갱신됩니다. (clock_offset으로 시계를 앞당겨 새 데이터를 만들 수 있음)
+
+실행 (fastapi-app 디렉토리에서):
+    python -m benchmarks.fake_citydata_server --port 8088 --latency 0.2 --jitter 0.1 --error-rate 0.01
+
+수집 쪽은 CITYDATA_BASE_URL=http://127.0.0.1:8088 로 실행합니다.
+"""
+import argparse
+import asyncio
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI, Response
+
+from benchmarks.citydata_payload import area_code_for, build_citydata_xml
+from src.data.population.areas import AREA_NM_LIST
+
+AREA_CODES = {area_name: area_code_for(index) for index, area_name in enumerate(AREA_NM_LIST)}
+
+NOT_FOUND_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    "<SeoulRtd.citydata><RESULT><RESULT.CODE>ERROR-500</RESULT.CODE>"
+    "<RESULT.MESSAGE>해당하는 데이터가 없습니다.</RESULT.MESSAGE></RESULT></SeoulRtd.citydata>"
+).encode("utf-8")
+
+
+@dataclass
+class FakeServerSettings:
+    latency: float = 0.2  # 평균 응답 지연(초)
+    jitter: float = 0.1  # 지연 시간 변동 폭(초, ±)
+    error_rate: float = 0.0  # HTTP 500 응답 비율 (0~1)
+    road_links: int = 120  # 응답 크기 조절: 도로 소통 링크 수
+    bus_stations: int = 60  # 응답 크기 조절: 버스 정류소 수
+    update_interval: int = 300  # PPLTN_TIME 갱신 주기(초)
+    clock_offset: float = 0.0  # 서버 시계를 앞당기는 시간(초)
+
+
+def current_ppltn_time(settings: FakeServerSettings) -> datetime:
+    now = datetime.now() + timedelta(seconds=settings.clock_offset)
+    epoch = int(now.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % settings.update_interval)
+
+
+def create_app(settings: FakeServerSettings, seed: int = None) -> FastAPI:
+    app = FastAPI()
+    app.state.settings = settings
+    app.state.requests = 0
+    rng = random.Random(seed)
+    payload_cache = {}  # (지역, PPLTN_TIME) -> payload. 같은 갱신 주기 안에서는 같은 응답
+
+    @app.get("/{api_key}/xml/citydata/{start_index}/{end_index}/{area_name}")
+    async def citydata(api_key: str, start_index: int, end_index: int, area_name: str):
+        app.state.requests += 1
+        delay = max(0.0, settings.latency + rng.uniform(-settings.jitter, settings.jitter))
+        await asyncio.sleep(delay)
+
+        if rng.random() < settings.error_rate:
+            return Response(status_code=500, content=b"Internal Server Error")
+
+        area_code = AREA_CODES.get(area_name)
+        if area_code is None:
+            return Response(content=NOT_FOUND_XML, media_type="application/xml")
+
+        ppltn_time = current_ppltn_time(settings)
+        key = (area_name, ppltn_time)
+        payload = payload_cache.get(key)
+        if payload is None:
+            payload = build_citydata_xml(
+                area_name, area_code, ppltn_time,
+                road_links=settings.road_links, bus_stations=settings.bus_stations,
+                seed=f"{area_code}-{ppltn_time.isoformat()}",
+            )
+            if len(payload_cache) > len(AREA_CODES) * 2:  # 지난 갱신 주기의 응답은 버림
+                payload_cache.clear()
+            payload_cache[key] = payload
+        return Response(content=payload, media_type="application/xml")
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8088)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--road-links", type=int, default=120)
+    parser.add_argument("--bus-stations", type=int, default=60)
+    parser.add_argument("--update-interval", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    settings = FakeServerSettings(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        road_links=args.road_links, bus_stations=args.bus_stations, update_interval=args.update_interval,
+    )
+    uvicorn.run(create_app(settings, args.seed), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
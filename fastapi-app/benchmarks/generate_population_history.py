@@ -0,0 +1,234 @@
+"""
+population 이력 합성 데이터 생성기 (쿼리 벤치마크용).
+지역마다 규모, 시간대/주말 패턴, 성별·연령 구성을 정하고 5분 간격 행을 만들어 population 테이블에 대량 적재합니다.
+실제 수집 데이터와 같은 저장 형식(비율 10배 SMALLINT, 혼잡도 코드, 메시지 id)으로 파생 인구 수 컬럼까지 채웁니다.
+이미 데이터가 있으면 가장 오래된 시각 이전으로 과거를 늘려 목표 행 수를 맞추므로 1M -> 10M -> 50M처럼 이어서 키울 수 있습니다.
+(116개 지역 1년치 ≈ 1,220만 행)
+
+실행 (fastapi-app 디렉토리에서):
+    python -m benchmarks.generate_population_history --rows 1000000 [--database-url sqlite+aiosqlite:///./population_bench.db]
+MySQL은 먼저 같은 URL로 `alembic upgrade head`를 실행해 테이블(월별 파티션 포함)을 만든 뒤 적재합니다.
+"""
+import argparse
+import asyncio
+import math
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.citydata_payload import CONGEST_LEVELS, CONGEST_MESSAGES, area_code_for
+
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///./population_bench.db"
+INTERVAL = timedelta(minutes=5)  # citydata 갱신 주기
+SLOTS_PER_DAY = 288
+RATE_SCALE = 10  # src.model.column_types.ScaledRate와 같은 배율
+COUNT_SCALE = 1000  # src.model.column_types.ScaledCount와 같은 배율
+GENERATIONS = ("gen_10", "gen_20", "gen_30", "gen_40", "gen_50", "gen_60", "gen_70")
+# 최대 인구 / 지역 수용 규모 비율 -> 혼잡도 단계 (여유, 보통, 약간 붐빔, 붐빔)
+CONGEST_THRESHOLDS = (0.45, 0.7, 0.9)
+
+
+def configure_env(database_url: str):
+    # src 모듈은 import 시점에 환경 변수를 읽으므로 import 전에 설정
+    os.environ["SQLALCHEMY_DATABASE_URL"] = database_url
+
+
+def region_profiles(count: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """지역별 고정 특성. 같은 seed면 적재를 여러 번 나누어도 지역 특성이 같습니다."""
+    rng = np.random.default_rng(seed)
+    gens = rng.dirichlet(np.full(len(GENERATIONS), 4.0), size=count)
+    return {
+        "region_id": np.array([area_code_for(index) for index in range(count)]),
+        "capacity": np.clip(rng.lognormal(np.log(20000), 0.9, count), 1500, 200000),  # 지역 규모 (붐빔 기준 인구)
+        "peak_hour": rng.uniform(11, 21, count),  # 가장 붐비는 시각 (업무지구는 낮, 번화가는 저녁)
+        "spread": rng.uniform(3, 6, count),  # 붐비는 시간대 폭
+        "weekend": rng.uniform(0.5, 1.5, count),  # 주말 배율 (관광지 > 1, 업무지구 < 1)
+        "male": rng.uniform(42, 58, count),
+        "gens": gens * rng.uniform(95, 99, (count, 1)),  # 10대~70대 비율 합 (나머지는 10세 미만)
+    }
+
+
+def generate_columns(profiles: Dict[str, np.ndarray], times: List, message_ids: Dict[int, int], rng) -> Dict[str, list]:
+    """
+    times x 지역 행을 population 저장 형식의 컬럼별 목록으로 만듭니다. (datetime, region_id 순서)
+    값은 지역 특성 + 시간대/주말 패턴 + 잡음으로 만들고, 혼잡도는 최대 인구와 지역 규모의 비율로 정합니다.
+    times는 (datetime, DB에 넣을 값) 목록입니다.
+    """
+    shape = (len(times), len(profiles["region_id"]))
+    hours = np.array([t.hour + t.minute / 60 for t, _ in times])[:, None]
+    weekend = np.array([t.weekday() >= 5 for t, _ in times])[:, None]
+
+    activity = 0.15 + 0.85 * np.exp(-(((hours - profiles["peak_hour"]) / profiles["spread"]) ** 2))
+    activity = activity * np.where(weekend, profiles["weekend"], 1.0) * rng.normal(1.0, 0.06, shape)
+    min_population = np.round(profiles["capacity"] * np.clip(activity, 0.02, 1.3), -2)
+    max_population = min_population + np.maximum(500, np.round(min_population * 0.08, -2))
+    congest = np.digitize(max_population / profiles["capacity"], CONGEST_THRESHOLDS) + 1  # 1~4
+
+    # 비율은 저장 형식(10배 정수) 그대로
+    male = np.clip(np.round((profiles["male"] + rng.normal(0, 1.0, shape)) * RATE_SCALE), 0, 100 * RATE_SCALE)
+    female = 100 * RATE_SCALE - male
+    gens = profiles["gens"] * rng.normal(1.0, 0.04, shape + (len(GENERATIONS),))
+    gens = np.round(gens / gens.sum(axis=2, keepdims=True) * profiles["gens"].sum(axis=1)[:, None] * RATE_SCALE)
+
+    def derived(rate, population):
+        # derived_counts.derive_count와 같은 값 (비율 * 인구 / 100)을 COUNT_SCALE배 한 정수
+        return np.round(rate * population * (COUNT_SCALE / RATE_SCALE / 100)).astype(int).ravel().tolist()
+
+    columns = {
+        "datetime": [value for _, value in times for _ in range(shape[1])],
+        "region_id": np.tile(profiles["region_id"], shape[0]).tolist(),
+        "male_rate": male.astype(int).ravel().tolist(),
+        "female_rate": female.astype(int).ravel().tolist(),
+        "area_congest": congest.ravel().tolist(),
+        "congestion_message_id": [message_ids[code] for code in congest.ravel().tolist()],
+        "min_population": min_population.astype(int).ravel().tolist(),
+        "max_population": max_population.astype(int).ravel().tolist(),
+        "male_min_population": derived(male, min_population),
+        "male_max_population": derived(male, max_population),
+        "female_min_population": derived(female, min_population),
+        "female_max_population": derived(female, max_population),
+    }
+    for index, gen in enumerate(GENERATIONS):
+        columns[gen] = gens[:, :, index].astype(int).ravel().tolist()
+        columns[f"{gen}_min"] = derived(gens[:, :, index], min_population)
+        columns[f"{gen}_max"] = derived(gens[:, :, index], max_population)
+    return columns
+
+
+def bulk_insert(dialect):
+    """
+    저장 형식 행을 드라이버 executemany로 바로 넣는 INSERT 문과 파라미터 순서.
+    모델의 ScaledRate / CongestionLevel 변환과 행별 파라미터 처리를 거치지 않아 ORM/Core INSERT보다 약 2배 빠릅니다.
+    datetime만 DB 형식으로 직접 변환합니다. (datetime_value)
+    """
+    import sqlalchemy as sa
+
+    from src.model.population import PopulationStation
+
+    names = [column.name for column in PopulationStation.__table__.columns]
+    compiled = sa.table("population", *map(sa.column, names)).insert().values(
+        {name: sa.bindparam(name) for name in names}
+    ).compile(dialect=dialect)
+    order = compiled.positiontup if compiled.positional else None
+    processor = sa.DateTime().dialect_impl(dialect).bind_processor(dialect)
+    datetime_value = processor or (lambda value: value)
+    return str(compiled), order, datetime_value
+
+
+async def generate_history(
+    target_rows: int,
+    end: Optional[datetime] = None,
+    regions: Optional[int] = None,
+    seed: int = 0,
+    rollups: bool = True,
+) -> int:
+    """
+    population 테이블의 행 수가 target_rows 이상이 되도록 과거 이력을 채웁니다. 추가한 행 수를 반환합니다.
+    테이블이 비어 있으면 end(생략 시 현재 시각)부터, 아니면 가장 오래된 시각 이전부터 하루씩 거슬러 올라가며 적재합니다.
+    하루치마다 커밋하므로 중간에 멈춰도 다시 실행하면 이어서 채웁니다.
+    """
+    from sqlalchemy import event, func, select
+
+    from src.data.database import AsyncSessionLocal, Base, engine
+    from src.data.population.areas import AREA_NM_LIST
+    from src.data.population.population_writer import congestion_message_ids
+    from src.data.population.rollup import backfill_rollups
+    from src.model.column_types import CONGEST_LEVEL_CODES
+    from src.model.population import PopulationStation
+    import src.model  # noqa: F401  (테이블 등록)
+
+    if engine.dialect.name == "sqlite":
+        # 적재 중에는 fsync를 생략 (벤치마크용 DB)
+        @event.listens_for(engine.sync_engine, "connect")
+        def fast_sqlite(dbapi_connection, _):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA synchronous=OFF")
+            cursor.close()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as db:
+        async with db.begin():
+            existing, oldest = (await db.execute(
+                select(func.count(), func.min(PopulationStation.datetime)).select_from(PopulationStation)
+            )).one()
+            ids = await congestion_message_ids.resolve(db, CONGEST_MESSAGES.values())
+    message_ids = {CONGEST_LEVEL_CODES[level]: ids[CONGEST_MESSAGES[level]] for level in CONGEST_LEVELS}
+
+    needed = target_rows - existing
+    if needed <= 0:
+        print(f"이미 {existing:,}행이 있습니다. (목표 {target_rows:,}행)")
+        return 0
+
+    profiles = region_profiles(regions or len(AREA_NM_LIST), seed)
+    region_count = len(profiles["region_id"])
+    if oldest is None:
+        end = end or datetime.now()
+        anchor = end.replace(minute=end.minute - end.minute % 5, second=0, microsecond=0) + INTERVAL
+    else:
+        anchor = oldest.replace(tzinfo=None)
+    slots = math.ceil(needed / region_count)
+    first = anchor - slots * INTERVAL
+    rng = np.random.default_rng([seed, int(first.timestamp())])
+    statement, order, datetime_value = bulk_insert(engine.dialect)
+
+    print(f"{first:%Y-%m-%d %H:%M} ~ {anchor - INTERVAL:%Y-%m-%d %H:%M}, {region_count}개 지역, {slots * region_count:,}행 적재")
+    started = time.perf_counter()
+    inserted = 0
+    block_end = anchor
+    while block_end > first:
+        # 하루치씩 최신 -> 과거 순서로 적재 (블록 안은 기본 키 (datetime, region_id) 순서)
+        block_start = max(first, block_end - SLOTS_PER_DAY * INTERVAL)
+        times = [block_start + k * INTERVAL for k in range((block_end - block_start) // INTERVAL)]
+        columns = generate_columns(profiles, [(t, datetime_value(t)) for t in times], message_ids, rng)
+        if order is not None:
+            rows = list(zip(*(columns[name] for name in order)))
+        else:
+            rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql(statement, rows)
+        inserted += len(rows)
+        block_end = block_start
+        elapsed = time.perf_counter() - started
+        print(f"  {block_start:%Y-%m-%d %H:%M} 까지 {inserted:,}행 ({inserted / elapsed:,.0f}행/s)", end="\r")
+    print()
+
+    if rollups:
+        # 새로 넣은 범위의 시간/일 단위 집계 (/series 벤치마크용)
+        await backfill_rollups(first, anchor)
+    print(f"적재 완료: {inserted:,}행, 전체 {existing + inserted:,}행, {time.perf_counter() - started:.1f}s")
+    return inserted
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="목표 전체 행 수 (이미 있는 행 포함)")
+    parser.add_argument("--database-url", default=os.getenv("SQLALCHEMY_DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--end", type=datetime.fromisoformat, default=None, help="빈 테이블일 때 가장 최근 시각 (생략 시 현재 시각)")
+    parser.add_argument("--regions", type=int, default=None, help="지역 수 (생략 시 AREA_NM_LIST 전체)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-rollups", action="store_true", help="시간/일 단위 집계 테이블을 채우지 않음")
+    return parser.parse_args(argv)
+
+
+async def run(args):
+    from src.data.database import engine
+
+    try:
+        await generate_history(args.rows, args.end, args.regions, args.seed, rollups=not args.skip_rollups)
+    finally:
+        await engine.dispose()
+
+
+def main():
+    args = parse_args()
+    configure_env(args.database_url)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
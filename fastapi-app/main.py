@@ -1,5 +1,6 @@
 from fastapi import FastAPI, Depends, HTTPException
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.data.database import engine, Base, get_db, env_activate
@@ -8,8 +9,15 @@ from src.schema.user import user_schema
 from src.data.user import user_router
 from src.data.upload import upload_router, vision_router
 from src.data.population import population_router
+from src.data.metrics import metrics_router
+from src.data.metrics.metrics import track_request_latency
 # Lifespan 이벤트 임포트 (백그라운드 작업을 위한)
 from src.data.population.background_task import background_task  # 백그라운드 작업 가져오기
+from src.data.population.citydata_client import create_http_client
+from src.data.population.citydata_parser import shutdown_parser_executor
+from src.data.population.lease import ShardLeaseManager
+from src.data.population.profiles import population_profiles
+from src.data.population.snapshot_cache import latest_snapshots
 import asyncio
 
 # svelte 빌드 파일 가져오기 설정
@@ -21,20 +29,61 @@ import os
 # # 로컬 작업 시
 # app = FastAPI()
 
+# 수집 실행 방식
+# - embedded: 웹 프로세스의 lifespan에서 수집 작업을 함께 실행 (기본값)
+# - external: 웹 프로세스에서는 수집하지 않음. 수집은 별도 워커(python -m src.data.population.worker)가 담당
+INGESTION_MODE = os.getenv("INGESTION_MODE", "embedded")
+# embedded 모드에서 DB 샤드 임대 사용 여부 (uvicorn/gunicorn 워커가 여러 개일 때 중복 수집 방지)
+INGESTION_USE_LEASES = os.getenv("INGESTION_USE_LEASES", "false").lower() == "true"
+
 # azure 배포 시
 # 라이프스팬 이벤트 핸들러 정의
 async def lifespan(app: FastAPI):
-    # 애플리케이션 시작 시 실행할 작업(비동기 작업으로 생성하고 실행)
-    task = asyncio.create_task(background_task())
+    # 요일 x 시간대 프로필 준비 (파일이 없으면 워커 하나만 DB 이력으로 다시 만들고, 나머지는 파일이 생기면 읽음)
+    try:
+        await population_profiles.load_or_rebuild()
+    except Exception as e:
+        print(f"프로필 준비 중 오류 발생: {e}")
+
+    # 지역별 최신 데이터 캐시 준비 (실패해도 요청 시 DB에서 읽어 채우므로 서버는 계속 실행)
+    try:
+        await latest_snapshots.warm()
+    except Exception as e:
+        print(f"최신 데이터 캐시 준비 중 오류 발생: {e}")
+
+    tasks = [asyncio.create_task(population_profiles.run_persist())]  # 프로필 주기적 저장
+    http_client = None
+    if INGESTION_MODE == "embedded":
+        # 애플리케이션 수명 동안 공유할 HTTP 클라이언트 (keep-alive 커넥션 풀 재사용)
+        http_client = create_http_client()
+        leases = ShardLeaseManager() if INGESTION_USE_LEASES else None
+        # 애플리케이션 시작 시 실행할 작업(비동기 작업으로 생성하고 실행)
+        tasks.append(asyncio.create_task(background_task(http_client, leases)))
+    else:
+        print(f"내장 수집 작업을 실행하지 않습니다. (INGESTION_MODE={INGESTION_MODE})")
+
+    # 다른 프로세스(수집 워커, 다른 샤드를 맡은 웹 워커)가 저장한 데이터는 주기적으로 읽어 캐시에 반영
+    if INGESTION_MODE != "embedded" or INGESTION_USE_LEASES:
+        tasks.append(asyncio.create_task(latest_snapshots.run_refresh()))
+
     try:
         yield  # 애플리케이션 실행 중...
     finally:
         # 애플리케이션 종료 시 실행할 작업
-        task.cancel()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task  # 작업이 안전하게 종료될 때까지 대기
+            except asyncio.CancelledError:
+                print("백그라운드 작업이 정상적으로 종료되었습니다.")
+        if http_client:
+            await http_client.aclose()
+            shutdown_parser_executor()
         try:
-            await task  # 작업이 안전하게 종료될 때까지 대기
-        except asyncio.CancelledError:
-            print("백그라운드 작업이 정상적으로 종료되었습니다.")
+            await population_profiles.save_async()
+        except Exception as e:
+            print(f"프로필 저장 중 오류 발생: {e}")
 
 # FastAPI 애플리케이션(lifespan 이벤트 핸들러 추가)
 app = FastAPI(lifespan=lifespan)
@@ -50,8 +99,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Series-Resolution"],  # 페이지 커서, 시계열 해상도 헤더를 브라우저에서 읽을 수 있도록 노출
 )
 
+# 1KB 이상 응답은 gzip 압축 (Accept-Encoding: gzip 요청에 한함)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # 비동기 방식으로 테이블 생성
 async def create_tables():
     async with engine.begin() as conn:  # async로 연결
@@ -61,6 +114,10 @@ app.include_router(user_router.router)
 app.include_router(upload_router.router)
 app.include_router(population_router.router)
 app.include_router(vision_router.router)
+app.include_router(metrics_router.router)
+
+# /populations, /upload, /vision 요청 처리 시간 기록
+app.middleware("http")(track_request_latency)
 
 # local 설정
 app.mount("/assets", StaticFiles(directory="../svelte-app/dist/assets"))
@@ -0,0 +1,68 @@
+"""baseline: user, population, places
+
+기존 배포 DB에는 이미 있는 테이블이므로, 없을 때만 생성합니다.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-04-01 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'user' not in existing:
+        op.create_table(
+            'user',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('username', sa.String(255), nullable=False, unique=True),
+            sa.Column('password', sa.String(255), nullable=False),
+            sa.Column('email', sa.String(255), nullable=False, unique=True),
+        )
+
+    if 'population' not in existing:
+        op.create_table(
+            'population',
+            sa.Column('datetime', sa.DateTime(timezone=True), primary_key=True, nullable=False),
+            sa.Column('region_id', sa.String(255), primary_key=True, nullable=False),
+            sa.Column('male_rate', sa.Float(), nullable=True),
+            sa.Column('female_rate', sa.Float(), nullable=True),
+            sa.Column('area_congest', sa.String(255), nullable=True),
+            sa.Column('congestion_message', sa.String(255), nullable=True),
+            sa.Column('gen_10', sa.Float(), nullable=True),
+            sa.Column('gen_20', sa.Float(), nullable=True),
+            sa.Column('gen_30', sa.Float(), nullable=True),
+            sa.Column('gen_40', sa.Float(), nullable=True),
+            sa.Column('gen_50', sa.Float(), nullable=True),
+            sa.Column('gen_60', sa.Float(), nullable=True),
+            sa.Column('gen_70', sa.Float(), nullable=True),
+            sa.Column('min_population', sa.Integer(), nullable=True),
+            sa.Column('max_population', sa.Integer(), nullable=True),
+        )
+        op.create_index('ix_population_datetime', 'population', ['datetime'])
+
+    if 'places' not in existing:
+        op.create_table(
+            'places',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('name', sa.String(255), nullable=True),
+            sa.Column('place_id', sa.String(255), nullable=True),
+        )
+        op.create_index('ix_places_id', 'places', ['id'])
+        op.create_index('ix_places_name', 'places', ['name'])
+        op.create_index('ix_places_place_id', 'places', ['place_id'])
+
+
+def downgrade() -> None:
+    # 기존 데이터 보호를 위해 baseline 테이블은 삭제하지 않음
+    pass
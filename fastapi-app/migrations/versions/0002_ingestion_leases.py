@@ -0,0 +1,39 @@
+"""ingestion worker heartbeat and shard lease tables
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-04-01 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingestion_worker',
+        sa.Column('worker_id', sa.String(64), primary_key=True),
+        sa.Column('hostname', sa.String(255), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_ingestion_worker_heartbeat_at', 'ingestion_worker', ['heartbeat_at'])
+
+    op.create_table(
+        'ingestion_lease',
+        sa.Column('shard_id', sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column('owner_id', sa.String(64), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ingestion_lease')
+    op.drop_index('ix_ingestion_worker_heartbeat_at', table_name='ingestion_worker')
+    op.drop_table('ingestion_worker')
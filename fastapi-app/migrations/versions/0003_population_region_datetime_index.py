@@ -0,0 +1,26 @@
+"""population (region_id, datetime DESC) index
+
+지역별 최신순 페이징과 시간 범위 조회가 인덱스 범위 탐색으로 처리되도록 추가합니다.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-04-01 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_population_region_datetime', 'population', ['region_id', sa.text('datetime DESC')])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_population_region_datetime', table_name='population')
@@ -0,0 +1,62 @@
+"""population derived count columns
+
+성별/연령대별 최소·최대 인구 수(비율 * 인구 / 100)를 컬럼으로 추가하고 기존 행을 채웁니다.
+기존 행은 지역별로 나누어 UPDATE 합니다.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-04-01 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 컬럼 -> (비율 컬럼, 인구 컬럼). src.data.population.derived_counts.DERIVED_COUNTS와 같은 정의
+DERIVED_COUNTS = {
+    'male_min_population': ('male_rate', 'min_population'),
+    'male_max_population': ('male_rate', 'max_population'),
+    'female_min_population': ('female_rate', 'min_population'),
+    'female_max_population': ('female_rate', 'max_population'),
+}
+for _gen in ('gen_10', 'gen_20', 'gen_30', 'gen_40', 'gen_50', 'gen_60', 'gen_70'):
+    DERIVED_COUNTS[f'{_gen}_min'] = (_gen, 'min_population')
+    DERIVED_COUNTS[f'{_gen}_max'] = (_gen, 'max_population')
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('population') as batch_op:
+        for column in DERIVED_COUNTS:
+            batch_op.add_column(sa.Column(column, sa.Float(), nullable=True))
+
+    source_columns = {name for pair in DERIVED_COUNTS.values() for name in pair}
+    population = sa.table(
+        'population',
+        sa.column('region_id', sa.String()),
+        *[sa.column(name, sa.Float()) for name in source_columns],
+        *[sa.column(name, sa.Float()) for name in DERIVED_COUNTS],
+    )
+    values = {
+        column: sa.case(
+            (sa.and_(population.c[pop] != 0, population.c[rate].isnot(None)), population.c[rate] * population.c[pop] / 100),
+            else_=None,
+        )
+        for column, (rate, pop) in DERIVED_COUNTS.items()
+    }
+
+    bind = op.get_bind()
+    region_ids = [row[0] for row in bind.execute(sa.select(population.c.region_id).distinct())]
+    for region_id in region_ids:
+        bind.execute(population.update().where(population.c.region_id == region_id).values(values))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('population') as batch_op:
+        for column in DERIVED_COUNTS:
+            batch_op.drop_column(column)
@@ -0,0 +1,48 @@
+"""population hourly / daily rollup tables
+
+시간/일 단위 집계 테이블을 만듭니다. 기존 데이터는 마이그레이션 후 아래 명령으로 채웁니다.
+    python -m src.data.population.rollup
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-04-01 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# src.data.population.rollup.ROLLUP_MEASURES, CONGEST_LEVELS와 같은 정의
+ROLLUP_MEASURES = (
+    'min_population', 'max_population', 'male_rate', 'female_rate',
+    'gen_10', 'gen_20', 'gen_30', 'gen_40', 'gen_50', 'gen_60', 'gen_70',
+)
+CONGEST_COLUMNS = ('congest_relaxed', 'congest_normal', 'congest_slightly_busy', 'congest_busy')
+ROLLUP_TABLES = ('population_hourly', 'population_daily')
+
+
+def upgrade() -> None:
+    for table_name in ROLLUP_TABLES:
+        op.create_table(
+            table_name,
+            sa.Column('region_id', sa.String(255), primary_key=True, nullable=False),
+            sa.Column('bucket', sa.DateTime(timezone=True), primary_key=True, nullable=False),
+            sa.Column('samples', sa.Integer(), nullable=False),
+            *[
+                sa.Column(f'{measure}_{stat}', sa.Float(), nullable=True)
+                for measure in ROLLUP_MEASURES
+                for stat in ('min', 'avg', 'max')
+            ],
+            *[sa.Column(column, sa.Integer(), nullable=False) for column in CONGEST_COLUMNS],
+        )
+
+
+def downgrade() -> None:
+    for table_name in reversed(ROLLUP_TABLES):
+        op.drop_table(table_name)
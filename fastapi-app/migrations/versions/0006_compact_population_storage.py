@@ -0,0 +1,183 @@
+"""compact population storage
+
+- area_congest: 문자열 -> SMALLINT 코드 (여유=1, 보통=2, 약간 붐빔=3, 붐빔=4)
+- congestion_message: 문자열 -> congestion_message 테이블 id (SMALLINT)
+- 비율 9개 (male_rate, female_rate, gen_10 ~ gen_70): FLOAT -> 10배 한 SMALLINT
+- 파생 인구 수 18개 (0004): FLOAT -> 1000배 한 INTEGER (소수 셋째 자리까지 그대로 복원)
+- 알 수 없는 혼잡도 단계는 원래 값을 출력하고 NULL로 변환
+- MySQL: population 테이블을 datetime 기준 월별 RANGE COLUMNS 파티션으로 분할
+  (파티션 테이블은 외래 키를 지원하지 않으므로 congestion_message_id에는 제약을 두지 않음)
+기존 행은 지역별로 나누어 UPDATE 합니다. 조회 API의 응답 값은 바뀌지 않습니다.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-04-01 00:00:00
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# src.model.column_types와 같은 정의
+CONGEST_LEVEL_CODES = {'여유': 1, '보통': 2, '약간 붐빔': 3, '붐빔': 4}
+RATE_SCALE = 10
+COUNT_SCALE = 1000
+RATE_COLUMNS = ('male_rate', 'female_rate', 'gen_10', 'gen_20', 'gen_30', 'gen_40', 'gen_50', 'gen_60', 'gen_70')
+# 0004와 같은 정의: 컬럼 -> (비율 컬럼, 인구 컬럼)
+DERIVED_COUNTS = {
+    'male_min_population': ('male_rate', 'min_population'),
+    'male_max_population': ('male_rate', 'max_population'),
+    'female_min_population': ('female_rate', 'min_population'),
+    'female_max_population': ('female_rate', 'max_population'),
+}
+for _gen in ('gen_10', 'gen_20', 'gen_30', 'gen_40', 'gen_50', 'gen_60', 'gen_70'):
+    DERIVED_COUNTS[f'{_gen}_min'] = (_gen, 'min_population')
+    DERIVED_COUNTS[f'{_gen}_max'] = (_gen, 'max_population')
+PARTITION_MONTHS_AHEAD = 3
+
+
+def _month_start(value: date, months: int = 0) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _population_table(congest_type, rate_type, count_type):
+    return sa.table(
+        'population',
+        sa.column('region_id', sa.String()),
+        sa.column('datetime', sa.DateTime()),
+        sa.column('area_congest', congest_type),
+        sa.column('congestion_message', sa.String()),
+        sa.column('congestion_message_id', sa.SmallInteger()),
+        *[sa.column(name, rate_type) for name in RATE_COLUMNS],
+        *[sa.column(name, count_type) for name in DERIVED_COUNTS],
+    )
+
+
+def _update_by_region(bind, table, values):
+    region_ids = [row[0] for row in bind.execute(sa.select(table.c.region_id).distinct())]
+    for region_id in region_ids:
+        bind.execute(table.update().where(table.c.region_id == region_id).values(values))
+
+
+def _restore_desc_index():
+    # SQLite는 테이블을 다시 만들 때 인덱스의 DESC 정보가 빠지므로 0003과 같은 정의로 다시 만듦
+    op.drop_index('ix_population_region_datetime', table_name='population')
+    op.create_index('ix_population_region_datetime', 'population', ['region_id', sa.text('datetime DESC')])
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    population = _population_table(sa.String(), sa.Float(), sa.Float())
+    unknown = bind.execute(
+        sa.select(population.c.area_congest)
+        .where(population.c.area_congest.isnot(None), population.c.area_congest.notin_(list(CONGEST_LEVEL_CODES)))
+        .distinct()
+    ).scalars().all()
+    if unknown:
+        print(f'알 수 없는 혼잡도 단계는 NULL로 변환합니다: {unknown}')
+
+    messages = op.create_table(
+        'congestion_message',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('message', sa.String(255), nullable=False, unique=True),
+    )
+    with op.batch_alter_table('population') as batch_op:
+        batch_op.add_column(sa.Column('congestion_message_id', sa.SmallInteger(), nullable=True))
+
+    # 1. 값 변환 (컬럼 타입은 그대로 둔 채 코드 / 정수 값으로 바꿈)
+    bind.execute(messages.insert().from_select(
+        ['message'],
+        sa.select(population.c.congestion_message).where(population.c.congestion_message.isnot(None)).distinct(),
+    ))
+    values = {
+        'congestion_message_id': (
+            sa.select(messages.c.id).where(messages.c.message == population.c.congestion_message).scalar_subquery()
+        ),
+        'area_congest': sa.case(
+            *[(population.c.area_congest == level, str(code)) for level, code in CONGEST_LEVEL_CODES.items()],
+            else_=None,
+        ),
+    }
+    for name in RATE_COLUMNS:
+        values[name] = sa.func.round(population.c[name] * RATE_SCALE)
+    for name in DERIVED_COUNTS:
+        values[name] = sa.func.round(population.c[name] * COUNT_SCALE)
+    _update_by_region(bind, population, values)
+
+    # 2. 컬럼 타입 변경 (SQLite는 테이블을 다시 만들며 CAST로 복사)
+    with op.batch_alter_table('population') as batch_op:
+        batch_op.drop_column('congestion_message')
+        batch_op.alter_column(
+            'area_congest', type_=sa.SmallInteger(), existing_type=sa.String(255), existing_nullable=True,
+            postgresql_using='area_congest::smallint',
+        )
+        for name in RATE_COLUMNS:
+            batch_op.alter_column(
+                name, type_=sa.SmallInteger(), existing_type=sa.Float(), existing_nullable=True,
+                postgresql_using=f'{name}::smallint',
+            )
+        for name in DERIVED_COUNTS:
+            batch_op.alter_column(
+                name, type_=sa.Integer(), existing_type=sa.Float(), existing_nullable=True,
+                postgresql_using=f'{name}::integer',
+            )
+    if bind.dialect.name == 'sqlite':
+        _restore_desc_index()
+
+    # 3. MySQL: 월별 파티션 (가장 오래된 데이터의 달부터 PARTITION_MONTHS_AHEAD달 뒤까지 + pmax)
+    if bind.dialect.name == 'mysql':
+        oldest = bind.execute(sa.select(sa.func.min(population.c.datetime))).scalar()
+        first = _month_start(oldest.date() if oldest else date.today())
+        last = _month_start(date.today(), PARTITION_MONTHS_AHEAD)
+        clauses = []
+        month = first
+        while month <= last:
+            clauses.append(f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{_month_start(month, 1):%Y-%m-%d} 00:00:00')")
+            month = _month_start(month, 1)
+        clauses.append('PARTITION pmax VALUES LESS THAN (MAXVALUE)')
+        op.execute(f"ALTER TABLE population PARTITION BY RANGE COLUMNS(`datetime`) ({', '.join(clauses)})")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'mysql':
+        op.execute('ALTER TABLE population REMOVE PARTITIONING')
+
+    with op.batch_alter_table('population') as batch_op:
+        batch_op.add_column(sa.Column('congestion_message', sa.String(255), nullable=True))
+        batch_op.alter_column('area_congest', type_=sa.String(255), existing_type=sa.SmallInteger(), existing_nullable=True)
+        for name in RATE_COLUMNS:
+            batch_op.alter_column(name, type_=sa.Float(), existing_type=sa.SmallInteger(), existing_nullable=True)
+        for name in DERIVED_COUNTS:
+            batch_op.alter_column(name, type_=sa.Float(), existing_type=sa.Integer(), existing_nullable=True)
+
+    population = _population_table(sa.String(), sa.Float(), sa.Float())
+    messages = sa.table('congestion_message', sa.column('id', sa.Integer()), sa.column('message', sa.String()))
+    values = {
+        'congestion_message': (
+            sa.select(messages.c.message).where(messages.c.id == population.c.congestion_message_id).scalar_subquery()
+        ),
+        'area_congest': sa.case(
+            *[(population.c.area_congest == str(code), level) for level, code in CONGEST_LEVEL_CODES.items()],
+            else_=None,
+        ),
+    }
+    for name in RATE_COLUMNS:
+        values[name] = population.c[name] / float(RATE_SCALE)
+    for name in DERIVED_COUNTS:
+        values[name] = population.c[name] / float(COUNT_SCALE)
+    _update_by_region(bind, population, values)
+
+    with op.batch_alter_table('population') as batch_op:
+        batch_op.drop_column('congestion_message_id')
+    if bind.dialect.name == 'sqlite':
+        _restore_desc_index()
+    op.drop_table('congestion_message')
@@ -61,11 +61,19 @@ else:
         # Azure 환경 설정
         SQLALCHEMY_DATABASE_URL = os.getenv("SQLALCHEMY_DATABASE_URL")
 
+    # 연결 풀 설정 (SQLite URL은 풀 크기 설정을 지원하지 않으므로 서버형 DB에만 적용. 벤치마크 등에서 SQLite 사용 가능)
+    if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+        pool_options = {}
+    else:
+        pool_options = {
+            "pool_size": 10,  # 기본 연결 풀 크기
+            "max_overflow": 20,  # 최대 초과 연결
+            "pool_recycle": 1800,  # 30분마다 연결 재활용
+        }
+
     # 비동기 엔진 및 세션 설정. echo=True: SQLAlchemy가 실행하는 모든 SQL 쿼리와 관련 정보가 터미널에 출력.
     engine = create_async_engine(SQLALCHEMY_DATABASE_URL,
-                                pool_size=10,  # 기본 연결 풀 크기
-                                max_overflow=20,  # 최대 초과 연결
-                                pool_recycle=1800,  # 30분마다 연결 재활용
+                                **pool_options,
                                 future=True, echo=False)
 
     AsyncSessionLocal = sessionmaker(
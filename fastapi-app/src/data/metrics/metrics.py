@@ -0,0 +1,68 @@
+import time
+
+from fastapi import Request
+from prometheus_client import Counter, Gauge, Histogram
+
+# 수집(ingestion) 지표
+INGESTION_STAGE_SECONDS = Histogram(
+    "seouleasy_ingestion_stage_seconds",
+    "지역 하나를 수집할 때 단계별 소요 시간 (fetch: API 요청, parse: XML 파싱, db: 사이클 저장)",
+    ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+INGESTION_CYCLE_SECONDS = Histogram(
+    "seouleasy_ingestion_cycle_seconds",
+    "수집 사이클 1회의 소요 시간 (makespan)",
+    buckets=(1, 2.5, 5, 10, 20, 30, 60, 120, 240, 300),
+)
+INGESTION_AREAS_TOTAL = Counter(
+    "seouleasy_ingestion_areas_total",
+    "처리한 지역 수 (status: ok / timeout / error / skipped)",
+    ["status"],
+)
+INGESTION_ROWS_TOTAL = Counter(
+    "seouleasy_ingestion_rows_total",
+    "저장 시도한 인구 데이터 행 수 (result: inserted / skipped)",
+    ["result"],
+)
+UPSTREAM_RESPONSES_TOTAL = Counter(
+    "seouleasy_upstream_responses_total",
+    "서울시 citydata API 응답 수 (HTTP 상태 코드별)",
+    ["status_code"],
+)
+
+# API 요청 지표
+REQUEST_SECONDS = Histogram(
+    "seouleasy_http_request_seconds",
+    "엔드포인트별 요청 처리 시간",
+    ["method", "route", "status_code"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+# 실시간 스트림(/populations/stream) 구독자 수
+STREAM_SUBSCRIBERS = Gauge(
+    "seouleasy_stream_subscribers",
+    "현재 연결된 실시간 인구 데이터 스트림 구독자 수",
+    multiprocess_mode="livesum",
+)
+
+# 요청 시간을 기록할 라우터 경로
+TRACKED_PREFIXES = ("/populations", "/upload", "/vision")
+
+
+async def track_request_latency(request: Request, call_next):
+    """TRACKED_PREFIXES 라우터의 요청 처리 시간을 라우트 템플릿(/populations/region/{region_id}) 단위로 기록하는 미들웨어."""
+    if not request.url.path.startswith(TRACKED_PREFIXES):
+        return await call_next(request)
+
+    start_time = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        # 매칭되지 않은 경로는 하나로 묶어 라벨 수가 늘어나지 않게 함
+        route_path = route.path if route is not None else "unmatched"
+        REQUEST_SECONDS.labels(request.method, route_path, str(status_code)).observe(time.perf_counter() - start_time)
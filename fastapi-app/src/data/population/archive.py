@@ -0,0 +1,287 @@
+"""
+population 보관 기간(retention) 관리와 Parquet 콜드 아카이브.
+
+RETENTION_DAYS보다 오래된 행을 날짜별 Parquet 파일(zstd 압축)로 옮기고, DB에서는 지역/일 단위로 나누어 삭제합니다.
+    {ARCHIVE_DIR}/date=YYYY-MM-DD/population.parquet   (hive 파티션, 파일 안은 region_id, datetime 순 정렬)
+- 날짜 디렉토리로 파티션을, region_id/datetime 통계로 행 그룹을 건너뛰고, 필요한 컬럼만 읽습니다.
+- 시간/일 단위 집계(population_hourly, population_daily)는 지우지 않으므로 긴 기간 시계열은 그대로 DB에서 읽습니다.
+- 웹 서버와 수집 워커를 따로 실행하면 ARCHIVE_DIR은 같은 경로(공유 볼륨)여야 원본 해상도 조회에 아카이브가 포함됩니다.
+- 기본값은 꺼져 있습니다. (RETENTION_DAYS=0) 켜면 샤드 임대를 사용할 때는 리더 워커 한 곳에서만 실행하고,
+  임대 없이 여러 프로세스를 띄우는 경우에는 수집 프로세스 하나에서만 RETENTION_DAYS를 설정해야 합니다.
+
+수동 실행 (fastapi-app 디렉토리에서):
+    python -m src.data.population.archive [--before 2025-01-01]
+"""
+import argparse
+import asyncio
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func
+from sqlalchemy.future import select
+
+from src.data.database import AsyncSessionLocal, engine
+from src.data.population.derived_counts import DERIVED_COUNTS
+from src.data.population.partitions import drop_partitions_before
+from src.data.population.rollup import CONGEST_LEVELS, ROLLUP_MEASURES
+from src.data.population.snapshot_cache import SNAPSHOT_FIELDS
+from src.data.population.time_range import kst_now
+from src.model.population import PopulationStation, join_congestion_message, population_columns
+
+# Parquet 아카이브는 pyarrow가 설치된 경우에만 지원
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# 보관/아카이브 설정
+RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "0"))  # DB에 남길 기간(일). 0이면 보관 작업을 하지 않음 (기본)
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "population_archive")  # 아카이브 디렉토리
+ARCHIVE_COMPRESSION = os.getenv("ARCHIVE_COMPRESSION", "zstd")
+ARCHIVE_ROW_GROUP_SIZE = int(os.getenv("ARCHIVE_ROW_GROUP_SIZE", "4096"))  # 행 그룹 크기 (작을수록 지역 필터로 건너뛰는 범위가 세밀)
+ARCHIVE_INTERVAL = float(os.getenv("ARCHIVE_INTERVAL", "86400"))  # 보관 작업 주기(초)
+ARCHIVE_FILE_NAME = "population.parquet"
+# 데이터셋 탐색에서 제외하는 파일 이름 접두사 (쓰는 중인 임시 파일 등). pyarrow 기본값과 같음
+ARCHIVE_IGNORE_PREFIXES = [".", "_"]
+
+# 아카이브 컬럼 (조회 API 값 그대로 + 파생 인구 수). DB 저장 형식(코드, 정수 비율)과 무관하게 원래 값으로 저장
+ARCHIVE_FIELDS = SNAPSHOT_FIELDS + tuple(DERIVED_COUNTS)
+TEXT_FIELDS = {"region_id", "area_congest", "congestion_message"}
+INT_FIELDS = {"min_population", "max_population"}
+
+
+def archive_schema(names: Sequence[str] = ARCHIVE_FIELDS):
+    fields = []
+    for name in names:
+        if name == "datetime":
+            fields.append(pa.field(name, pa.timestamp("s")))  # KST, tz 없음
+        elif name in TEXT_FIELDS:
+            fields.append(pa.field(name, pa.string()))
+        elif name in INT_FIELDS:
+            fields.append(pa.field(name, pa.int32()))
+        else:
+            fields.append(pa.field(name, pa.float64()))
+    return pa.schema(fields)
+
+
+def retention_cutoff(now: Optional[datetime] = None) -> datetime:
+    """이 시각(자정, KST) 이전의 행은 아카이브 대상입니다."""
+    now = now or kst_now()
+    return datetime.combine(now.date() - timedelta(days=RETENTION_DAYS), datetime.min.time())
+
+
+def day_path(day: date, archive_dir: str = ARCHIVE_DIR) -> str:
+    return os.path.join(archive_dir, f"date={day:%Y-%m-%d}", ARCHIVE_FILE_NAME)
+
+
+def archived_days(archive_dir: str = ARCHIVE_DIR) -> List[date]:
+    if not os.path.isdir(archive_dir):
+        return []
+    days = []
+    for name in os.listdir(archive_dir):
+        if name.startswith("date=") and os.path.exists(os.path.join(archive_dir, name, ARCHIVE_FILE_NAME)):
+            days.append(date.fromisoformat(name[len("date="):]))
+    return sorted(days)
+
+
+def rows_to_table(rows: Sequence[tuple], names: Sequence[str] = ARCHIVE_FIELDS):
+    """조회 결과(names 순서 튜플)를 Arrow 테이블로 변환합니다."""
+    schema = archive_schema(names)
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    arrays = []
+    for field, values in zip(schema, columns):
+        if field.name == "datetime":
+            values = [value.replace(tzinfo=None) for value in values]
+        arrays.append(pa.array(list(values), type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_day(day: date, table, archive_dir: str = ARCHIVE_DIR) -> int:
+    """
+    하루치 테이블을 Parquet 파일로 씁니다. 파일이 이미 있으면(이전 실행이 삭제 전에 중단된 경우) 합치고 중복을 제거합니다.
+    임시 파일에 쓴 뒤 교체하므로 중간에 종료되어도 기존 파일은 그대로입니다. 파일의 행 수를 반환합니다.
+    임시 파일은 날짜 디렉토리 밖(아카이브 디렉토리 바로 아래, "."로 시작하는 이름)에 써서 조회 시 데이터셋에 포함되지 않습니다.
+    """
+    path = day_path(day, archive_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        existing = pq.read_table(path, schema=table.schema)
+        keys = set(zip(table.column("region_id").to_pylist(), table.column("datetime").to_pylist()))
+        keep = [key not in keys for key in zip(existing.column("region_id").to_pylist(), existing.column("datetime").to_pylist())]
+        table = pa.concat_tables([existing.filter(pa.array(keep, type=pa.bool_())), table])
+    table = table.sort_by([("region_id", "ascending"), ("datetime", "ascending")])
+
+    tmp_path = os.path.join(archive_dir, f".{day:%Y-%m-%d}.{os.getpid()}.tmp")
+    pq.write_table(
+        table, tmp_path,
+        compression=ARCHIVE_COMPRESSION,
+        row_group_size=ARCHIVE_ROW_GROUP_SIZE,
+        write_statistics=True,
+    )
+    os.replace(tmp_path, path)
+    return table.num_rows
+
+
+async def archive_day(day: date, session_factory=AsyncSessionLocal, archive_dir: str = ARCHIVE_DIR) -> int:
+    """
+    하루치 행을 Parquet으로 옮기고 DB에서 삭제합니다. (파일을 쓴 뒤에만 삭제)
+    삭제는 지역별로 나누어 짧은 트랜잭션으로 실행하여 잠금 시간을 줄입니다. 옮긴 행 수를 반환합니다.
+    """
+    start = datetime.combine(day, datetime.min.time())
+    end = start + timedelta(days=1)
+    in_day = (PopulationStation.datetime >= start, PopulationStation.datetime < end)
+    async with session_factory() as db:
+        result = await db.execute(
+            join_congestion_message(select(*population_columns(ARCHIVE_FIELDS)))
+            .where(*in_day)
+            .order_by(PopulationStation.region_id, PopulationStation.datetime)
+        )
+        rows = result.all()
+    if not rows:
+        return 0
+
+    # Parquet 변환/압축은 스레드에서 (이벤트 루프를 막지 않음)
+    await asyncio.to_thread(write_day, day, rows_to_table(rows), archive_dir)
+
+    region_ids = sorted({row.region_id for row in rows})
+    for region_id in region_ids:
+        async with session_factory() as db:
+            async with db.begin():
+                await db.execute(delete(PopulationStation).where(PopulationStation.region_id == region_id, *in_day))
+    print(f"아카이브 완료: {day:%Y-%m-%d} ({len(rows)}행, {len(region_ids)}개 지역)")
+    return len(rows)
+
+
+async def archive_before(cutoff: datetime, session_factory=AsyncSessionLocal, archive_dir: str = ARCHIVE_DIR) -> Tuple[int, int]:
+    """cutoff 이전 날짜의 행을 하루씩 아카이브합니다. (처리한 일 수, 옮긴 행 수)를 반환합니다."""
+    async with session_factory() as db:
+        oldest = (await db.execute(select(func.min(PopulationStation.datetime)))).scalar()
+    if oldest is None:
+        return 0, 0
+
+    day = oldest.date()
+    days = moved = 0
+    while day < cutoff.date():
+        moved += await archive_day(day, session_factory, archive_dir)
+        days += 1
+        day += timedelta(days=1)
+
+    # MySQL: 아카이브로 옮긴 달의 빈 파티션 삭제
+    async with session_factory() as db:
+        await drop_partitions_before(db, cutoff.date())
+    return days, moved
+
+
+async def run_retention(leases=None, interval: float = ARCHIVE_INTERVAL):
+    """
+    수집 작업과 함께 실행. interval마다 보관 기간이 지난 행을 아카이브합니다.
+    샤드 임대를 사용하면 샤드 0을 담당한 워커 한 곳에서만 실행합니다.
+    """
+    if RETENTION_DAYS <= 0:
+        return
+    if not PARQUET_AVAILABLE:
+        print("pyarrow가 설치되지 않아 보관 작업을 실행하지 않습니다.")
+        return
+    while True:
+        if leases is None or leases.is_leader:
+            try:
+                days, moved = await archive_before(retention_cutoff())
+                if days:
+                    print(f"보관 작업 완료: {days}일, {moved}행")
+            except Exception as e:
+                print(f"보관 작업 중 오류 발생: {e}")
+        await asyncio.sleep(interval)
+
+
+def read_archive(region_id: str, start: datetime, end: datetime, columns: Sequence[str], archive_dir: str = ARCHIVE_DIR):
+    """
+    아카이브에서 region_id의 [start, end] 행을 읽습니다. (datetime 순)
+    날짜 파티션, 행 그룹 통계(region_id, datetime), 컬럼 선택으로 필요한 부분만 읽습니다.
+    """
+    dataset = ds.dataset(
+        archive_dir,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([("date", pa.date32())]), flavor="hive"),
+        ignore_prefixes=ARCHIVE_IGNORE_PREFIXES,
+    )
+    condition = (
+        (ds.field("date") >= start.date()) & (ds.field("date") <= end.date())
+        & (ds.field("region_id") == region_id)
+        & (ds.field("datetime") >= pa.scalar(start, pa.timestamp("s")))
+        & (ds.field("datetime") <= pa.scalar(end, pa.timestamp("s")))
+    )
+    return dataset.to_table(columns=list(columns), filter=condition).sort_by("datetime")
+
+
+def read_archive_day(day: date, start: datetime, end: datetime, region_ids: Optional[Sequence[str]], columns: Sequence[str], archive_dir: str = ARCHIVE_DIR):
+    """
+    하루치 아카이브 파일에서 [start, end] 범위(region_ids가 주어지면 해당 지역만)의 행을 읽습니다. (datetime, region_id 순)
+    행 그룹 통계로 범위 밖 행 그룹을 건너뛰고, 필요한 컬럼만 읽습니다.
+    """
+    filters = [("datetime", ">=", start), ("datetime", "<=", end)]
+    if region_ids is not None:
+        filters.append(("region_id", "in", list(region_ids)))
+    table = pq.read_table(day_path(day, archive_dir), columns=list(columns), filters=filters)
+    return table.sort_by([("datetime", "ascending"), ("region_id", "ascending")])
+
+
+def archived_series_rows(region_id: str, start: datetime, end: datetime, archive_dir: str = ARCHIVE_DIR) -> List[tuple]:
+    """아카이브 행을 원본 해상도 시계열 행(rollup.SERIES_NAMES 순서)으로 변환합니다."""
+    table = read_archive(region_id, start, end, ("datetime", "area_congest", *ROLLUP_MEASURES), archive_dir)
+    data = table.to_pydict()
+    rows = []
+    for i, observed_at in enumerate(data["datetime"]):
+        row = [observed_at, 1]
+        for measure in ROLLUP_MEASURES:
+            value = data[measure][i]
+            row += [value, value, value]
+        congest = data["area_congest"][i]
+        row += [1.0 if congest == level else 0.0 for level in CONGEST_LEVELS]
+        rows.append(tuple(row))
+    return rows
+
+
+async def merge_archived_series(region_id: str, start: datetime, end: datetime, rows: Sequence[tuple]) -> Sequence[tuple]:
+    """
+    원본 해상도 조회 범위에 아카이브된 날짜가 있으면 아카이브 행을 DB 조회 결과 앞에 합칩니다.
+    (아카이브 직후 삭제 전에는 같은 시각이 양쪽에 있을 수 있으므로 DB 행을 우선)
+    RETENTION_DAYS=0이어도 수동 실행(--before)으로 만든 아카이브는 포함합니다.
+    """
+    if not PARQUET_AVAILABLE:
+        return rows
+    if not any(start.date() <= day <= end.date() for day in archived_days()):
+        return rows
+    archived = await asyncio.to_thread(archived_series_rows, region_id, start, end)
+    hot: Dict[datetime, tuple] = {row[0].replace(tzinfo=None): row for row in rows}
+    merged = [row for row in archived if row[0] not in hot] + list(rows)
+    return sorted(merged, key=lambda row: row[0].replace(tzinfo=None))
+
+
+def _parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="보관 기간이 지난 population 행을 Parquet 아카이브로 옮기기")
+    parser.add_argument("--before", type=datetime.fromisoformat, default=None, help="이 날짜 이전 행을 옮김 (생략 시 RETENTION_DAYS일 전)")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[List[str]] = None):
+    args = _parse_args(argv)
+    if not PARQUET_AVAILABLE:
+        print("pyarrow가 설치되지 않았습니다.")
+        return
+    if args.before is None and RETENTION_DAYS <= 0:
+        # 보관 기간이 꺼져 있으면 기준일을 정할 수 없으므로 (오늘 이전 전체를 옮기지 않도록) 직접 지정해야 함
+        print("RETENTION_DAYS가 설정되지 않았습니다. --before로 기준 날짜를 지정하세요.")
+        return
+    try:
+        days, moved = await archive_before(args.before or retention_cutoff())
+        print(f"아카이브 완료: {days}일, {moved}행")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+
+from src.data.database import env_activate
+from src.data.metrics.metrics import INGESTION_STAGE_SECONDS, UPSTREAM_RESPONSES_TOTAL
+from src.data.population.rate_limiter import TokenBucket
+
+# HTTP/2는 h2 패키지가 설치된 경우에만 사용 (서버가 지원하지 않으면 HTTP/1.1로 자동 협상)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# 환경 변수 설정 (database.py에서 환경 변수 설정했으므로 다시 환경변수 프로젝트 위치 로드할 필요 없음)
+if env_activate:
+    ## local 환경 설정
+    API_KEY = os.getenv('API_KEY')
+else:
+    # Azure 환경 설정
+    API_KEY = os.getenv("API_KEY")
+
+# 서울시 실시간 도시데이터 API 설정
+BASE_URL = os.getenv("CITYDATA_BASE_URL", "http://openapi.seoul.go.kr:8088")
+SERVICE = "citydata"
+START_INDEX = 1
+END_INDEX = 5
+
+# 커넥션 풀 설정 (하나의 클라이언트를 모든 요청이 공유하여 TCP/TLS 핸드셰이크를 재사용)
+MAX_CONNECTIONS = int(os.getenv("CITYDATA_MAX_CONNECTIONS", "10"))  # 최대 동시 연결 수
+KEEPALIVE_EXPIRY = float(os.getenv("CITYDATA_KEEPALIVE_EXPIRY", "60"))  # 유휴 연결 유지 시간(초)
+REQUEST_TIMEOUT = float(os.getenv("CITYDATA_TIMEOUT", "10"))  # 요청 타임아웃(초)
+
+# 요청 속도 제한 설정 (기존 요청마다 0.5초 고정 대기 대신 토큰 버킷 사용)
+RATE_LIMIT = float(os.getenv("CITYDATA_RATE_LIMIT", "10"))  # 초당 최대 요청 수 (0 이하: 제한 없음)
+RATE_LIMIT_BURST = int(os.getenv("CITYDATA_RATE_LIMIT_BURST", "5"))  # 순간 최대 요청 수
+
+rate_limiter = TokenBucket(RATE_LIMIT, RATE_LIMIT_BURST)
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    애플리케이션 수명 동안 재사용할 HTTP 클라이언트를 생성합니다.
+    lifespan에서 생성하고 종료 시 aclose()로 닫아야 합니다.
+    """
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        base_url=BASE_URL,
+        limits=limits,
+        timeout=httpx.Timeout(REQUEST_TIMEOUT),
+        http2=HTTP2_AVAILABLE,
+    )
+
+
+def build_citydata_path(area_name: str) -> str:
+    return f"/{API_KEY}/xml/{SERVICE}/{START_INDEX}/{END_INDEX}/{area_name}"
+
+
+@asynccontextmanager
+async def stream_citydata(client: httpx.AsyncClient, area_name: str) -> AsyncIterator[httpx.Response]:
+    """
+    속도 제한기에서 토큰을 받은 뒤 요청하고, 본문을 읽지 않은 응답을 돌려줍니다. (response.aiter_bytes()로 받는 대로 처리)
+    fetch 지표는 응답 헤더를 받을 때까지의 시간입니다. (토큰 대기 시간 제외)
+    """
+    await rate_limiter.acquire()
+    start_time = time.perf_counter()
+    async with client.stream("GET", build_citydata_path(area_name)) as response:
+        INGESTION_STAGE_SECONDS.labels("fetch").observe(time.perf_counter() - start_time)
+        UPSTREAM_RESPONSES_TOTAL.labels(str(response.status_code)).inc()
+        yield response
@@ -0,0 +1,170 @@
+import asyncio
+import os
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from src.model.column_types import CONGEST_LEVEL_CODES
+
+# 실시간 인구 현황(LIVE_PPLTN_STTS) 태그 -> population 테이블 컬럼
+FLOAT_FIELDS = {
+    "MALE_PPLTN_RATE": "male_rate",
+    "FEMALE_PPLTN_RATE": "female_rate",
+    "PPLTN_RATE_10": "gen_10",
+    "PPLTN_RATE_20": "gen_20",
+    "PPLTN_RATE_30": "gen_30",
+    "PPLTN_RATE_40": "gen_40",
+    "PPLTN_RATE_50": "gen_50",
+    "PPLTN_RATE_60": "gen_60",
+    "PPLTN_RATE_70": "gen_70",
+}
+INT_FIELDS = {
+    "AREA_PPLTN_MIN": "min_population",
+    "AREA_PPLTN_MAX": "max_population",
+}
+TEXT_FIELDS = {
+    "AREA_CONGEST_LVL": "area_congest",
+    "AREA_CONGEST_MSG": "congestion_message",
+    "PPLTN_TIME": "update_time",
+}
+LIVE_FIELDS = {**FLOAT_FIELDS, **INT_FIELDS, **TEXT_FIELDS}
+
+FEED_CHUNK_BYTES = 16 * 1024  # parse_citydata가 한 번에 파서에 넘기는 크기
+
+LIVE_TAG = "LIVE_PPLTN_STTS"
+FORECAST_TAG = "FCST_PPLTN"  # 인구 예측 데이터 (수집 대상 아님)
+
+# 파싱 전용 스레드 풀 (XML 파싱이 이벤트 루프를 막지 않도록 분리)
+PARSER_WORKERS = int(os.getenv("CITYDATA_PARSER_WORKERS", "2"))
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    return float(value) if value else None
+
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    return int(value) if value else None
+
+
+def _build_row(area_code: Optional[str], values: Dict[str, str]) -> Optional[Dict]:
+    update_time = values.get("update_time")
+    if not area_code or not update_time:
+        return None
+    area_congest = values.get("area_congest") or None
+    if area_congest is not None and area_congest not in CONGEST_LEVEL_CODES:
+        # 혼잡도 단계는 코드로 저장하므로 알 수 없는 단계는 원래 값을 로그로 남기고 NULL로 저장 (나머지 값은 그대로 저장)
+        print(f"[{area_code}] 알 수 없는 혼잡도 단계입니다: {area_congest!r}")
+        area_congest = None
+
+    row = {
+        "datetime": datetime.strptime(update_time, "%Y-%m-%d %H:%M"),
+        "region_id": area_code,
+        "area_congest": area_congest,
+        "congestion_message": values.get("congestion_message"),
+    }
+    for column in FLOAT_FIELDS.values():
+        row[column] = _to_float(values.get(column))
+    for column in INT_FIELDS.values():
+        row[column] = _to_int(values.get(column))
+    return row
+
+
+class CitydataStreamParser:
+    """
+    citydata XML 응답에서 실시간 인구 현황만 추출하는 증분 파서 (XMLPullParser).
+    응답 본문을 받는 대로 feed()로 넘기며, 전체 트리를 만들지 않고 LIVE_PPLTN_STTS 하위 트리를 다 읽으면 멈춥니다.
+    (citydata API는 AREA_NM 하나당 CITYDATA 하나를 반환하며, 뒤따르는 도로/날씨 등은 파싱하지 않습니다.)
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self.rows: List[Dict] = []
+        self.done = False
+        self._area_code: Optional[str] = None
+        self._values: Dict[str, str] = {}
+        self._live_depth = 0  # LIVE_PPLTN_STTS 중첩 깊이 (<LIVE_PPLTN_STTS><LIVE_PPLTN_STTS>...)
+        self._forecast_depth = 0  # FCST_PPLTN 중첩 깊이
+
+    def feed(self, chunk: bytes) -> bool:
+        """응답 조각을 파싱합니다. 실시간 인구 현황을 다 읽었으면 True (이후 조각은 넘기지 않아도 됨)"""
+        if self.done:
+            return True
+        self._parser.feed(chunk)
+        for event, elem in self._parser.read_events():
+            if self._handle(event, elem):
+                self.done = True
+                break
+        return self.done
+
+    def _handle(self, event: str, elem) -> bool:
+        tag = elem.tag
+        if event == "start":
+            if tag == LIVE_TAG:
+                self._live_depth += 1
+            elif tag == FORECAST_TAG:
+                self._forecast_depth += 1
+            return False
+
+        if tag == LIVE_TAG:
+            self._live_depth -= 1
+            if self._live_depth == 0:
+                row = _build_row(self._area_code, self._values)
+                if row:
+                    self.rows.append(row)
+                return True
+        elif tag == FORECAST_TAG:
+            self._forecast_depth -= 1
+        elif tag == "AREA_CD" and self._area_code is None:
+            self._area_code = elem.text
+        elif self._live_depth and not self._forecast_depth and tag in LIVE_FIELDS:
+            self._values.setdefault(LIVE_FIELDS[tag], elem.text)
+
+        # 처리한 요소는 비워 메모리 사용량을 일정하게 유지
+        elem.clear()
+        return False
+
+
+def parse_citydata(payload: bytes) -> List[Dict]:
+    """이미 받은 응답 전체를 파싱합니다. (벤치마크, 테스트용. 조각으로 나눠 넘겨야 필요한 부분만 읽고 멈춤)"""
+    parser = CitydataStreamParser()
+    view = memoryview(payload)
+    for offset in range(0, len(payload), FEED_CHUNK_BYTES):
+        if parser.feed(view[offset:offset + FEED_CHUNK_BYTES]):
+            break
+    return parser.rows
+
+
+def get_parser_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=PARSER_WORKERS, thread_name_prefix="citydata-parser")
+    return _executor
+
+
+async def parse_citydata_stream(chunks: AsyncIterator[bytes]) -> Tuple[List[Dict], float]:
+    """
+    응답 본문을 받는 대로 파싱합니다. (응답 전체를 메모리에 모으지 않음)
+    파싱은 스레드 풀에서 실행하여 이벤트 루프(API 요청 처리)를 막지 않습니다.
+    필요한 부분을 다 읽은 뒤의 본문은 파싱하지 않고 받아서 버립니다. (연결을 끊지 않고 커넥션 풀에서 재사용)
+    (행 목록, 파싱에 쓴 시간(초))을 반환합니다.
+    """
+    loop = asyncio.get_running_loop()
+    parser = CitydataStreamParser()
+    parse_seconds = 0.0
+    async for chunk in chunks:
+        if parser.done:
+            continue
+        started = time.perf_counter()
+        await loop.run_in_executor(get_parser_executor(), parser.feed, chunk)
+        parse_seconds += time.perf_counter() - started
+    return parser.rows, parse_seconds
+
+
+def shutdown_parser_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,25 @@
+from typing import Dict, Optional, Tuple
+
+# 수집 시 한 번만 계산해 저장하는 인구 수 컬럼: 컬럼 -> (비율 컬럼, 인구 컬럼)
+# 비율(%) * 인구 / 100. 조회 API는 이 컬럼을 그대로 읽습니다.
+DERIVED_COUNTS: Dict[str, Tuple[str, str]] = {
+    "male_min_population": ("male_rate", "min_population"),
+    "male_max_population": ("male_rate", "max_population"),
+    "female_min_population": ("female_rate", "min_population"),
+    "female_max_population": ("female_rate", "max_population"),
+}
+for _gen in ("gen_10", "gen_20", "gen_30", "gen_40", "gen_50", "gen_60", "gen_70"):
+    DERIVED_COUNTS[f"{_gen}_min"] = (_gen, "min_population")
+    DERIVED_COUNTS[f"{_gen}_max"] = (_gen, "max_population")
+
+
+def derive_count(rate: Optional[float], population: Optional[int]) -> Optional[float]:
+    # 기존 API 응답과 같은 규칙: 인구가 없거나 0이면, 또는 비율이 없으면 None
+    return rate * population / 100 if population and rate is not None else None
+
+
+def add_derived_counts(row: dict) -> dict:
+    """파싱한 행(dict)에 파생 인구 수 컬럼을 채워 반환합니다."""
+    for column, (rate_column, population_column) in DERIVED_COUNTS.items():
+        row[column] = derive_count(row.get(rate_column), row.get(population_column))
+    return row
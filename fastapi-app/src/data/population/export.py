@@ -0,0 +1,179 @@
+"""
+population 이력 내보내기 (CSV / NDJSON / Parquet).
+
+행을 EXPORT_CHUNK_ROWS개씩 읽어 바로 인코딩하고 응답으로 흘려보내므로, 내보내는 행 수와 관계없이 메모리 사용량이 일정합니다.
+- DB: 서버 측 커서(stream + yield_per)로 청크 단위 조회
+- 아카이브된 날짜: Parquet 아카이브를 하루 파일씩 읽음 (DB는 마지막 아카이브 날짜 다음 날부터 조회)
+"""
+import asyncio
+import csv
+import io
+import os
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Optional, Sequence
+
+import orjson
+from sqlalchemy.future import select
+
+from src.data.database import AsyncSessionLocal
+from src.data.population.archive import PARQUET_AVAILABLE, archived_days, archive_schema, read_archive_day, rows_to_table
+from src.data.population.snapshot_cache import SNAPSHOT_FIELDS
+from src.model.population import PopulationStation, join_congestion_message, population_columns
+
+if PARQUET_AVAILABLE:
+    import pyarrow.parquet as pq
+
+# 내보내기 설정
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "5000"))  # 한 번에 읽고 인코딩할 행 수 (Parquet은 행 그룹 크기)
+EXPORT_MAX_DAYS = int(os.getenv("EXPORT_MAX_DAYS", "366"))  # 한 번에 내보낼 수 있는 최대 기간(일)
+
+EXPORT_FIELDS = SNAPSHOT_FIELDS  # 조회 API(/region/{region_id})와 같은 컬럼
+EXPORT_COLUMNS = population_columns(EXPORT_FIELDS)  # 조회 시 join_congestion_message() 필요
+
+# 형식 -> (media type, 파일 확장자)
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+class CsvEncoder:
+    def __init__(self, names: Sequence[str]):
+        self.names = names
+
+    def header(self) -> bytes:
+        return self.encode([self.names])
+
+    def encode(self, rows) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        for row in rows:
+            # datetime은 JSON 응답과 같은 ISO 8601 형식
+            writer.writerow([value.isoformat() if isinstance(value, datetime) else value for value in row])
+        return buffer.getvalue().encode("utf-8")
+
+    def close(self) -> bytes:
+        return b""
+
+
+class NdjsonEncoder:
+    def __init__(self, names: Sequence[str]):
+        self.names = names
+
+    def header(self) -> bytes:
+        return b""
+
+    def encode(self, rows) -> bytes:
+        return b"".join(orjson.dumps(dict(zip(self.names, row))) + b"\n" for row in rows)
+
+    def close(self) -> bytes:
+        return b""
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    ParquetWriter가 쓴 바이트를 모아 두었다가 drain()으로 꺼내는 출력 스트림.
+    꺼낸 뒤에도 tell()은 전체 위치를 반환하므로 footer의 행 그룹 위치가 올바르게 기록됩니다.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ParquetEncoder:
+    """청크마다 행 그룹 하나를 쓰고 바로 내보냅니다. (zstd 압축)"""
+
+    def __init__(self, names: Sequence[str]):
+        self.names = names
+        self.sink = _ChunkSink()
+        self.writer = pq.ParquetWriter(self.sink, archive_schema(names), compression="zstd")
+
+    def header(self) -> bytes:
+        return self.sink.drain()
+
+    def encode(self, rows) -> bytes:
+        self.writer.write_table(rows_to_table(rows, self.names))
+        return self.sink.drain()
+
+    def close(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+
+ENCODERS = {"csv": CsvEncoder, "ndjson": NdjsonEncoder, "parquet": ParquetEncoder}
+
+
+async def iter_population_chunks(region_ids: Optional[Sequence[str]], start: datetime, end: datetime) -> AsyncIterator[Sequence[tuple]]:
+    """
+    [start, end] 범위의 행을 시간 순서로 EXPORT_CHUNK_ROWS개씩 반환합니다. (EXPORT_FIELDS 순서 튜플)
+    요청 세션은 응답이 시작되기 전에 닫히므로, 스트리밍 중에는 별도 세션을 엽니다.
+    아카이브는 오래된 날짜부터 하루씩 만들어지고 파일을 쓴 뒤에 DB에서 지우므로, 아카이브 직후 삭제 전에는
+    같은 행이 양쪽에 있습니다. 아카이브에서 읽은 날짜는 DB에서 다시 읽지 않습니다.
+    """
+    db_start = start
+    # 1. 아카이브된 날짜는 아카이브에서 하루씩
+    if PARQUET_AVAILABLE:
+        for day in archived_days():
+            if not start.date() <= day <= end.date():
+                continue
+            table = await asyncio.to_thread(read_archive_day, day, start, end, region_ids, EXPORT_FIELDS)
+            for batch in table.to_batches(max_chunksize=EXPORT_CHUNK_ROWS):
+                columns = [batch.column(name).to_pylist() for name in EXPORT_FIELDS]
+                yield list(zip(*columns))
+            db_start = max(db_start, datetime.combine(day + timedelta(days=1), datetime.min.time()))
+    if db_start > end:
+        return
+
+    # 2. DB: 마지막 아카이브 날짜 이후만, 서버 측 커서로 청크 단위 조회 (기본 키 (datetime, region_id) 순서)
+    query = (
+        join_congestion_message(select(*EXPORT_COLUMNS))
+        .where(PopulationStation.datetime >= db_start, PopulationStation.datetime <= end)
+        .order_by(PopulationStation.datetime, PopulationStation.region_id)
+        .execution_options(yield_per=EXPORT_CHUNK_ROWS)
+    )
+    if region_ids is not None:
+        query = query.where(PopulationStation.region_id.in_(list(region_ids)))
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+
+async def export_population(export_format: str, region_ids: Optional[Sequence[str]], start: datetime, end: datetime) -> AsyncIterator[bytes]:
+    """StreamingResponse 본문. 청크를 읽는 즉시 인코딩하여 내보냅니다."""
+    encoder = ENCODERS[export_format](EXPORT_FIELDS)
+    rows = 0
+    try:
+        header = encoder.header()
+        if header:
+            yield header
+        async for chunk in iter_population_chunks(region_ids, start, end):
+            rows += len(chunk)
+            yield encoder.encode(chunk)
+        tail = encoder.close()
+        if tail:
+            yield tail
+        print(f"내보내기 완료: {export_format}, {rows}행")
+    except Exception as e:
+        # 응답이 이미 시작되어 상태 코드를 바꿀 수 없으므로 기록 후 중단 (클라이언트는 잘린 파일을 받음)
+        print(f"내보내기 중 오류 발생 ({rows}행 이후): {e}")
+        raise
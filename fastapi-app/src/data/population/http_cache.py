@@ -0,0 +1,120 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.data.population.poll_planner import DEFAULT_CADENCE, KST
+from src.data.population.snapshot_cache import get_latest_snapshot, latest_snapshots
+
+# Cache-Control max-age 범위 (다음 갱신 예상 시각까지 남은 시간을 이 범위로 제한)
+HTTP_CACHE_MIN_AGE = int(os.getenv("HTTP_CACHE_MIN_AGE", "10"))  # 갱신 예상 시각이 지났을 때 (초)
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "300"))  # 최대 (초)
+
+
+@dataclass
+class CacheValidators:
+    """응답의 ETag / Last-Modified / Cache-Control 값."""
+    etag: str
+    last_modified: datetime  # UTC
+    max_age: int
+
+    @property
+    def headers(self) -> dict:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+            "Cache-Control": f"public, max-age={self.max_age}",
+            "Vary": "Accept",
+        }
+
+    def is_not_modified(self, request: Request) -> bool:
+        # If-None-Match가 있으면 그것만 비교 (약한 비교), 없을 때만 If-Modified-Since 비교
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or self.etag.removeprefix("W/") in tags
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return self.last_modified.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def not_modified(self) -> Response:
+        return Response(status_code=304, headers=self.headers)
+
+    def apply(self, response: Response) -> Response:
+        for name, value in self.headers.items():
+            if name == "Vary" and "vary" in response.headers:
+                continue
+            response.headers[name] = value
+        return response
+
+
+def build_validators(request: Request, newest: datetime, expected_next: datetime, version: str = "", now: Optional[datetime] = None) -> CacheValidators:
+    """
+    newest: 응답에 포함된 가장 최신 데이터 시각 (KST, tz 없음)
+    expected_next: 다음 데이터가 나올 것으로 예상되는 시각 (KST, tz 없음)
+    version: 여러 지역 응답처럼 최신 시각만으로 변경을 알 수 없을 때 ETag에 더할 값
+    ETag는 최신 데이터 시각 + 요청(경로, 쿼리, Accept)으로 만들어, 새 데이터가 저장되기 전까지 같은 값을 유지합니다.
+    """
+    now = now or datetime.now(KST).replace(tzinfo=None)
+    newest = newest.replace(tzinfo=None)
+    representation = f"{request.url.path}?{request.url.query}|{request.headers.get('accept', '')}|{version}"
+    digest = hashlib.blake2b(representation.encode("utf-8"), digest_size=8).hexdigest()
+    etag = f'W/"{newest:%Y%m%d%H%M%S}-{digest}"'
+    max_age = int((expected_next - now).total_seconds())
+    max_age = min(HTTP_CACHE_MAX_AGE, max(HTTP_CACHE_MIN_AGE, max_age))
+    return CacheValidators(etag=etag, last_modified=newest.replace(tzinfo=KST).astimezone(timezone.utc), max_age=max_age)
+
+
+def window_version(ranges: Iterable[Tuple[datetime, datetime]]) -> str:
+    """
+    조회 범위를 ETag에 더할 값으로 만듭니다.
+    "최근 60분", "end 생략 시 현재 시각"처럼 요청 시각에 따라 움직이는 범위는 URL이 같아도 결과가 달라지므로
+    실제로 계산된 범위를 ETag에 반영해야 합니다. PPLTN_TIME은 분 단위이므로 포함되는 행이 같은 범위는
+    (시작은 분 단위로 올림, 끝은 내림) 같은 값이 되어 범위가 조금 움직여도 304로 응답할 수 있습니다.
+    """
+    parts = []
+    for range_start, range_end in ranges:
+        range_start = range_start.replace(tzinfo=None)
+        if range_start.second or range_start.microsecond:
+            range_start = range_start.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        parts.append(f"{range_start:%Y%m%d%H%M}-{range_end:%Y%m%d%H%M}")
+    return ",".join(parts)
+
+
+async def region_validators(request: Request, db: AsyncSession, region_id: str, version: str = "") -> Optional[CacheValidators]:
+    """
+    지역의 최신 데이터 시각으로 검증 값을 만듭니다. (최신 데이터 캐시 조회, 캐시에 없으면 인덱스로 한 건만 조회)
+    시간 범위를 조회하는 API는 window_version()으로 만든 값을 version으로 넘깁니다.
+    데이터가 없으면 None.
+    """
+    snapshot = await get_latest_snapshot(db, region_id)
+    if snapshot is None:
+        return None
+    expected_next = latest_snapshots.expected_next_update(region_id, timedelta(seconds=DEFAULT_CADENCE))
+    return build_validators(request, snapshot.datetime, expected_next, version)
+
+
+def snapshots_validators(request: Request, snapshots: Iterable) -> Optional[CacheValidators]:
+    """여러 지역 스냅샷 중 가장 최신 시각과 가장 이른 다음 갱신 예상 시각으로 검증 값을 만듭니다."""
+    snapshots = list(snapshots)
+    if not snapshots:
+        return None
+    default_interval = timedelta(seconds=DEFAULT_CADENCE)
+    newest = max(snapshot.datetime.replace(tzinfo=None) for snapshot in snapshots)
+    expected_next = min(
+        latest_snapshots.expected_next_update(snapshot.region_id, default_interval)
+        or snapshot.datetime.replace(tzinfo=None) + default_interval
+        for snapshot in snapshots
+    )
+    # 지역마다 갱신 시각이 같을 수 있으므로 지역별 시각 전체를 ETag에 반영
+    version = ",".join(f"{snapshot.region_id}:{snapshot.datetime:%Y%m%d%H%M}" for snapshot in snapshots)
+    return build_validators(request, newest, expected_next, version)
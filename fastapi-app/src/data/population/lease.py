@@ -0,0 +1,162 @@
+import asyncio
+import math
+import os
+import random
+import socket
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Set
+
+from sqlalchemy import delete, func, or_, select, update
+
+from src.data.database import AsyncSessionLocal
+from src.data.population.population_writer import build_insert_ignore
+from src.model.ingestion import IngestionLease, IngestionWorker
+
+# 샤드/임대 설정
+NUM_SHARDS = int(os.getenv("INGESTION_SHARDS", "8"))  # AREA_NM_LIST를 나눌 샤드 수
+LEASE_TTL = float(os.getenv("INGESTION_LEASE_TTL", "60"))  # 임대 유효 시간(초). 갱신이 끊기면 이 시간 뒤 다른 워커가 인수
+LEASE_RENEW_INTERVAL = LEASE_TTL / 3  # 임대 갱신 주기(초)
+DEAD_WORKER_CLEANUP = LEASE_TTL * 10  # 이 시간 동안 신호가 없는 워커 기록은 삭제
+
+
+def shard_of(area_name: str, num_shards: int = NUM_SHARDS) -> int:
+    # 목록 순서가 바뀌어도 같은 지역은 같은 샤드에 속하도록 이름의 해시로 결정
+    return zlib.crc32(area_name.encode("utf-8")) % num_shards
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class ShardLeaseManager:
+    """
+    DB 기반 샤드 임대 관리자.
+    - 각 워커는 주기적으로 생존 신호를 남기고, 살아있는 워커 수로 나눈 만큼의 샤드를 임대합니다.
+    - 자신의 임대는 만료 전에 갱신하고, 워커가 늘어나면 몫보다 많은 샤드를 반납합니다.
+    - 갱신이 끊긴 워커의 샤드는 만료 후 다른 워커가 가져갑니다.
+    """
+
+    def __init__(self, worker_id: str = None, num_shards: int = NUM_SHARDS, lease_ttl: float = LEASE_TTL, session_factory=AsyncSessionLocal):
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.num_shards = num_shards
+        self.lease_ttl = lease_ttl
+        self.session_factory = session_factory
+        self.owned_shards: Set[int] = set()
+        self._valid_until = 0.0  # 마지막 갱신 성공 기준 임대 유효 시각 (time.monotonic 기준)
+
+    def owns(self, area_name: str) -> bool:
+        # 갱신에 실패한 채 임대 시간이 지나면 더 이상 담당하지 않는 것으로 간주
+        if time.monotonic() >= self._valid_until:
+            return False
+        return shard_of(area_name, self.num_shards) in self.owned_shards
+
+    @property
+    def is_leader(self) -> bool:
+        """샤드 0을 담당하는 워커가 전체 작업(보관/아카이브 등)을 한 곳에서만 실행하도록 할 때 사용"""
+        return time.monotonic() < self._valid_until and 0 in self.owned_shards
+
+    async def sync(self):
+        """생존 신호 기록, 임대 갱신, 재분배(반납/인수)를 하나의 트랜잭션으로 수행합니다."""
+        started = time.monotonic()
+        now = _utcnow()
+        expires_at = now + timedelta(seconds=self.lease_ttl)
+        live_since = now - timedelta(seconds=self.lease_ttl)
+
+        async with self.session_factory() as db:
+            async with db.begin():
+                # 1. 생존 신호
+                result = await db.execute(
+                    update(IngestionWorker)
+                    .where(IngestionWorker.worker_id == self.worker_id)
+                    .values(heartbeat_at=now)
+                )
+                if result.rowcount == 0:
+                    db.add(IngestionWorker(worker_id=self.worker_id, hostname=socket.gethostname(), heartbeat_at=now))
+                    await db.flush()
+
+                # 2. 샤드 행이 없으면 생성
+                dialect_name = db.get_bind().dialect.name
+                await db.execute(
+                    build_insert_ignore(IngestionLease.__table__, dialect_name)
+                    .values([{"shard_id": shard_id} for shard_id in range(self.num_shards)])
+                )
+
+                # 3. 워커당 담당할 샤드 수
+                live_workers = await db.scalar(
+                    select(func.count()).select_from(IngestionWorker).where(IngestionWorker.heartbeat_at > live_since)
+                )
+                target = math.ceil(self.num_shards / max(1, live_workers))
+
+                # 4. 내 임대 갱신
+                await db.execute(
+                    update(IngestionLease)
+                    .where(IngestionLease.owner_id == self.worker_id)
+                    .values(expires_at=expires_at)
+                )
+                owned = set((await db.scalars(
+                    select(IngestionLease.shard_id).where(IngestionLease.owner_id == self.worker_id)
+                )).all())
+
+                if len(owned) > target:
+                    # 5. 몫보다 많으면 반납 (새로 들어온 워커가 가져갈 수 있도록)
+                    extras = sorted(owned)[target:]
+                    await db.execute(
+                        update(IngestionLease)
+                        .where(IngestionLease.shard_id.in_(extras), IngestionLease.owner_id == self.worker_id)
+                        .values(owner_id=None, expires_at=None)
+                    )
+                    owned -= set(extras)
+                elif len(owned) < target:
+                    # 6. 비어 있거나 만료된 샤드를 조건부 UPDATE로 인수 (다른 워커와 경합해도 한 워커만 성공)
+                    free_condition = or_(IngestionLease.owner_id.is_(None), IngestionLease.expires_at < now)
+                    candidates = list((await db.scalars(select(IngestionLease.shard_id).where(free_condition))).all())
+                    random.shuffle(candidates)
+                    for shard_id in candidates[:target - len(owned)]:
+                        result = await db.execute(
+                            update(IngestionLease)
+                            .where(IngestionLease.shard_id == shard_id, free_condition)
+                            .values(owner_id=self.worker_id, expires_at=expires_at)
+                        )
+                        if result.rowcount == 1:
+                            owned.add(shard_id)
+
+                # 7. 오래전에 죽은 워커 기록 정리
+                await db.execute(
+                    delete(IngestionWorker)
+                    .where(IngestionWorker.heartbeat_at < now - timedelta(seconds=DEAD_WORKER_CLEANUP))
+                )
+
+        if owned != self.owned_shards:
+            print(f"[{self.worker_id}] 담당 샤드 변경: {sorted(self.owned_shards)} -> {sorted(owned)} (살아있는 워커 {live_workers}개)")
+        self.owned_shards = owned
+        self._valid_until = started + self.lease_ttl
+
+    async def release(self):
+        """종료 시 임대와 생존 신호를 지워 다른 워커가 즉시 인수할 수 있게 합니다."""
+        async with self.session_factory() as db:
+            async with db.begin():
+                await db.execute(
+                    update(IngestionLease)
+                    .where(IngestionLease.owner_id == self.worker_id)
+                    .values(owner_id=None, expires_at=None)
+                )
+                await db.execute(delete(IngestionWorker).where(IngestionWorker.worker_id == self.worker_id))
+        self.owned_shards = set()
+        self._valid_until = 0.0
+
+    async def run(self):
+        try:
+            while True:
+                try:
+                    await self.sync()
+                except Exception as e:
+                    print(f"[{self.worker_id}] 샤드 임대 갱신 중 오류 발생: {e}")
+                await asyncio.sleep(LEASE_RENEW_INTERVAL)
+        finally:
+            try:
+                await asyncio.shield(self.release())
+            except Exception as e:
+                print(f"[{self.worker_id}] 샤드 임대 반납 중 오류 발생: {e}")
@@ -0,0 +1,43 @@
+import base64
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, Response
+
+from src.model.population import PopulationStation
+
+# 다음 페이지 커서를 전달하는 응답 헤더 (응답 본문은 기존처럼 목록 그대로 유지)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(value: datetime) -> str:
+    return base64.urlsafe_b64encode(value.isoformat().encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> datetime:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return datetime.fromisoformat(base64.urlsafe_b64decode(padded).decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다.")
+
+
+def paginate_latest_first(query, limit: int, cursor: Optional[str] = None, offset: int = 0):
+    """
+    region_id로 좁힌 PopulationStation 쿼리를 최신순으로 페이징합니다.
+    cursor가 있으면 마지막으로 받은 datetime보다 과거 데이터부터 읽고(인덱스 범위 탐색), offset은 무시합니다.
+    offset은 기존 클라이언트 호환용으로만 남겨둡니다. (깊은 페이지일수록 느려짐)
+    """
+    query = query.order_by(PopulationStation.datetime.desc()).limit(limit)
+    if cursor:
+        return query.where(PopulationStation.datetime < decode_cursor(cursor))
+    return query.offset(offset) if offset else query
+
+
+def set_next_cursor(response: Response, records: Sequence, limit: int):
+    # 한 페이지를 가득 채웠을 때만 다음 페이지가 있을 수 있음
+    if records and len(records) == limit:
+        last = records[-1]  # ORM 객체 또는 컬럼 조회 결과(RowMapping)
+        last_datetime = last["datetime"] if isinstance(last, Mapping) else last.datetime
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last_datetime)
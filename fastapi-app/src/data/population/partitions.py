@@ -0,0 +1,104 @@
+"""
+population 테이블 월별 파티션 관리 (MySQL 전용).
+
+마이그레이션 0006이 population 테이블을 RANGE COLUMNS(datetime)로 월별 분할하고, 마지막에 pmax(MAXVALUE) 파티션을 둡니다.
+여기서는 앞으로 쓸 달의 파티션을 미리 만들어 새 데이터가 pmax에 쌓이지 않도록 합니다.
+(비어 있는 pmax를 나누는 REORGANIZE PARTITION은 데이터를 옮기지 않으므로 빠름)
+보관 작업(archive.py)이 아카이브로 옮긴 달의 파티션은 DROP PARTITION으로 정리합니다.
+SQLite / PostgreSQL에서는 아무 일도 하지 않습니다.
+"""
+import asyncio
+import os
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.data.database import AsyncSessionLocal
+from src.data.population.time_range import kst_now
+
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))  # 미리 만들어 둘 다음 달 파티션 수
+PARTITION_CHECK_INTERVAL = float(os.getenv("PARTITION_CHECK_INTERVAL", "86400"))  # 확인 주기(초)
+PARTITIONED_TABLE = "population"
+MAXVALUE_PARTITION = "pmax"
+
+
+def month_start(value: date, months: int = 0) -> date:
+    """value가 속한 달에서 months만큼 이동한 달의 1일."""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+
+def partition_clause(month: date) -> str:
+    """month 한 달을 담는 파티션 정의. (다음 달 1일 미만)"""
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN ('{month_start(month, 1):%Y-%m-%d} 00:00:00')"
+
+
+async def existing_partitions(db: AsyncSession, table: str = PARTITIONED_TABLE) -> List[str]:
+    """테이블의 파티션 이름 목록 (분할되지 않은 테이블이면 빈 목록)"""
+    result = await db.execute(
+        text(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL "
+            "ORDER BY PARTITION_ORDINAL_POSITION"
+        ),
+        {"table": table},
+    )
+    return [row[0] for row in result]
+
+
+async def ensure_month_partitions(db: AsyncSession, today: Optional[date] = None, months_ahead: int = PARTITION_MONTHS_AHEAD) -> List[str]:
+    """이번 달부터 months_ahead달 뒤까지의 파티션이 없으면 pmax를 나누어 만듭니다. 만든 파티션 이름 목록을 반환합니다."""
+    if db.get_bind().dialect.name != "mysql":
+        return []
+    names = await existing_partitions(db)
+    if MAXVALUE_PARTITION not in names:
+        return []  # 분할되지 않은 테이블 (마이그레이션 전)
+
+    today = today or kst_now().date()  # 파티션 경계는 저장 형식과 같은 KST 기준
+    months = [month_start(today, k) for k in range(months_ahead + 1)]
+    missing = [month for month in months if partition_name(month) not in names]
+    # 이미 있는 가장 늦은 달보다 이전 달은 pmax를 나누어 만들 수 없음 (범위가 겹침)
+    latest = max((name for name in names if name != MAXVALUE_PARTITION), default=None)
+    missing = [month for month in missing if latest is None or partition_name(month) > latest]
+    if not missing:
+        return []
+
+    clauses = ", ".join([*map(partition_clause, missing), f"PARTITION {MAXVALUE_PARTITION} VALUES LESS THAN (MAXVALUE)"])
+    await db.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} REORGANIZE PARTITION {MAXVALUE_PARTITION} INTO ({clauses})"))
+    created = [partition_name(month) for month in missing]
+    print(f"population 파티션 추가: {', '.join(created)}")
+    return created
+
+
+async def drop_partitions_before(db: AsyncSession, before: date) -> List[str]:
+    """
+    before 이전에 끝나는 월 파티션을 삭제합니다. (보관 작업이 행을 아카이브로 옮긴 뒤 빈 파티션 정리)
+    예: before=2025-03-15이면 p202502 이하를 삭제. 삭제한 파티션 이름 목록을 반환합니다.
+    """
+    if db.get_bind().dialect.name != "mysql":
+        return []
+    limit = partition_name(month_start(before, -1))
+    names = [name for name in await existing_partitions(db) if name != MAXVALUE_PARTITION and name <= limit]
+    if not names:
+        return []
+    await db.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} DROP PARTITION {', '.join(names)}"))
+    print(f"population 파티션 삭제: {', '.join(names)}")
+    return names
+
+
+async def run_partition_maintenance(interval: float = PARTITION_CHECK_INTERVAL, session_factory=AsyncSessionLocal):
+    """수집 작업과 함께 실행. 시작 시 한 번, 이후 interval마다 다음 달 파티션을 확인합니다."""
+    while True:
+        try:
+            async with session_factory() as db:
+                await ensure_month_partitions(db)
+        except Exception as e:
+            # 여러 워커가 동시에 추가하면 한쪽은 실패하지만 다음 확인 때 이미 만들어져 있음
+            print(f"파티션 확인 중 오류 발생: {e}")
+        await asyncio.sleep(interval)
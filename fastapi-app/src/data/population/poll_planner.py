@@ -0,0 +1,98 @@
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+# 지역별 갱신 주기 추정 설정 (단위: 초)
+DEFAULT_CADENCE = float(os.getenv("INGESTION_DEFAULT_CADENCE", "300"))  # 관측 전 기본 갱신 주기 (5분)
+MIN_CADENCE = 60
+MAX_CADENCE = 3600
+CADENCE_SMOOTHING = 0.3  # 새로 관측한 갱신 간격의 반영 비율 (지수 이동 평균)
+EARLY_POLL_RATIO = 0.1  # 예상 갱신 시각보다 주기의 10% 먼저 요청하여 지연을 줄임
+STALE_RETRY = float(os.getenv("INGESTION_STALE_RETRY", "30"))  # 갱신되지 않은 응답 이후 첫 재요청 간격
+MAX_BACKOFF = float(os.getenv("INGESTION_MAX_BACKOFF", "1800"))  # 요청 실패 후 재요청 간격 상한 (30분)
+FAILURE_RETRY = 60  # 요청 실패 후 재요청 간격
+
+# PPLTN_TIME은 한국 표준시(KST) 기준이므로 서버 시간대와 무관하게 KST로 비교
+KST = timezone(timedelta(hours=9))
+
+
+@dataclass
+class RegionPollState:
+    last_update_time: Optional[datetime] = None  # 마지막으로 본 PPLTN_TIME
+    cadence: float = DEFAULT_CADENCE  # 관측된 PPLTN_TIME 갱신 주기
+    stale_count: int = 0  # 연속으로 갱신되지 않은 응답 수
+    failure_count: int = 0  # 연속 요청 실패 수
+    next_poll_at: float = 0.0  # 다음 요청 시각 (time.monotonic 기준)
+
+
+class PollPlanner:
+    """
+    지역별 다음 요청 시각을 관리합니다.
+    PPLTN_TIME이 바뀐 간격으로 지역별 갱신 주기를 추정하고, 새 데이터가 나올 즈음에만 요청합니다.
+    갱신되지 않은 응답이 이어지면 재요청 간격을 지수적으로 늘리되, 관측된 갱신 주기보다 길게 두지 않습니다.
+    (피드가 복구된 뒤에도 한 주기 안에는 다시 요청)
+    """
+
+    def __init__(self, area_names: List[str]):
+        self.states: Dict[str, RegionPollState] = {area_name: RegionPollState() for area_name in area_names}
+
+    def due(self, now: float, accept: Optional[Callable[[str], bool]] = None) -> List[str]:
+        # accept: 이 프로세스가 담당하는 지역인지 판단하는 함수 (샤드 임대 사용 시)
+        return [
+            area_name for area_name, state in self.states.items()
+            if state.next_poll_at <= now and (accept is None or accept(area_name))
+        ]
+
+    def seconds_until_next(self, now: float, accept: Optional[Callable[[str], bool]] = None) -> float:
+        next_polls = [
+            state.next_poll_at for area_name, state in self.states.items()
+            if accept is None or accept(area_name)
+        ]
+        if not next_polls:
+            return DEFAULT_CADENCE
+        return max(0.0, min(next_polls) - now)
+
+    def is_new(self, area_name: str, update_time: Optional[datetime]) -> bool:
+        last_update_time = self.states[area_name].last_update_time
+        return update_time is not None and (last_update_time is None or update_time > last_update_time)
+
+    def observe(self, area_name: str, update_time: Optional[datetime], now: float, wall_now: Optional[datetime] = None) -> bool:
+        """
+        응답의 PPLTN_TIME을 기록하고 다음 요청 시각을 정합니다.
+        새 데이터이면 True, 이전과 같은(갱신되지 않은) 데이터이면 False를 반환합니다.
+        now: time.monotonic() 값, wall_now: now와 같은 순간의 KST 시각 (tz 없음, 생략 시 현재 시각)
+        """
+        state = self.states[area_name]
+        state.failure_count = 0
+
+        if self.is_new(area_name, update_time):
+            if state.last_update_time is not None:
+                interval = (update_time - state.last_update_time).total_seconds()
+                cadence = CADENCE_SMOOTHING * interval + (1 - CADENCE_SMOOTHING) * state.cadence
+                state.cadence = min(MAX_CADENCE, max(MIN_CADENCE, cadence))
+            state.last_update_time = update_time
+            state.stale_count = 0
+            state.next_poll_at = now + self._seconds_until_expected(update_time, state.cadence, wall_now)
+            return True
+
+        state.stale_count += 1
+        state.next_poll_at = now + min(state.cadence, MAX_BACKOFF, STALE_RETRY * 2 ** (state.stale_count - 1))
+        return False
+
+    def observe_failure(self, area_name: str, now: float):
+        state = self.states[area_name]
+        state.failure_count += 1
+        state.next_poll_at = now + min(MAX_BACKOFF, FAILURE_RETRY * 2 ** (state.failure_count - 1))
+
+    @staticmethod
+    def _seconds_until_expected(update_time: datetime, cadence: float, wall_now: Optional[datetime]) -> float:
+        """
+        다음 PPLTN_TIME(마지막 PPLTN_TIME + 갱신 주기)보다 주기의 EARLY_POLL_RATIO만큼 먼저 요청하기까지 남은 시간.
+        요청 시각이 아니라 데이터 시각을 기준으로 하므로, 늦게 받은 응답 때문에 다음 요청이 점점 밀리지 않습니다.
+        예상 시각이 이미 지났으면 STALE_RETRY 뒤에, 서버 시계 차이로 너무 멀면 한 주기 뒤에 요청합니다.
+        """
+        wall_now = wall_now or datetime.now(KST).replace(tzinfo=None)
+        expected = update_time + timedelta(seconds=cadence)
+        seconds = (expected - wall_now).total_seconds() - cadence * EARLY_POLL_RATIO
+        return min(cadence, max(min(STALE_RETRY, cadence), seconds))
@@ -1,87 +1,190 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.model.population import PopulationStation
+from src.model.population import PopulationStation, join_congestion_message, population_columns
 from src.data.database import get_db
-from src.schema.population.population_schema import AgeGroupPopulationResponse, GenderPopulationResponse, PopulationRequest, PopulationResponse
+from src.data.population.archive import merge_archived_series
+from src.data.population.derived_counts import DERIVED_COUNTS
+from src.data.population.export import EXPORT_FORMATS, EXPORT_MAX_DAYS, export_population
+from src.data.population.http_cache import region_validators, snapshots_validators, window_version
+from src.data.population.pagination import paginate_latest_first, set_next_cursor
+from src.data.population.profiles import population_profiles
+from src.data.population.pubsub import STREAM_KEEPALIVE, format_sse, snapshot_broker
+from src.data.population.rollup import SERIES_NAMES, SERIES_RESOLUTION_HEADER, choose_resolution, series_query
+from src.data.population.response_format import columnar_media_type, orjson_response, population_response
+from src.data.population.snapshot_cache import SNAPSHOT_FIELDS, PopulationSnapshot, latest_records_query, latest_snapshots
+from src.data.population.time_range import build_time_ranges, datetime_in_ranges, kst_now, to_kst_naive
+from src.schema.population.population_schema import AgeGroupPopulationResponse, GenderPopulationResponse, PopulationBreakdownResponse, PopulationRequest, PopulationResponse
 from sqlalchemy import func
 from sqlalchemy.future import select
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import datetime, timedelta
 
 
-router = APIRouter(prefix = "/populations")
+# 응답은 엔드포인트에서 orjson으로 직접 직렬화 (response_model은 문서용)
+router = APIRouter(prefix = "/populations", default_response_class=ORJSONResponse)
+
+# 기본 인구 데이터 컬럼 (PopulationResponse와 같은 필드)
+POPULATION_COLUMNS = population_columns(SNAPSHOT_FIELDS)  # 조회 시 join_congestion_message() 필요
+
+# 조회 API가 읽는 파생 인구 수 컬럼 (수집 시 derived_counts.add_derived_counts로 계산하여 저장)
+GENERATIONS = ("gen_10", "gen_20", "gen_30", "gen_40", "gen_50", "gen_60", "gen_70")
+GENDER_COLUMNS = (
+    PopulationStation.datetime,
+    PopulationStation.region_id,
+    PopulationStation.male_min_population,
+    PopulationStation.male_max_population,
+    PopulationStation.female_min_population,
+    PopulationStation.female_max_population,
+)
+AGE_MIN_COLUMNS = (
+    PopulationStation.datetime,
+    PopulationStation.region_id,
+    *[getattr(PopulationStation, f"{gen}_min").label(gen) for gen in GENERATIONS],
+)
+AGE_MAX_COLUMNS = (
+    PopulationStation.datetime,
+    PopulationStation.region_id,
+    *[getattr(PopulationStation, f"{gen}_max").label(gen) for gen in GENERATIONS],
+)
+# 성별 + 연령대별 최소/최대 인구 수 전체
+BREAKDOWN_COLUMNS = (
+    PopulationStation.datetime,
+    *[getattr(PopulationStation, column) for column in DERIVED_COUNTS],
+)
+
+# 응답 컬럼 이름 (조회 결과 튜플과 같은 순서)
+GENDER_NAMES = tuple(column.key for column in GENDER_COLUMNS)
+AGE_MIN_NAMES = tuple(column.key for column in AGE_MIN_COLUMNS)
+AGE_MAX_NAMES = tuple(column.key for column in AGE_MAX_COLUMNS)
+BREAKDOWN_NAMES = tuple(column.key for column in BREAKDOWN_COLUMNS)
+
+
+def parse_region_ids(region_ids: Optional[List[str]]) -> Optional[List[str]]:
+    # 반복 파라미터와 쉼표 구분을 모두 허용 (?region_ids=A&region_ids=B 또는 ?region_ids=A,B)
+    if region_ids is None:
+        return None
+    return sorted({region_id.strip() for value in region_ids for region_id in value.split(",") if region_id.strip()})
+
+# 여러 지역의 최신 데이터 한 번에 조회 (지도/대시보드용)
+@router.get("/latest", response_model=list[PopulationResponse])
+async def get_latest_populations(
+    request: Request,
+    region_ids: Optional[List[str]] = Query(None),  # ?region_ids=POI001&region_ids=POI002 또는 ?region_ids=POI001,POI002
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    지정한 region_id들(생략 시 전체 지역)의 가장 최근 데이터를 한 번의 응답으로 반환합니다.
+    최신 데이터 캐시에 모두 있으면 캐시에서, 아니면 지역별 최신 행을 한 번의 쿼리로 조회합니다.
+    Accept 헤더로 컬럼 형식(JSON 병렬 배열, Arrow IPC)을 요청할 수 있습니다.
+    """
+    media_type = columnar_media_type(request)
+    region_ids = parse_region_ids(region_ids)
+
+    records = None
+    if region_ids is None:
+        if latest_snapshots.warmed:
+            records = sorted(latest_snapshots.all(), key=lambda snapshot: snapshot.region_id)
+    else:
+        snapshots = latest_snapshots.get_many(region_ids)
+        if len(snapshots) == len(region_ids):
+            records = [snapshots[region_id] for region_id in region_ids]
+
+    if records is None:
+        try:
+            query = latest_records_query(region_ids).order_by(PopulationStation.region_id)
+            result = await db.execute(query)
+            records = result.scalars().all()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"오류 발생: {str(e)}")
+        latest_snapshots.update_records(records)
+        records = [PopulationSnapshot.from_record(record) for record in records]
+
+    # 요청한 지역들의 최신 시각이 그대로면 304 (조건부 요청)
+    validators = snapshots_validators(request, records)
+    if validators and validators.is_not_modified(request):
+        return validators.not_modified()
+
+    if media_type:
+        rows = [tuple(getattr(record, name) for name in SNAPSHOT_FIELDS) for record in records]
+        response = population_response(media_type, SNAPSHOT_FIELDS, rows)
+    else:
+        # 스냅샷(dataclass)을 orjson으로 바로 직렬화
+        response = orjson_response(records)
+    return validators.apply(response) if validators else response
 
 # 페이징 처리(최근 200분 동안의 5분 간격 데이터)
+# 다음 페이지는 응답 헤더 X-Next-Cursor 값을 cursor로 전달하여 조회 (offset은 하위 호환용, deprecated)
 @router.get("/region/{region_id}", response_model=list[PopulationResponse])
 async def get_population_by_region(
     region_id: str,
+    request: Request,
     limit: int = 40,  # 한 번에 가져올 데이터 수
-    offset: int = 0,   # 시작 위치
+    cursor: Optional[str] = None,  # 이전 응답의 X-Next-Cursor 값
+    offset: int = Query(0, deprecated=True),   # 시작 위치
     db: AsyncSession = Depends(get_db)
 ):
     """
     특정 region_id의 데이터를 페이징하여 반환
     """
+    media_type = columnar_media_type(request)
+    # 지역의 최신 데이터 시각이 그대로면 쿼리 없이 304 (ETag / Last-Modified)
+    validators = await region_validators(request, db, region_id)
+    if validators and validators.is_not_modified(request):
+        return validators.not_modified()
+    query = paginate_latest_first(
+        join_congestion_message(select(*POPULATION_COLUMNS)).where(PopulationStation.region_id == region_id),  # 최신 데이터 우선 정렬
+        limit, cursor, offset,
+    )
     try:
-        query = (
-            select(PopulationStation)
-            .where(PopulationStation.region_id == region_id)
-            .order_by(PopulationStation.datetime.desc())  # 최신 데이터 우선 정렬
-            .limit(limit)
-            .offset(offset)
-        )
         result = await db.execute(query)
-        records = result.scalars().all()
-        
-        if not records:
-            raise HTTPException(status_code=404, detail="해당 region_id의 데이터를 찾을 수 없습니다.")
-        return records
+        records = result.all()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"오류 발생: {str(e)}") 
 
+    if not records:
+        raise HTTPException(status_code=404, detail="해당 region_id의 데이터를 찾을 수 없습니다.")
+    response = population_response(media_type, SNAPSHOT_FIELDS, records)
+    set_next_cursor(response, records, limit)
+    return validators.apply(response) if validators else response
+
 # 성별 인구 데이터 조회
 @router.get("/gender_population_data", response_model=List[GenderPopulationResponse])
 async def get_gender_population_data(
     region_id: str,
-    start_time: Optional[str] = None,
-    end_time: Optional[str] = None,
+    request: Request,
+    start: Optional[datetime] = None,  # 명시적 범위 시작 (예: 2025-04-01T09:00:00)
+    end: Optional[datetime] = None,  # 명시적 범위 끝
+    start_time: Optional[str] = None,  # 시각 범위 시작 (HH:MM:SS)
+    end_time: Optional[str] = None,  # 시각 범위 끝 (HH:MM:SS)
+    days: int = 1,  # 최근 N일의 같은 시간대를 함께 조회
     db: AsyncSession = Depends(get_db)
 ):
     """
     특정 region_id와 시간 범위의 성별 데이터를 반환합니다.
-    만약 start_time과 end_time이 전달되지 않으면, 기본적으로 현재 시각 기준 60분 전부터 현재 시각까지의 데이터를 조회합니다.
+    만약 범위가 전달되지 않으면, 기본적으로 현재 시각 기준 60분 전부터 현재 시각까지의 데이터를 조회합니다.
+    start_time/end_time은 오늘의 시각 범위이며, days를 주면 최근 N일의 같은 시간대를 조회합니다.
     """
+    media_type = columnar_media_type(request)
+    ranges = build_time_ranges(start, end, start_time, end_time, days)
+    # 지역의 최신 데이터 시각과 조회 범위가 그대로면 쿼리 없이 304 (ETag / Last-Modified)
+    validators = await region_validators(request, db, region_id, window_version(ranges))
+    if validators and validators.is_not_modified(request):
+        return validators.not_modified()
     try:
-        # 현재 시각 계산
-        now = datetime.now()
-        if start_time is None:
-            start_time = (now - timedelta(minutes=60)).strftime("%H:%M:%S")
-        if end_time is None:
-            end_time = now.strftime("%H:%M:%S")
-        
-        # 쿼리: 특정 region_id와 지정된 시간 범위 내의 데이터를 가져옴
-        query = select(PopulationStation).filter(
-            PopulationStation.region_id == region_id,
-            func.time(PopulationStation.datetime).between(start_time, end_time)
+        # 쿼리: datetime 컬럼을 함수로 감싸지 않는 범위 조건 (region_id, datetime 인덱스 사용)
+        query = (
+            select(*GENDER_COLUMNS)
+            .where(PopulationStation.region_id == region_id, datetime_in_ranges(ranges))
+            .order_by(PopulationStation.datetime)
         )
         result = await db.execute(query)
-        records = result.scalars().all()
-
-        # 응답 데이터 구성
-        response_data = [
-            {
-                "datetime": rec.datetime.isoformat() if rec.datetime else None,
-                "region_id": rec.region_id,
-                "male_min_population": rec.male_rate * rec.min_population / 100 if rec.min_population and rec.male_rate is not None else None,
-                "male_max_population": rec.male_rate * rec.max_population / 100 if rec.max_population and rec.male_rate is not None else None,
-                "female_min_population": rec.female_rate * rec.min_population / 100 if rec.min_population and rec.female_rate is not None else None,
-                "female_max_population": rec.female_rate * rec.max_population / 100 if rec.max_population and rec.female_rate is not None else None,
-            }
-            for rec in records
-        ]
-        return response_data
+        # 수집 시 계산해 둔 인구 수 컬럼을 그대로 반환
+        response = population_response(media_type, GENDER_NAMES, result.all())
+        return validators.apply(response) if validators else response
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"오류 발생: {str(e)}")
@@ -90,74 +193,226 @@ async def get_gender_population_data(
 @router.get("/age_min_population_data", response_model=List[AgeGroupPopulationResponse])
 async def get_age_group_min_population_data(
     region_id: str,
+    request: Request,
     limit: int = 40,  # 한 번에 가져올 데이터 수
-    offset: int = 0,   # 시작 위치
+    cursor: Optional[str] = None,  # 이전 응답의 X-Next-Cursor 값
+    offset: int = Query(0, deprecated=True),   # 시작 위치
     db: AsyncSession = Depends(get_db)
 ):
     """
     특정 region_id의 연령대별 최대 인구 데이터를 반환
     """
-    query = (
-        select(PopulationStation)
-        .where(PopulationStation.region_id == region_id)
-        .order_by(PopulationStation.datetime.desc())  # 최신 데이터 우선 정렬
-        .limit(limit)
-        .offset(offset)
+    media_type = columnar_media_type(request)
+    # 지역의 최신 데이터 시각이 그대로면 쿼리 없이 304 (ETag / Last-Modified)
+    validators = await region_validators(request, db, region_id)
+    if validators and validators.is_not_modified(request):
+        return validators.not_modified()
+    query = paginate_latest_first(
+        select(*AGE_MIN_COLUMNS).where(PopulationStation.region_id == region_id),  # 최신 데이터 우선 정렬
+        limit, cursor, offset,
     )
     result = await db.execute(query)
-    records = result.scalars().all()
-    # 응답 데이터 구성
-    response_data = [
-        {
-            "datetime": rec.datetime.isoformat() if rec.datetime else None,
-            "region_id": rec.region_id,
-            "gen_10": rec.gen_10 * rec.min_population / 100 if rec.min_population and rec.gen_10 is not None else None,
-            "gen_20": rec.gen_20 * rec.min_population / 100 if rec.min_population and rec.gen_20 is not None else None,
-            "gen_30": rec.gen_30 * rec.min_population / 100 if rec.min_population and rec.gen_30 is not None else None,
-            "gen_40": rec.gen_40 * rec.min_population / 100 if rec.min_population and rec.gen_40 is not None else None,
-            "gen_50": rec.gen_50 * rec.min_population / 100 if rec.min_population and rec.gen_50 is not None else None,
-            "gen_60": rec.gen_60 * rec.min_population / 100 if rec.min_population and rec.gen_60 is not None else None,
-            "gen_70": rec.gen_70 * rec.min_population / 100 if rec.min_population and rec.gen_70 is not None else None,
-        }
-        for rec in records
-    ]
-
-    return response_data
+    records = result.all()
+    # 수집 시 계산해 둔 인구 수 컬럼을 그대로 반환
+    response = population_response(media_type, AGE_MIN_NAMES, records)
+    set_next_cursor(response, records, limit)
+    return validators.apply(response) if validators else response
 
 # 성별 인구 데이터 조회 (최대 인구 수)
 @router.get("/age_max_population_data", response_model=List[AgeGroupPopulationResponse])
 async def get_age_group_max_population_data(
     region_id: str,
+    request: Request,
     limit: int = 40,  # 한 번에 가져올 데이터 수
-    offset: int = 0,   # 시작 위치
+    cursor: Optional[str] = None,  # 이전 응답의 X-Next-Cursor 값
+    offset: int = Query(0, deprecated=True),   # 시작 위치
     db: AsyncSession = Depends(get_db)
 ):
     """
     특정 region_id의 연령대별 최대 인구 데이터를 반환
     """
-    query = (
-        select(PopulationStation)
-        .where(PopulationStation.region_id == region_id)
-        .order_by(PopulationStation.datetime.desc())  # 최신 데이터 우선 정렬
-        .limit(limit)
-        .offset(offset)
+    media_type = columnar_media_type(request)
+    # 지역의 최신 데이터 시각이 그대로면 쿼리 없이 304 (ETag / Last-Modified)
+    validators = await region_validators(request, db, region_id)
+    if validators and validators.is_not_modified(request):
+        return validators.not_modified()
+    query = paginate_latest_first(
+        select(*AGE_MAX_COLUMNS).where(PopulationStation.region_id == region_id),  # 최신 데이터 우선 정렬
+        limit, cursor, offset,
+    )
+    result = await db.execute(query)
+    records = result.all()
+    # 수집 시 계산해 둔 인구 수 컬럼을 그대로 반환
+    response = population_response(media_type, AGE_MAX_NAMES, records)
+    set_next_cursor(response, records, limit)
+    return validators.apply(response) if validators else response
+
+
+# 성별 + 연령대별 최소/최대 인구 데이터 통합 조회 (차트 한 번 그리는 데 요청/쿼리 1회)
+@router.get("/breakdown", response_model=PopulationBreakdownResponse)
+async def get_population_breakdown(
+    region_id: str,
+    request: Request,
+    limit: int = 40,  # 한 번에 가져올 데이터 수
+    cursor: Optional[str] = None,  # 이전 응답의 X-Next-Cursor 값
+    layout: Literal["rows", "columnar"] = "rows",  # rows: 객체 목록, columnar: 컬럼별 배열
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    특정 region_id의 성별/연령대별 최소·최대 인구 수를 한 번의 쿼리로 반환합니다.
+    (age_min_population_data, age_max_population_data, gender_population_data를 한 번에 대체)
+    layout=columnar이면 {"datetime": [...], "male_min_population": [...], ...} 형태의 병렬 배열로 반환합니다.
+    """
+    media_type = columnar_media_type(request)
+    # 지역의 최신 데이터 시각이 그대로면 쿼리 없이 304 (ETag / Last-Modified)
+    validators = await region_validators(request, db, region_id)
+    if validators and validators.is_not_modified(request):
+        return validators.not_modified()
+    query = paginate_latest_first(
+        select(*BREAKDOWN_COLUMNS).where(PopulationStation.region_id == region_id),  # 최신 데이터 우선 정렬
+        limit, cursor,
     )
     result = await db.execute(query)
-    records = result.scalars().all()
-    # 응답 데이터 구성
-    response_data = [
-        {
-            "datetime": rec.datetime.isoformat() if rec.datetime else None,
-            "region_id": rec.region_id,
-            "gen_10": rec.gen_10 * rec.max_population / 100 if rec.max_population and rec.gen_10 is not None else None,
-            "gen_20": rec.gen_20 * rec.max_population / 100 if rec.max_population and rec.gen_20 is not None else None,
-            "gen_30": rec.gen_30 * rec.max_population / 100 if rec.max_population and rec.gen_30 is not None else None,
-            "gen_40": rec.gen_40 * rec.max_population / 100 if rec.max_population and rec.gen_40 is not None else None,
-            "gen_50": rec.gen_50 * rec.max_population / 100 if rec.max_population and rec.gen_50 is not None else None,
-            "gen_60": rec.gen_60 * rec.max_population / 100 if rec.max_population and rec.gen_60 is not None else None,
-            "gen_70": rec.gen_70 * rec.max_population / 100 if rec.max_population and rec.gen_70 is not None else None,
-        }
-        for rec in records
-    ]
-
-    return response_data
\ No newline at end of file
+    records = result.all()
+
+    if not records:
+        raise HTTPException(status_code=404, detail="해당 region_id의 데이터를 찾을 수 없습니다.")
+    if media_type:
+        response = population_response(media_type, BREAKDOWN_NAMES, records)
+    elif layout == "columnar":
+        columns = dict(zip(BREAKDOWN_NAMES, map(list, zip(*records))))
+        response = orjson_response({"region_id": region_id, "layout": layout, "columns": columns})
+    else:
+        rows = [dict(zip(BREAKDOWN_NAMES, record)) for record in records]
+        response = orjson_response({"region_id": region_id, "layout": layout, "rows": rows})
+    set_next_cursor(response, records, limit)
+    return validators.apply(response) if validators else response
+
+
+# 기간별 시계열 조회 (범위 길이에 따라 원본 / 시간 단위 / 일 단위 자동 선택)
+@router.get("/series")
+async def get_population_series(
+    region_id: str,
+    request: Request,
+    start: Optional[datetime] = None,  # 범위 시작 (생략 시 end 기준 1일 전)
+    end: Optional[datetime] = None,  # 범위 끝 (생략 시 현재 시각)
+    resolution: Literal["auto", "raw", "hourly", "daily"] = "auto",
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    특정 region_id의 기간별 시계열을 반환합니다.
+    resolution=auto이면 범위가 2일 이하일 때 원본 5분 데이터, 14일 이하일 때 시간 단위, 그보다 길면 일 단위 집계를 읽습니다.
+    보관 기간(RETENTION_DAYS)이 지난 원본 데이터는 Parquet 아카이브에서 읽습니다.
+    (주간 약 168행, 월간 약 30행) 선택한 해상도는 응답 헤더 X-Series-Resolution으로 알려줍니다.
+    해상도와 관계없이 값마다 {값}_min / _avg / _max 와 혼잡도 단계별 비율(congest_*_share) 컬럼을 반환합니다.
+    """
+    media_type = columnar_media_type(request)
+    # 시간대가 있는 값(예: +09:00)은 저장 형식과 같은 KST(tz 없음)로 바꿔 비교
+    end = to_kst_naive(end) or kst_now()  # 생략 시 현재 KST 시각 (서버 시간대와 무관)
+    start = to_kst_naive(start) or end - timedelta(days=1)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start가 end보다 늦습니다.")
+    resolution = choose_resolution(start, end, resolution)
+
+    # 지역의 최신 데이터 시각과 조회 범위가 그대로면 쿼리 없이 304 (ETag / Last-Modified)
+    validators = await region_validators(request, db, region_id, window_version([(start, end)]))
+    if validators and validators.is_not_modified(request):
+        return validators.not_modified()
+    result = await db.execute(series_query(region_id, start, end, resolution))
+    rows = result.all()
+    if resolution == "raw":
+        # 보관 기간이 지나 DB에서 삭제된 범위는 Parquet 아카이브에서 읽음 (집계 해상도는 DB에 그대로 있음)
+        rows = await merge_archived_series(region_id, start, end, rows)
+    response = population_response(media_type, SERIES_NAMES, rows)
+    response.headers[SERIES_RESOLUTION_HEADER] = resolution
+    return validators.apply(response) if validators else response
+
+# 요일 x 시간대별 평소 혼잡도 (언제 한산한지)
+@router.get("/profile/{region_id}")
+async def get_population_profile(
+    region_id: str,
+    request: Request,
+    weekday: Optional[int] = Query(None, ge=0, le=6),  # 0=월요일 ~ 6=일요일 (생략 시 전체 요일)
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    특정 region_id의 요일 x 시간대별 평균 최소/최대 인구와 혼잡도 단계별 비율을 반환합니다.
+    메모리의 프로필 배열에서 바로 읽으므로 이력 길이와 관계없이 DB 집계 쿼리를 실행하지 않습니다.
+    배열은 [요일][시간대] 순서이며, 데이터가 없는 칸은 null 입니다.
+    """
+    # 지역의 최신 데이터 시각이 그대로면 304 (프로필은 새 데이터가 들어올 때만 바뀜)
+    validators = await region_validators(request, db, region_id)
+    if validators and validators.is_not_modified(request):
+        return validators.not_modified()
+    profile = population_profiles.profile(region_id, weekday)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="해당 region_id의 프로필이 없습니다.")
+    response = orjson_response(profile)
+    return validators.apply(response) if validators else response
+
+# 새 인구 데이터 실시간 수신 (Server-Sent Events)
+@router.get("/stream")
+async def stream_populations(
+    region_ids: Optional[List[str]] = Query(None),  # 구독할 지역 (생략 시 전체 지역)
+):
+    """
+    구독한 지역에 새 데이터가 저장될 때마다 snapshot 이벤트를 보냅니다. (text/event-stream)
+    연결 직후에는 현재 최신 데이터를 먼저 보내고, 새 데이터가 없는 동안에는 주기적으로 keepalive 주석만 보냅니다.
+    """
+    region_ids = parse_region_ids(region_ids)
+    # 응답을 시작하기 전에 구독 (확인과 등록 사이에 다른 요청이 끼어들어 최대치를 넘지 않도록)
+    try:
+        subscription = snapshot_broker.subscribe(region_ids)
+    except OverflowError:
+        raise HTTPException(status_code=503, detail="실시간 구독자 수가 많습니다. 잠시 후 다시 시도해 주세요.")
+
+    async def events():
+        try:
+            if region_ids is None:
+                initial = latest_snapshots.all()
+            else:
+                initial = list(latest_snapshots.get_many(region_ids).values())
+            for snapshot in initial:
+                yield format_sse(snapshot)
+            while True:
+                snapshot = await subscription.get(STREAM_KEEPALIVE)
+                yield format_sse(snapshot) if snapshot is not None else b": keepalive\n\n"
+        finally:
+            snapshot_broker.unsubscribe(subscription)
+
+    headers = {
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # 프록시(nginx) 버퍼링 끄기
+        "Content-Encoding": "identity",  # GZipMiddleware가 이벤트를 모아 압축하지 않도록
+    }
+    # 본문을 시작하기 전에 연결이 끊겨 events()가 실행되지 않아도 구독을 해제 (unsubscribe는 두 번 불려도 안전)
+    background = BackgroundTask(snapshot_broker.unsubscribe, subscription)
+    return StreamingResponse(events(), media_type="text/event-stream", headers=headers, background=background)
+
+# 기간별 이력 내보내기 (CSV / NDJSON / Parquet 파일 다운로드)
+@router.get("/export")
+async def export_populations(
+    start: datetime,  # 범위 시작
+    end: Optional[datetime] = None,  # 범위 끝 (생략 시 현재 시각)
+    region_ids: Optional[List[str]] = Query(None),  # 내보낼 지역 (생략 시 전체 지역)
+    format: Literal["csv", "ndjson", "parquet"] = "csv",
+):
+    """
+    [start, end] 범위의 원본 데이터를 시간 순서로 내보냅니다. (컬럼은 /region/{region_id}와 같음)
+    서버 측 커서로 일정한 행 수씩 읽어 바로 내보내므로 1년치 전체 지역도 메모리 사용량이 일정합니다.
+    아카이브된 날짜는 Parquet 아카이브에서 읽습니다.
+    """
+    region_ids = parse_region_ids(region_ids)
+    # 시간대가 붙은 값은 저장 형식(KST, tz 없음)으로 바꿔 비교 (/series와 같음)
+    end = to_kst_naive(end) or kst_now()
+    start = to_kst_naive(start)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start가 end보다 늦습니다.")
+    if end - start > timedelta(days=EXPORT_MAX_DAYS):
+        raise HTTPException(status_code=400, detail=f"내보내기 범위는 최대 {EXPORT_MAX_DAYS}일입니다.")
+
+    media_type, extension = EXPORT_FORMATS[format]
+    headers = {"Content-Disposition": f'attachment; filename="population_{start:%Y%m%d}_{end:%Y%m%d}.{extension}"'}
+    if format == "parquet":
+        headers["Content-Encoding"] = "identity"  # 이미 zstd로 압축되어 있으므로 GZipMiddleware를 거치지 않음
+    return StreamingResponse(export_population(format, region_ids, start, end), media_type=media_type, headers=headers)
@@ -0,0 +1,97 @@
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from src.data.population.derived_counts import add_derived_counts
+from src.model.population import CongestionMessage, PopulationStation
+
+# 한 INSERT 문에 담을 최대 행 수 (드라이버의 바인드 파라미터 수 제한을 넘지 않도록 분할)
+INSERT_CHUNK_SIZE = 500
+
+
+def build_insert_ignore(table: Table, dialect_name: str):
+    """
+    중복 키가 있으면 해당 행을 건너뛰는 INSERT 문을 DB 종류에 맞게 생성합니다.
+    - MySQL(asyncmy/aiomysql): INSERT IGNORE
+    - SQLite(aiosqlite) / PostgreSQL: INSERT ... ON CONFLICT DO NOTHING
+    """
+    if dialect_name == "mysql":
+        return mysql.insert(table).prefix_with("IGNORE")
+    if dialect_name == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if dialect_name == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    raise ValueError(f"지원하지 않는 데이터베이스입니다: {dialect_name}")
+
+
+class CongestionMessageIds:
+    """
+    혼잡도 메시지 -> congestion_message.id 캐시. 메시지 종류가 몇 개뿐이므로 보통은 쿼리 없이 끝납니다.
+    다른 트랜잭션에서 커밋된 것으로 확인한 id만 기억합니다. (이번 트랜잭션에서 추가한 id는 롤백될 수 있음)
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+
+    async def resolve(self, db: AsyncSession, messages: Iterable[Optional[str]]) -> Dict[str, int]:
+        wanted = {message for message in messages if message}
+        ids = {message: self._ids[message] for message in wanted if message in self._ids}
+        missing = wanted - ids.keys()
+        if not missing:
+            return ids
+
+        found = await self._select(db, missing)
+        self._ids.update(found)
+        ids.update(found)
+        missing -= found.keys()
+        if missing:
+            # 처음 보는 메시지: 추가 후 id 조회 (동시에 다른 워커가 추가해도 중복 키는 건너뜀)
+            stmt = build_insert_ignore(CongestionMessage.__table__, db.get_bind().dialect.name)
+            await db.execute(stmt.values([{"message": message} for message in sorted(missing)]))
+            ids.update(await self._select(db, missing))
+        return ids
+
+    @staticmethod
+    async def _select(db: AsyncSession, messages) -> Dict[str, int]:
+        result = await db.execute(
+            select(CongestionMessage.message, CongestionMessage.id).where(CongestionMessage.message.in_(list(messages)))
+        )
+        return dict(result.all())
+
+
+congestion_message_ids = CongestionMessageIds()
+
+
+def to_storage_row(row: Dict, message_ids: Dict[str, int]) -> Dict:
+    """
+    수집한 행(dict)을 population 테이블 컬럼에 맞게 변환합니다.
+    (congestion_message -> congestion_message_id, 성별/연령대별 인구 수는 저장 시 한 번만 계산)
+    """
+    stored = {key: value for key, value in row.items() if key != "congestion_message"}
+    stored["congestion_message_id"] = message_ids.get(row.get("congestion_message"))
+    return add_derived_counts(stored)
+
+
+async def insert_population_rows(db: AsyncSession, rows: List[Dict]) -> int:
+    """
+    한 사이클 동안 수집한 인구 데이터를 다중 행 INSERT로 한 번에 저장합니다.
+    (datetime, region_id)가 이미 존재하는 행은 건너뛰며, 실제로 추가된 행 수를 반환합니다.
+    트랜잭션 관리는 호출하는 쪽에서 합니다.
+    """
+    if not rows:
+        return 0
+
+    message_ids = await congestion_message_ids.resolve(db, (row.get("congestion_message") for row in rows))
+    rows = [to_storage_row(row, message_ids) for row in rows]
+
+    dialect_name = db.get_bind().dialect.name
+    stmt = build_insert_ignore(PopulationStation.__table__, dialect_name)
+
+    inserted = 0
+    for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+        result = await db.execute(stmt.values(rows[i:i + INSERT_CHUNK_SIZE]))
+        inserted += max(result.rowcount, 0)
+    return inserted
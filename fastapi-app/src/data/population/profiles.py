@@ -0,0 +1,351 @@
+"""
+지역별 요일 x 시간대 "평소 혼잡도" 프로필.
+
+지역마다 (7, 하루 구간 수) 배열에 최소/최대 인구 합계와 혼잡도 단계별 샘플 수를 누적합니다.
+- 새로 저장된 행은 최신 데이터 캐시의 행 알림(수집 write-through, 다른 프로세스가 저장한 행은 주기적 갱신)으로 받아
+  해당 칸에만 더합니다. (이력 길이와 무관)
+- 조회는 지역 인덱스로 배열을 잘라 평균/비율을 계산하므로 DB를 거치지 않습니다.
+- 주기적으로 .npz 파일에 저장합니다. 파일이 없으면 잠금 파일을 먼저 만든 프로세스 하나만 DB 이력으로 다시 만들고,
+  나머지 웹 워커는 그 파일이 생기면 읽습니다.
+
+DB 이력으로 직접 다시 만들기 (fastapi-app 디렉토리에서, 배포 전 한 번):
+    python -m src.data.population.profiles
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.future import select
+
+from src.data.database import AsyncSessionLocal, engine
+from src.data.population.rollup import CONGEST_LEVELS
+from src.data.population.snapshot_cache import PopulationSnapshot, latest_snapshots
+from src.model.population import PopulationStation
+
+# 프로필 설정
+PROFILE_SLOT_MINUTES = int(os.getenv("PROFILE_SLOT_MINUTES", "60"))  # 하루 구간 길이(분). 60: 7x24, 5: 7x288
+PROFILE_PATH = os.getenv("PROFILE_PATH", "population_profiles.npz")  # 저장 파일 경로
+PROFILE_SAVE_INTERVAL = float(os.getenv("PROFILE_SAVE_INTERVAL", "600"))  # 저장 주기(초)
+PROFILE_REBUILD_CHUNK = 10000  # DB 이력으로 다시 만들 때 한 번에 읽을 행 수
+PROFILE_REBUILD_LOCK_TTL = float(os.getenv("PROFILE_REBUILD_LOCK_TTL", "3600"))  # 이보다 오래된 잠금 파일은 중단된 것으로 보고 무시(초)
+
+WEEKDAYS = ("월", "화", "수", "목", "금", "토", "일")
+CONGEST_NAMES = tuple(CONGEST_LEVELS.values())
+CONGEST_INDEX = {level: i for i, level in enumerate(CONGEST_LEVELS)}
+EPOCH = datetime(1970, 1, 1)
+
+
+class ProfileEngine:
+    """
+    region_id -> 배열 행 인덱스. 모든 지역의 누적 값은 (지역 수, 7, 구간 수) 배열 하나에 저장합니다.
+    - samples: 인구 값이 있는 샘플 수
+    - min_sum / max_sum: 최소/최대 인구 합계 (평균 = 합계 / samples)
+    - congest: 혼잡도 단계별 샘플 수 (지역 수, 7, 구간 수, 단계 수)
+    - last_seen: 지역별 마지막으로 더한 데이터 시각(epoch 초). 같은 스냅샷을 두 번 더하지 않기 위해 사용
+    """
+
+    def __init__(self, slot_minutes: int = PROFILE_SLOT_MINUTES):
+        if 1440 % slot_minutes:
+            raise ValueError(f"하루(1440분)를 나누어 떨어지는 구간 길이여야 합니다: {slot_minutes}")
+        self.slot_minutes = slot_minutes
+        self.slots = 1440 // slot_minutes
+        self._reset()
+
+    def _reset(self):
+        self._index: Dict[str, int] = {}
+        self.samples = np.zeros((0, 7, self.slots), dtype=np.int32)
+        self.min_sum = np.zeros((0, 7, self.slots), dtype=np.float64)
+        self.max_sum = np.zeros((0, 7, self.slots), dtype=np.float64)
+        self.congest = np.zeros((0, 7, self.slots, len(CONGEST_NAMES)), dtype=np.int32)
+        self.last_seen = np.zeros(0, dtype=np.int64)
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, region_id: str) -> bool:
+        return region_id in self._index
+
+    def _region_index(self, region_id: str) -> int:
+        index = self._index.get(region_id)
+        if index is None:
+            # 지역은 처음 볼 때 한 번만 배열을 늘림 (지역 수는 AREA_NM_LIST 정도로 고정)
+            index = len(self._index)
+            self._index[region_id] = index
+            self.samples = np.concatenate([self.samples, np.zeros((1, 7, self.slots), dtype=np.int32)])
+            self.min_sum = np.concatenate([self.min_sum, np.zeros((1, 7, self.slots))])
+            self.max_sum = np.concatenate([self.max_sum, np.zeros((1, 7, self.slots))])
+            self.congest = np.concatenate([self.congest, np.zeros((1, 7, self.slots, len(CONGEST_NAMES)), dtype=np.int32)])
+            self.last_seen = np.append(self.last_seen, np.int64(0))
+        return index
+
+    def slot_of(self, value: datetime) -> tuple:
+        """(요일, 구간) 인덱스. datetime은 KST 기준입니다."""
+        return value.weekday(), (value.hour * 60 + value.minute) // self.slot_minutes
+
+    def observe(self, snapshot: PopulationSnapshot) -> bool:
+        """스냅샷 하나를 해당 요일/구간 칸에 더합니다. 이미 더한 시각 이전의 데이터는 건너뜁니다."""
+        index = self._region_index(snapshot.region_id)
+        observed_at = snapshot.datetime.replace(tzinfo=None)
+        stamp = _stamp(observed_at)
+        if stamp <= self.last_seen[index]:
+            return False
+        self.last_seen[index] = stamp
+
+        weekday, slot = self.slot_of(observed_at)
+        if snapshot.min_population is not None and snapshot.max_population is not None:
+            self.samples[index, weekday, slot] += 1
+            self.min_sum[index, weekday, slot] += snapshot.min_population
+            self.max_sum[index, weekday, slot] += snapshot.max_population
+        level = CONGEST_INDEX.get(snapshot.area_congest)
+        if level is not None:
+            self.congest[index, weekday, slot, level] += 1
+        return True
+
+    def observe_many(self, snapshots: List[PopulationSnapshot]):
+        # 최신 데이터 캐시의 행 알림 (수집 write-through, 주기적 갱신). 파일을 읽기 전에는 더하지 않음 (읽은 뒤 catch_up으로 반영)
+        if not self.loaded:
+            return
+        for snapshot in snapshots:
+            self.observe(snapshot)
+
+    def profile(self, region_id: str, weekday: Optional[int] = None) -> Optional[dict]:
+        """
+        지역의 요일 x 구간별 평균 최소/최대 인구와 혼잡도 단계별 비율. 데이터가 없는 칸은 None.
+        weekday(0=월요일)를 주면 해당 요일 한 줄만 반환합니다.
+        """
+        index = self._index.get(region_id)
+        if index is None:
+            return None
+        rows = slice(None) if weekday is None else slice(weekday, weekday + 1)
+        samples = self.samples[index, rows]
+        congest = self.congest[index, rows]
+        congest_total = congest.sum(axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            min_population = np.round(self.min_sum[index, rows] / samples, 1)
+            max_population = np.round(self.max_sum[index, rows] / samples, 1)
+            shares = np.round(congest / congest_total[..., None], 3)
+        return {
+            "region_id": region_id,
+            "slot_minutes": self.slot_minutes,
+            "weekdays": list(WEEKDAYS[rows]),
+            "samples": samples.tolist(),
+            # NaN(샘플 없음)은 orjson이 null로 직렬화
+            "min_population": min_population.tolist(),
+            "max_population": max_population.tolist(),
+            "congestion": {name: shares[..., i].tolist() for i, name in enumerate(CONGEST_NAMES)},
+        }
+
+    def state(self) -> dict:
+        """저장할 배열 (복사본이므로 다른 스레드에서 써도 안전)"""
+        return {
+            "slot_minutes": np.int64(self.slot_minutes),
+            "region_ids": np.array(list(self._index), dtype=str),
+            "samples": self.samples.copy(),
+            "min_sum": self.min_sum.copy(),
+            "max_sum": self.max_sum.copy(),
+            "congest": self.congest.copy(),
+            "last_seen": self.last_seen.copy(),
+        }
+
+    def save(self, path: str = PROFILE_PATH):
+        write_state(path, self.state())
+
+    def load(self, path: str = PROFILE_PATH) -> bool:
+        """저장 파일을 읽습니다. 파일이 없거나 구간 길이가 다르면 False."""
+        if not os.path.exists(path):
+            return False
+        with np.load(path) as data:
+            if int(data["slot_minutes"]) != self.slot_minutes:
+                print(f"프로필 파일의 구간 길이가 달라 사용하지 않습니다: {int(data['slot_minutes'])}분")
+                return False
+            self._index = {str(region_id): i for i, region_id in enumerate(data["region_ids"])}
+            self.samples = data["samples"]
+            self.min_sum = data["min_sum"]
+            self.max_sum = data["max_sum"]
+            self.congest = data["congest"]
+            self.last_seen = data["last_seen"]
+        self.loaded = True
+        return True
+
+    async def rebuild(self, session_factory=AsyncSessionLocal):
+        """DB 이력 전체로 다시 만듭니다. (프로필 파일이 없을 때 한 번)"""
+        self._reset()
+        rows = await self._scan(None, session_factory)
+        self.loaded = True
+        print(f"프로필 다시 만들기 완료: {len(self)}개 지역, {rows}행")
+
+    async def catch_up(self, session_factory=AsyncSessionLocal) -> int:
+        """파일 저장 이후(서버가 꺼져 있던 동안) 저장된 행을 더합니다. 이미 더한 시각 이전의 행은 건너뜁니다."""
+        if not len(self):
+            return await self._scan(None, session_factory)
+        since = EPOCH + timedelta(seconds=int(self.last_seen.min()))
+        return await self._scan(since, session_factory)
+
+    async def _scan(self, since: Optional[datetime], session_factory) -> int:
+        # _add_rows는 지역별로 이미 더한 시각(last_seen) 이전의 행을 건너뛰므로, 청크 사이에서도 시간 순서로 읽어야
+        # 나중에 채운 과거 이력(백필)이 빠지지 않음 (기본 키 (datetime, region_id) 순서)
+        query = select(
+            PopulationStation.region_id,
+            PopulationStation.datetime,
+            PopulationStation.min_population,
+            PopulationStation.max_population,
+            PopulationStation.area_congest,
+        ).order_by(PopulationStation.datetime).execution_options(yield_per=PROFILE_REBUILD_CHUNK)
+        if since is not None:
+            query = query.where(PopulationStation.datetime > since)
+        rows = 0
+        async with session_factory() as db:
+            result = await db.stream(query)
+            async for partition in result.partitions(PROFILE_REBUILD_CHUNK):
+                rows += self._add_rows(partition)
+        return rows
+
+    def _add_rows(self, rows) -> int:
+        # 청크 단위로 인덱스를 만들고 np.add.at으로 한 번에 더함 (같은 칸이 여러 번 나와도 누적)
+        region = np.array([self._region_index(row[0]) for row in rows], dtype=np.int64)
+        times = [row[1].replace(tzinfo=None) for row in rows]
+        stamps = np.array([_stamp(value) for value in times], dtype=np.int64)
+        fresh = stamps > self.last_seen[region]
+        if not fresh.any():
+            return 0
+        rows = [row for row, keep in zip(rows, fresh) if keep]
+        times = [value for value, keep in zip(times, fresh) if keep]
+        region, stamps = region[fresh], stamps[fresh]
+        weekday = np.array([value.weekday() for value in times], dtype=np.int64)
+        slot = np.array([(value.hour * 60 + value.minute) // self.slot_minutes for value in times], dtype=np.int64)
+        np.maximum.at(self.last_seen, region, stamps)
+
+        valid = np.array([row[2] is not None and row[3] is not None for row in rows])
+        if valid.any():
+            at = (region[valid], weekday[valid], slot[valid])
+            np.add.at(self.samples, at, 1)
+            np.add.at(self.min_sum, at, np.array([row[2] for row in rows], dtype=object)[valid].astype(np.float64))
+            np.add.at(self.max_sum, at, np.array([row[3] for row in rows], dtype=object)[valid].astype(np.float64))
+
+        level = np.array([CONGEST_INDEX.get(row[4], -1) for row in rows], dtype=np.int64)
+        known = level >= 0
+        np.add.at(self.congest, (region[known], weekday[known], slot[known], level[known]), 1)
+        return len(rows)
+
+    async def load_or_rebuild(self, path: str = PROFILE_PATH, session_factory=AsyncSessionLocal):
+        """
+        저장 파일을 읽고 그 이후 데이터만 더합니다.
+        파일이 없으면 잠금 파일을 만든 프로세스 하나만 DB 이력으로 다시 만들고, 나머지는 run_persist에서 파일이 생기면 읽습니다.
+        """
+        if self.load(path):
+            rows = await self.catch_up(session_factory)
+            print(f"프로필 파일 로드 완료: {len(self)}개 지역 (이후 데이터 {rows}행 반영)")
+            return
+        if not _claim_rebuild(path):
+            print("다른 프로세스가 프로필을 만드는 중입니다. 파일이 생기면 읽습니다.")
+            return
+        try:
+            await self.rebuild(session_factory)
+            await self.save_async(path)
+        finally:
+            _release_rebuild(path)
+
+    async def load_async(self, path: str = PROFILE_PATH, session_factory=AsyncSessionLocal) -> bool:
+        """다른 프로세스가 만든 파일을 읽고 그 이후 데이터를 더합니다. 파일이 아직 없으면 False."""
+        if not os.path.exists(path) or os.path.exists(_lock_path(path)):
+            return False
+        if not self.load(path):
+            return False
+        rows = await self.catch_up(session_factory)
+        print(f"프로필 파일 로드 완료: {len(self)}개 지역 (이후 데이터 {rows}행 반영)")
+        return True
+
+    async def save_async(self, path: str = PROFILE_PATH):
+        # 파일 쓰기는 스레드에서 (이벤트 루프를 막지 않음)
+        await asyncio.to_thread(write_state, path, self.state())
+
+    async def run_persist(self, interval: float = PROFILE_SAVE_INTERVAL, path: str = PROFILE_PATH):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if self.loaded:
+                    await self.save_async(path)
+                else:
+                    # 아직 프로필이 없는 워커는 다른 프로세스가 만든 파일을 기다림 (빈 프로필로 파일을 덮어쓰지 않음)
+                    await self.load_async(path)
+            except Exception as e:
+                print(f"프로필 저장 중 오류 발생: {e}")
+
+
+def _stamp(value: datetime) -> int:
+    # 서버 시간대와 무관하게 비교하기 위해 KST 시각 그대로 epoch 초로 변환
+    return int((value - EPOCH).total_seconds())
+
+
+def write_state(path: str, state: dict):
+    # 임시 파일에 쓴 뒤 교체하여, 저장 중에 종료되어도 이전 파일이 남도록 함 (웹 워커가 여러 개면 프로세스별 임시 파일)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        np.savez(file, **state)
+    os.replace(tmp_path, path)
+
+
+def _lock_path(path: str) -> str:
+    return f"{path}.rebuild.lock"
+
+
+def _claim_rebuild(path: str) -> bool:
+    """
+    잠금 파일을 만들어 DB 이력으로 다시 만들 프로세스를 하나로 정합니다. (웹 워커마다 전체 이력을 읽지 않도록)
+    이미 있으면 False. 중단된 프로세스가 남긴 오래된 잠금 파일은 지우고 다시 시도합니다.
+    """
+    lock_path = _lock_path(path)
+    for _ in range(2):
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) < PROFILE_REBUILD_LOCK_TTL:
+                    return False
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+    return False
+
+
+def _release_rebuild(path: str):
+    try:
+        os.remove(_lock_path(path))
+    except FileNotFoundError:
+        pass
+
+
+# 프로세스 전역 프로필. 최신 데이터 캐시에 새로 저장된 행이 들어올 때마다(수집 write-through, 주기적 갱신) 더함
+population_profiles = ProfileEngine()
+latest_snapshots.add_row_listener(population_profiles.observe_many)
+
+
+def _parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="DB 이력으로 요일 x 시간대 프로필 파일 다시 만들기")
+    parser.add_argument("--path", default=PROFILE_PATH, help="저장 파일 경로")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[List[str]] = None):
+    args = _parse_args(argv)
+    if not _claim_rebuild(args.path):
+        print(f"다른 프로세스가 프로필을 만드는 중입니다: {_lock_path(args.path)}")
+        return
+    try:
+        profiles = ProfileEngine()
+        await profiles.rebuild()
+        profiles.save(args.path)
+        print(f"프로필 저장 완료: {args.path}")
+    finally:
+        _release_rebuild(args.path)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+import asyncio
+import os
+
+import orjson
+from typing import Dict, Iterable, List, Optional, Set
+
+from src.data.metrics.metrics import STREAM_SUBSCRIBERS
+from src.data.population.snapshot_cache import PopulationSnapshot, latest_snapshots
+
+# 구독 설정
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "256"))  # 구독자별 대기 스냅샷 수. 넘치면 오래된 것부터 버림
+STREAM_MAX_SUBSCRIBERS = int(os.getenv("STREAM_MAX_SUBSCRIBERS", "5000"))  # 프로세스당 최대 구독자 수
+STREAM_KEEPALIVE = float(os.getenv("STREAM_KEEPALIVE", "15"))  # 새 데이터가 없을 때 연결 유지용 주석을 보내는 간격(초)
+
+
+def format_sse(snapshot: PopulationSnapshot) -> bytes:
+    """Server-Sent Events 형식의 snapshot 이벤트 한 건."""
+    data = orjson.dumps(snapshot)
+    return b"id: %s\nevent: snapshot\ndata: %s\n\n" % (f"{snapshot.region_id}:{snapshot.datetime:%Y%m%d%H%M}".encode("utf-8"), data)
+
+
+class Subscription:
+    """구독자 한 명. region_ids가 None이면 전체 지역을 구독합니다."""
+
+    def __init__(self, region_ids: Optional[Set[str]], queue_size: int = STREAM_QUEUE_SIZE):
+        self.region_ids = region_ids
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def offer(self, snapshot: PopulationSnapshot):
+        # 느린 구독자 때문에 발행이 막히지 않도록 가득 차면 가장 오래된 항목을 버리고 넣음
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(snapshot)
+
+    async def get(self, timeout: float) -> Optional[PopulationSnapshot]:
+        """timeout 동안 새 스냅샷이 없으면 None."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class SnapshotBroker:
+    """
+    프로세스 내 pub/sub. 최신 데이터 캐시가 바뀌면 해당 지역 구독자에게만 전달합니다.
+    구독자가 없는 동안에는 아무 일도 하지 않으므로, 대기 중인 연결은 비용이 거의 없습니다.
+    """
+
+    def __init__(self, max_subscribers: int = STREAM_MAX_SUBSCRIBERS):
+        self.max_subscribers = max_subscribers
+        self._subscriptions: Set[Subscription] = set()
+        self._by_region: Dict[str, Set[Subscription]] = {}  # 지역별 구독자
+        self._all_regions: Set[Subscription] = set()  # 전체 지역 구독자
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    @property
+    def full(self) -> bool:
+        return len(self._subscriptions) >= self.max_subscribers
+
+    def subscribe(self, region_ids: Optional[Iterable[str]] = None) -> Subscription:
+        if self.full:
+            raise OverflowError("구독자 수가 최대치를 넘었습니다.")
+        subscription = Subscription(set(region_ids) if region_ids is not None else None)
+        if subscription.region_ids is None:
+            self._all_regions.add(subscription)
+        else:
+            for region_id in subscription.region_ids:
+                self._by_region.setdefault(region_id, set()).add(subscription)
+        self._subscriptions.add(subscription)
+        STREAM_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription not in self._subscriptions:
+            return
+        self._subscriptions.discard(subscription)
+        self._all_regions.discard(subscription)
+        for region_id in subscription.region_ids or ():
+            subscribers = self._by_region.get(region_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_region[region_id]
+        STREAM_SUBSCRIBERS.dec()
+
+    def publish(self, snapshots: List[PopulationSnapshot]):
+        """바뀐 스냅샷을 구독자 큐에 넣습니다. (이벤트 루프 안에서 동기적으로 호출)"""
+        if not self._subscriptions:
+            return
+        for snapshot in snapshots:
+            for subscription in self._all_regions:
+                subscription.offer(snapshot)
+            for subscription in self._by_region.get(snapshot.region_id, ()):
+                subscription.offer(snapshot)
+
+
+# 프로세스 전역 브로커. 최신 데이터 캐시가 바뀔 때마다(수집 write-through, 주기적 갱신) 발행
+snapshot_broker = SnapshotBroker()
+latest_snapshots.add_listener(snapshot_broker.publish)
@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    토큰 버킷 방식의 요청 속도 제한기.
+    - rate: 초당 채워지는 토큰 수 (= 허용 요청 수/초). 0 이하이면 제한하지 않습니다.
+    - capacity: 버킷 최대 크기 (순간적으로 허용되는 버스트 요청 수)
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+
+        # 락을 잡은 상태로 대기하므로 대기 중인 요청은 도착 순서대로 토큰을 받습니다.
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
@@ -0,0 +1,59 @@
+import io
+from typing import Optional, Sequence
+
+import orjson
+from fastapi import HTTPException, Request, Response
+
+# Arrow IPC는 pyarrow가 설치된 경우에만 지원
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# Accept 헤더로 선택하는 컬럼 형식 응답 (기본 응답은 기존과 같은 객체 목록 JSON)
+JSON_MEDIA_TYPE = "application/json"
+COLUMNAR_JSON_MEDIA_TYPE = "application/vnd.seouleasy.columnar+json"  # {"columns": {컬럼: [값, ...]}}
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"  # Apache Arrow IPC stream
+
+
+def columnar_media_type(request: Request) -> Optional[str]:
+    """
+    Accept 헤더에서 컬럼 형식 응답을 요청했는지 확인합니다. 요청하지 않았으면 None.
+    """
+    accept = request.headers.get("accept", "")
+    if ARROW_MEDIA_TYPE in accept:
+        if not ARROW_AVAILABLE:
+            raise HTTPException(status_code=406, detail="Arrow 응답을 지원하지 않습니다. (pyarrow 미설치)")
+        return ARROW_MEDIA_TYPE
+    if COLUMNAR_JSON_MEDIA_TYPE in accept:
+        return COLUMNAR_JSON_MEDIA_TYPE
+    return None
+
+
+def orjson_response(payload, media_type: str = JSON_MEDIA_TYPE) -> Response:
+    """
+    orjson으로 바로 직렬화한 응답. (datetime, dataclass를 그대로 직렬화하며 response_model 재검증을 거치지 않음)
+    """
+    return Response(content=orjson.dumps(payload), media_type=media_type, headers={"Vary": "Accept"})
+
+
+def population_response(media_type: Optional[str], names: Sequence[str], rows: Sequence[tuple]) -> Response:
+    """
+    컬럼 조회 결과(튜플 목록)로 바로 응답을 만듭니다. ORM 객체나 Pydantic 모델을 행마다 만들지 않습니다.
+    - None: 기존과 같은 객체 목록 JSON
+    - COLUMNAR_JSON_MEDIA_TYPE: 컬럼별 배열 JSON
+    - ARROW_MEDIA_TYPE: Arrow IPC stream
+    """
+    if media_type is None:
+        return orjson_response([dict(zip(names, row)) for row in rows])
+
+    values = list(zip(*rows)) if rows else [()] * len(names)
+    if media_type == ARROW_MEDIA_TYPE:
+        table = pa.table({name: pa.array(list(column)) for name, column in zip(names, values)})
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(content=sink.getvalue(), media_type=media_type, headers={"Vary": "Accept"})
+    return orjson_response({"columns": dict(zip(names, map(list, values)))}, media_type)
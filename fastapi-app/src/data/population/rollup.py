@@ -0,0 +1,263 @@
+"""
+population 테이블의 시간(population_hourly) / 일(population_daily) 단위 집계.
+
+- 수집 사이클마다 새 행이 들어간 시간 구간만 INSERT ... SELECT ... GROUP BY 로 다시 계산하여 upsert 합니다.
+  (구간 전체를 다시 계산하므로 늦게 도착한 데이터나 같은 사이클의 재실행에도 결과가 같음)
+- 일 단위는 원본 대신 시간 단위 집계(하루 24행)에서 계산합니다.
+
+기존 데이터 집계 (fastapi-app 디렉토리에서):
+    python -m src.data.population.rollup [--start 2025-03-01] [--end 2025-04-01]
+"""
+import argparse
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Literal, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import case, func, literal, literal_column, null
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from src.data.database import AsyncSessionLocal, engine
+from src.model.column_types import ScaledRate, unscaled
+from src.model.population import PopulationStation
+from src.model.population_rollup import PopulationDaily, PopulationHourly
+
+# 구간마다 최소/평균/최대를 저장하는 값 (population_rollup의 {값}_min / _avg / _max 컬럼)
+ROLLUP_MEASURES = (
+    "min_population", "max_population", "male_rate", "female_rate",
+    "gen_10", "gen_20", "gen_30", "gen_40", "gen_50", "gen_60", "gen_70",
+)
+# area_congest 단계 -> 단계별 샘플 수 컬럼
+CONGEST_LEVELS = {
+    "여유": "congest_relaxed",
+    "보통": "congest_normal",
+    "약간 붐빔": "congest_slightly_busy",
+    "붐빔": "congest_busy",
+}
+ROLLUP_KEY = ("bucket", "region_id")
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+# 시계열 조회 해상도 자동 선택 기준 (조회 범위 길이)
+SERIES_RAW_MAX_SPAN = timedelta(hours=float(os.getenv("SERIES_RAW_MAX_HOURS", "48")))  # 이하: 원본 5분 데이터
+SERIES_HOURLY_MAX_SPAN = timedelta(days=float(os.getenv("SERIES_HOURLY_MAX_DAYS", "14")))  # 이하: 시간 단위, 초과: 일 단위
+SERIES_MAX_SPAN = timedelta(days=int(os.getenv("SERIES_MAX_DAYS", "400")))  # 조회 가능한 최대 범위
+RAW_MAX_SPAN = timedelta(days=31)  # 원본 해상도를 직접 지정했을 때의 최대 범위
+
+Resolution = Literal["raw", "hourly", "daily"]
+SERIES_RESOLUTION_HEADER = "X-Series-Resolution"  # 선택한 해상도를 알려주는 응답 헤더
+ROLLUP_TABLES = {"hourly": PopulationHourly, "daily": PopulationDaily}
+
+
+def floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def floor_day(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def bucket_expr(column, unit: str, dialect_name: str):
+    """
+    datetime 컬럼을 구간 시작 시각으로 내림하는 식을 DB 종류에 맞게 생성합니다.
+    GROUP BY와 SELECT가 같은 식으로 비교되도록 형식 문자열은 바인드 파라미터가 아닌 리터럴로 넣습니다.
+    """
+    if dialect_name == "postgresql":
+        return func.date_trunc(literal_column(f"'{unit}'"), column)
+    clock = "%H:00:00" if unit == "hour" else "00:00:00"
+    if dialect_name == "sqlite":
+        # SQLAlchemy가 SQLite에 저장하는 문자열 형식과 같게 만들어야 범위 비교가 맞음
+        return func.strftime(literal_column(f"'%Y-%m-%d {clock}.000000'"), column)
+    if dialect_name == "mysql":
+        return func.date_format(column, literal_column(f"'%Y-%m-%d {clock}'"))
+    raise ValueError(f"지원하지 않는 데이터베이스입니다: {dialect_name}")
+
+
+def build_upsert(table, query, dialect_name: str):
+    """
+    INSERT ... SELECT 결과로 집계 행을 넣고, 이미 있는 구간이면 새 값으로 덮어쓰는 문을 생성합니다.
+    - MySQL: ON DUPLICATE KEY UPDATE
+    - SQLite / PostgreSQL: ON CONFLICT (bucket, region_id) DO UPDATE
+    """
+    names = list(query.selected_columns.keys())
+    updated = [name for name in names if name not in ROLLUP_KEY]
+    if dialect_name == "mysql":
+        stmt = mysql.insert(table).from_select(names, query)
+        return stmt.on_duplicate_key_update({name: stmt.inserted[name] for name in updated})
+    if dialect_name in ("sqlite", "postgresql"):
+        dialect = sqlite if dialect_name == "sqlite" else postgresql
+        stmt = dialect.insert(table).from_select(names, query)
+        return stmt.on_conflict_do_update(index_elements=list(ROLLUP_KEY), set_={name: stmt.excluded[name] for name in updated})
+    raise ValueError(f"지원하지 않는 데이터베이스입니다: {dialect_name}")
+
+
+def hourly_rollup_query(dialect_name: str, start: datetime, end: datetime, region_ids: Optional[Sequence[str]] = None):
+    """원본 행을 [start, end) 범위에서 지역/시간별로 집계합니다."""
+    source = PopulationStation
+    bucket = bucket_expr(source.datetime, "hour", dialect_name)
+    columns = [bucket.label("bucket"), source.region_id, func.count().label("samples")]
+    for measure in ROLLUP_MEASURES:
+        column = getattr(source, measure)
+        if isinstance(column.type, ScaledRate):
+            column = unscaled(column)  # 정수로 저장한 비율은 DB 안에서 원래 값으로 되돌려 집계
+        columns += [
+            func.min(column).label(f"{measure}_min"),
+            func.avg(column).label(f"{measure}_avg"),
+            func.max(column).label(f"{measure}_max"),
+        ]
+    for level, name in CONGEST_LEVELS.items():
+        columns.append(func.sum(case((source.area_congest == level, 1), else_=0)).label(name))
+
+    query = select(*columns).where(source.datetime >= start, source.datetime < end)
+    if region_ids is not None:
+        query = query.where(source.region_id.in_(list(region_ids)))
+    return query.group_by(bucket, source.region_id)
+
+
+def daily_rollup_query(dialect_name: str, start: datetime, end: datetime, region_ids: Optional[Sequence[str]] = None):
+    """시간 단위 집계를 [start, end) 범위에서 지역/일별로 다시 집계합니다. (평균은 샘플 수 가중 평균)"""
+    source = PopulationHourly
+    bucket = bucket_expr(source.bucket, "day", dialect_name)
+    columns = [bucket.label("bucket"), source.region_id, func.sum(source.samples).label("samples")]
+    for measure in ROLLUP_MEASURES:
+        average = getattr(source, f"{measure}_avg")
+        columns += [
+            func.min(getattr(source, f"{measure}_min")).label(f"{measure}_min"),
+            (
+                func.sum(average * source.samples)
+                / func.sum(case((average.isnot(None), source.samples), else_=null()))
+            ).label(f"{measure}_avg"),
+            func.max(getattr(source, f"{measure}_max")).label(f"{measure}_max"),
+        ]
+    for name in CONGEST_LEVELS.values():
+        columns.append(func.sum(getattr(source, name)).label(name))
+
+    query = select(*columns).where(source.bucket >= start, source.bucket < end)
+    if region_ids is not None:
+        query = query.where(source.region_id.in_(list(region_ids)))
+    return query.group_by(bucket, source.region_id)
+
+
+async def rollup_range(db: AsyncSession, start: datetime, end: datetime, region_ids: Optional[Sequence[str]] = None):
+    """
+    [start, end)를 포함하는 시간 구간과 일 구간을 다시 계산합니다. (문 2개)
+    트랜잭션 관리는 호출하는 쪽에서 합니다.
+    """
+    dialect_name = db.get_bind().dialect.name
+    hour_start, hour_end = floor_hour(start), floor_hour(end - timedelta(microseconds=1)) + HOUR
+    day_start, day_end = floor_day(start), floor_day(end - timedelta(microseconds=1)) + DAY
+    await db.execute(build_upsert(PopulationHourly.__table__, hourly_rollup_query(dialect_name, hour_start, hour_end, region_ids), dialect_name))
+    await db.execute(build_upsert(PopulationDaily.__table__, daily_rollup_query(dialect_name, day_start, day_end, region_ids), dialect_name))
+
+
+async def update_rollups(db: AsyncSession, rows: Iterable[Dict]):
+    """수집한 행이 속한 지역/구간의 집계만 다시 계산합니다. (수집 사이클의 저장 트랜잭션 안에서 호출)"""
+    rows = list(rows)
+    if not rows:
+        return
+    times = [row["datetime"].replace(tzinfo=None) for row in rows]
+    region_ids = sorted({row["region_id"] for row in rows})
+    await rollup_range(db, min(times), max(times) + timedelta(microseconds=1), region_ids)
+
+
+async def backfill_rollups(start: Optional[datetime] = None, end: Optional[datetime] = None, session_factory=AsyncSessionLocal) -> int:
+    """
+    기존 원본 데이터로 집계 테이블을 채웁니다. 하루씩 나누어 트랜잭션을 커밋하므로 중간에 멈춰도 다시 실행하면 됩니다.
+    처리한 일 수를 반환합니다.
+    """
+    if start is None or end is None:
+        async with session_factory() as db:
+            first, last = (await db.execute(
+                select(func.min(PopulationStation.datetime), func.max(PopulationStation.datetime))
+            )).one()
+        if first is None:
+            print("집계할 데이터가 없습니다.")
+            return 0
+        start = start or first.replace(tzinfo=None)
+        end = end or last.replace(tzinfo=None) + timedelta(microseconds=1)
+
+    day = floor_day(start)
+    days = 0
+    while day < end:
+        async with session_factory() as db:
+            async with db.begin():
+                await rollup_range(db, day, day + DAY)
+        days += 1
+        print(f"집계 완료: {day:%Y-%m-%d}")
+        day += DAY
+    return days
+
+
+def choose_resolution(start: datetime, end: datetime, resolution: str = "auto") -> Resolution:
+    """조회 범위 길이로 해상도를 고릅니다. (주간은 시간 단위, 월간 이상은 일 단위로 수백 행 이내)"""
+    span = end - start
+    if span > SERIES_MAX_SPAN:
+        raise HTTPException(status_code=400, detail=f"조회 범위는 최대 {SERIES_MAX_SPAN.days}일입니다.")
+    if resolution == "raw" and span > RAW_MAX_SPAN:
+        raise HTTPException(status_code=400, detail=f"원본 해상도 조회 범위는 최대 {RAW_MAX_SPAN.days}일입니다.")
+    if resolution != "auto":
+        return resolution
+    if span <= SERIES_RAW_MAX_SPAN:
+        return "raw"
+    if span <= SERIES_HOURLY_MAX_SPAN:
+        return "hourly"
+    return "daily"
+
+
+def series_query(region_id: str, start: datetime, end: datetime, resolution: Resolution):
+    """
+    해상도와 관계없이 같은 컬럼(SERIES_NAMES)으로 시계열을 조회합니다.
+    원본 해상도는 값 하나를 최소/평균/최대로, 혼잡도는 해당 단계 비율 1.0으로 채웁니다.
+    """
+    if resolution == "raw":
+        source = PopulationStation
+        columns = [source.datetime, literal(1).label("samples")]
+        for measure in ROLLUP_MEASURES:
+            column = getattr(source, measure)
+            columns += [column.label(f"{measure}_min"), column.label(f"{measure}_avg"), column.label(f"{measure}_max")]
+        for level, name in CONGEST_LEVELS.items():
+            columns.append(case((source.area_congest == level, 1.0), else_=0.0).label(f"{name}_share"))
+        time_column = source.datetime
+    else:
+        source = ROLLUP_TABLES[resolution]
+        columns = [source.bucket.label("datetime"), source.samples]
+        for measure in ROLLUP_MEASURES:
+            columns += [getattr(source, f"{measure}_{stat}") for stat in ("min", "avg", "max")]
+        for name in CONGEST_LEVELS.values():
+            columns.append((getattr(source, name) * 1.0 / source.samples).label(f"{name}_share"))
+        time_column = source.bucket
+        start = floor_hour(start) if resolution == "hourly" else floor_day(start)
+
+    return (
+        select(*columns)
+        .where(source.region_id == region_id, time_column >= start, time_column <= end)
+        .order_by(time_column)
+    )
+
+
+# 시계열 응답 컬럼 이름 (해상도와 관계없이 같음)
+SERIES_NAMES = tuple(series_query("", datetime.min, datetime.min, "hourly").selected_columns.keys())
+
+
+def _parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="population 시간/일 단위 집계 테이블 채우기")
+    parser.add_argument("--start", type=datetime.fromisoformat, default=None, help="시작 날짜 (생략 시 가장 오래된 데이터)")
+    parser.add_argument("--end", type=datetime.fromisoformat, default=None, help="끝 날짜 (생략 시 가장 최근 데이터)")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[List[str]] = None):
+    args = _parse_args(argv)
+    try:
+        days = await backfill_rollups(args.start, args.end)
+        print(f"집계 테이블 채우기 완료: {days}일")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+@dataclass
+class AreaResult:
+    area_name: str
+    status: str  # "ok" | "timeout" | "error"
+    latency: float  # 지역별 처리 시간(초)
+    result: Any = None
+    error: Optional[str] = None
+
+
+@dataclass
+class CycleReport:
+    concurrency: int
+    makespan: float = 0.0  # 사이클 시작부터 마지막 작업 종료까지 걸린 시간(초)
+    results: List[AreaResult] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)  # 사이클 마감 시간으로 시작하지 못한 지역
+
+    def by_status(self, status: str) -> List[AreaResult]:
+        return [r for r in self.results if r.status == status]
+
+    def latency_percentile(self, percentile: float) -> float:
+        latencies = sorted(r.latency for r in self.results)
+        if not latencies:
+            return 0.0
+        index = min(len(latencies) - 1, int(round(percentile / 100 * (len(latencies) - 1))))
+        return latencies[index]
+
+    @property
+    def ideal_makespan(self) -> float:
+        # 총 작업 시간 / 동시 실행 수 (대기 없는 이상적인 소요 시간)
+        return sum(r.latency for r in self.results) / max(1, self.concurrency)
+
+    def summary(self) -> str:
+        return (
+            f"소요 시간: {self.makespan:.2f}초 (이상적: {self.ideal_makespan:.2f}초), "
+            f"성공 {len(self.by_status('ok'))} / 타임아웃 {len(self.by_status('timeout'))} / "
+            f"오류 {len(self.by_status('error'))} / 미실행 {len(self.skipped)}, "
+            f"지역별 지연 p50 {self.latency_percentile(50):.2f}초, "
+            f"p95 {self.latency_percentile(95):.2f}초, max {self.latency_percentile(100):.2f}초"
+        )
+
+
+async def run_cycle(
+    areas: List[str],
+    handler: Callable[[str], Awaitable[Any]],
+    concurrency: int,
+    area_timeout: float,
+    cycle_deadline: float,
+) -> CycleReport:
+    """
+    큐 기반 수집 스케줄러.
+    concurrency개의 워커가 큐에서 지역을 하나씩 꺼내 처리하고, 끝나는 즉시 다음 지역을 가져갑니다.
+    (배치 단위 gather와 달리 느린 지역 하나가 다른 슬롯을 붙잡지 않습니다.)
+    - area_timeout: 지역 하나에 허용되는 최대 처리 시간(초)
+    - cycle_deadline: 사이클 전체 마감 시간(초). 마감 이후에는 남은 지역을 시작하지 않습니다.
+    """
+    report = CycleReport(concurrency=concurrency)
+    queue: asyncio.Queue = asyncio.Queue()
+    for area_name in areas:
+        queue.put_nowait(area_name)
+
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+    deadline = started_at + cycle_deadline
+
+    async def worker():
+        while True:
+            try:
+                area_name = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                report.skipped.append(area_name)
+                continue
+
+            area_start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(handler(area_name), timeout=min(area_timeout, remaining))
+                report.results.append(AreaResult(area_name, "ok", time.perf_counter() - area_start, result=result))
+            except asyncio.TimeoutError:
+                print(f"[{area_name}] 데이터 수집 시간 초과")
+                report.results.append(AreaResult(area_name, "timeout", time.perf_counter() - area_start))
+            except Exception as e:
+                print(f"[{area_name}] 데이터 수집 중 오류 발생: {e}")
+                report.results.append(AreaResult(area_name, "error", time.perf_counter() - area_start, error=str(e)))
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(areas)))]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        # 사이클이 취소되면 진행 중인 워커도 함께 취소
+        for task in workers:
+            task.cancel()
+
+    report.makespan = loop.time() - started_at
+    return report
@@ -0,0 +1,220 @@
+import asyncio
+import os
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from src.data.database import AsyncSessionLocal
+from src.model.population import PopulationStation
+
+# 다른 프로세스(수집 워커, 다른 웹 워커)가 저장한 데이터를 반영하기 위한 주기적 갱신 설정
+SNAPSHOT_REFRESH_INTERVAL = float(os.getenv("SNAPSHOT_REFRESH_INTERVAL", "30"))  # 갱신 주기(초)
+SNAPSHOT_REFRESH_LOOKBACK = float(os.getenv("SNAPSHOT_REFRESH_LOOKBACK", "3600"))  # 가장 최신 데이터 기준 다시 읽을 범위(초)
+
+
+@dataclass(frozen=True)
+class PopulationSnapshot:
+    """지역별 최신 인구 데이터 한 건. PopulationStation과 같은 속성 이름을 사용합니다."""
+    datetime: datetime
+    region_id: str
+    male_rate: Optional[float] = None
+    female_rate: Optional[float] = None
+    area_congest: Optional[str] = None
+    congestion_message: Optional[str] = None
+    gen_10: Optional[float] = None
+    gen_20: Optional[float] = None
+    gen_30: Optional[float] = None
+    gen_40: Optional[float] = None
+    gen_50: Optional[float] = None
+    gen_60: Optional[float] = None
+    gen_70: Optional[float] = None
+    min_population: Optional[int] = None
+    max_population: Optional[int] = None
+
+    @classmethod
+    def from_row(cls, row: dict) -> "PopulationSnapshot":
+        return cls(**{name: row.get(name) for name in SNAPSHOT_FIELDS})
+
+    @classmethod
+    def from_record(cls, record: PopulationStation) -> "PopulationSnapshot":
+        return cls(**{name: getattr(record, name) for name in SNAPSHOT_FIELDS})
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in SNAPSHOT_FIELDS}
+
+
+SNAPSHOT_FIELDS = tuple(field.name for field in fields(PopulationSnapshot))
+
+
+def latest_records_query(region_ids: Optional[Iterable[str]] = None):
+    """
+    지역별 가장 최근 행을 한 번의 쿼리로 조회합니다. (region_id별 MAX(datetime)과 조인)
+    region_ids가 주어지면 해당 지역만 조회합니다.
+    """
+    latest = select(
+        PopulationStation.region_id,
+        func.max(PopulationStation.datetime).label("latest_datetime"),
+    )
+    if region_ids is not None:
+        latest = latest.where(PopulationStation.region_id.in_(list(region_ids)))
+    latest = latest.group_by(PopulationStation.region_id).subquery()
+    return select(PopulationStation).join(
+        latest,
+        (PopulationStation.region_id == latest.c.region_id)
+        & (PopulationStation.datetime == latest.c.latest_datetime),
+    )
+
+
+class LatestSnapshotStore:
+    """
+    프로세스 전역 최신 데이터 저장소 (region_id -> PopulationSnapshot).
+    - 시작 시 DB에서 지역별 최신 행으로 채우고(warm), 수집이 새 행을 저장하면 바로 반영(write-through)합니다.
+    - 조회는 DB 세션 없이 dict 조회 한 번으로 끝납니다.
+    """
+
+    def __init__(self):
+        self._snapshots: Dict[str, PopulationSnapshot] = {}
+        self._intervals: Dict[str, timedelta] = {}  # 지역별 마지막 갱신 간격 (다음 갱신 예상 시각 계산용)
+        self._listeners: List[Callable[[List[PopulationSnapshot]], None]] = []
+        self._row_listeners: List[Callable[[List[PopulationSnapshot]], None]] = []
+        self.warmed = False
+
+    def add_listener(self, listener: Callable[[List[PopulationSnapshot]], None]):
+        """스냅샷이 바뀔 때마다 바뀐 스냅샷 목록으로 호출할 함수를 등록합니다. (예: 실시간 스트림 발행)"""
+        self._listeners.append(listener)
+
+    def add_row_listener(self, listener: Callable[[List[PopulationSnapshot]], None]):
+        """
+        새로 저장된 행 전체(지역별 최신 한 건만이 아님)로 호출할 함수를 등록합니다. (예: 요일 x 시간대 프로필)
+        수집 write-through와 주기적 갱신(refresh)에서 읽은 행을 시간 순서로 넘기며, 같은 행이 다시 올 수 있습니다.
+        """
+        self._row_listeners.append(listener)
+
+    @staticmethod
+    def _call(listeners, snapshots: List[PopulationSnapshot]):
+        if not snapshots:
+            return
+        for listener in listeners:
+            try:
+                listener(snapshots)
+            except Exception as e:
+                print(f"최신 데이터 변경 알림 중 오류 발생: {e}")
+
+    def _notify(self, changed: List[PopulationSnapshot]):
+        self._call(self._listeners, changed)
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def get(self, region_id: str) -> Optional[PopulationSnapshot]:
+        return self._snapshots.get(region_id)
+
+    def get_many(self, region_ids: Iterable[str]) -> Dict[str, PopulationSnapshot]:
+        return {region_id: self._snapshots[region_id] for region_id in region_ids if region_id in self._snapshots}
+
+    def all(self) -> List[PopulationSnapshot]:
+        return list(self._snapshots.values())
+
+    @property
+    def newest_datetime(self) -> Optional[datetime]:
+        return max((snapshot.datetime for snapshot in self._snapshots.values()), default=None)
+
+    def put(self, snapshot: PopulationSnapshot) -> bool:
+        # 기존보다 최신인 경우에만 교체 (늦게 도착한 과거 데이터로 덮어쓰지 않음)
+        current = self._snapshots.get(snapshot.region_id)
+        if current is not None:
+            if _naive(current.datetime) >= _naive(snapshot.datetime):
+                return False
+            self._intervals[snapshot.region_id] = _naive(snapshot.datetime) - _naive(current.datetime)
+        self._snapshots[snapshot.region_id] = snapshot
+        return True
+
+    def expected_next_update(self, region_id: str, default_interval: timedelta) -> Optional[datetime]:
+        """마지막 데이터 시각 + 마지막 갱신 간격(모르면 default_interval). 데이터가 없으면 None."""
+        snapshot = self._snapshots.get(region_id)
+        if snapshot is None:
+            return None
+        return _naive(snapshot.datetime) + self._intervals.get(region_id, default_interval)
+
+    def update_many(self, rows: Iterable[dict]) -> List[PopulationSnapshot]:
+        """수집한 행(dict)을 반영하고, 실제로 바뀐 지역의 스냅샷 목록을 반환합니다."""
+        snapshots = [PopulationSnapshot.from_row(row) for row in rows]
+        self._call(self._row_listeners, snapshots)
+        return self._apply(snapshots)
+
+    def update_records(self, records: Iterable[PopulationStation]) -> List[PopulationSnapshot]:
+        return self._apply([PopulationSnapshot.from_record(record) for record in records])
+
+    def _apply(self, snapshots: List[PopulationSnapshot]) -> List[PopulationSnapshot]:
+        changed = {}
+        for snapshot in snapshots:
+            if self.put(snapshot):
+                changed[snapshot.region_id] = snapshot
+        self._notify(list(changed.values()))
+        return list(changed.values())
+
+    async def warm(self, session_factory=AsyncSessionLocal):
+        """DB에서 지역별 최신 행을 읽어 저장소를 채웁니다."""
+        async with session_factory() as db:
+            records = (await db.execute(latest_records_query())).scalars().all()
+        self.update_records(records)
+        self.warmed = True
+        print(f"최신 데이터 캐시 준비 완료: {len(self._snapshots)}개 지역")
+
+    async def refresh(self, session_factory=AsyncSessionLocal) -> List[PopulationSnapshot]:
+        """가장 최신 데이터 근처의 행만 다시 읽어 다른 프로세스가 저장한 데이터를 반영합니다."""
+        newest = self.newest_datetime
+        if newest is None:
+            await self.warm(session_factory)
+            return self.all()
+        since = newest - timedelta(seconds=SNAPSHOT_REFRESH_LOOKBACK)
+        async with session_factory() as db:
+            records = (await db.execute(
+                select(PopulationStation).where(PopulationStation.datetime > since).order_by(PopulationStation.datetime)
+            )).scalars().all()
+        snapshots = [PopulationSnapshot.from_record(record) for record in records]
+        self._call(self._row_listeners, snapshots)  # 다른 프로세스가 저장한 행 전체
+        return self._apply(snapshots)
+
+    async def run_refresh(self, interval: float = SNAPSHOT_REFRESH_INTERVAL, session_factory=AsyncSessionLocal):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh(session_factory)
+            except Exception as e:
+                print(f"최신 데이터 캐시 갱신 중 오류 발생: {e}")
+
+
+def _naive(value: datetime) -> datetime:
+    # DB 드라이버에 따라 tz 정보가 붙어 올 수 있으므로 비교할 때는 제거
+    return value.replace(tzinfo=None) if value.tzinfo else value
+
+
+# 프로세스 전역 저장소
+latest_snapshots = LatestSnapshotStore()
+
+
+async def get_latest_snapshot(db: AsyncSession, region_id: str) -> Optional[PopulationSnapshot]:
+    """
+    region_id의 최신 데이터를 반환합니다.
+    메모리에 있으면 DB를 조회하지 않고, 없을 때만 DB에서 읽어 저장소에 넣습니다. (캐시 준비 전 요청 대비)
+    """
+    snapshot = latest_snapshots.get(region_id)
+    if snapshot is not None:
+        return snapshot
+    result = await db.execute(
+        select(PopulationStation)
+        .where(PopulationStation.region_id == region_id)
+        .order_by(PopulationStation.datetime.desc())
+        .limit(1)
+    )
+    record = result.scalars().first()
+    if record is None:
+        return None
+    snapshot = PopulationSnapshot.from_record(record)
+    latest_snapshots.put(snapshot)
+    return snapshot
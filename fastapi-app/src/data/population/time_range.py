@@ -0,0 +1,82 @@
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import or_
+
+from src.data.population.poll_planner import KST
+from src.model.population import PopulationStation
+
+DEFAULT_WINDOW = timedelta(minutes=60)  # 범위를 지정하지 않았을 때 조회할 최근 시간
+MAX_DAYS = 31  # "같은 시간대 N일" 조회의 최대 일수
+
+
+def kst_now() -> datetime:
+    """현재 KST 시각 (tz 없음, 저장 형식과 같음). 서버 시간대(예: UTC 컨테이너)와 무관합니다."""
+    return datetime.now(KST).replace(tzinfo=None)
+
+
+def to_kst_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """요청 값에 시간대(예: +09:00, Z)가 있으면 저장 형식과 같은 KST(tz 없음)로 바꿉니다. (tz 없는 값과 비교 가능하도록)"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(KST).replace(tzinfo=None)
+
+
+def _parse_clock(value: str) -> time:
+    try:
+        return time.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"잘못된 시각 형식입니다: {value} (HH:MM 또는 HH:MM:SS)")
+
+
+def build_time_ranges(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    days: int = 1,
+    now: Optional[datetime] = None,
+) -> List[Tuple[datetime, datetime]]:
+    """
+    조회할 datetime 범위 목록을 만듭니다.
+    - start/end: 날짜를 포함한 명시적 범위 (한쪽만 주면 나머지는 최근 60분 기준으로 채움)
+    - start_time/end_time: 오늘(end의 날짜) 기준 시각 범위. days를 주면 최근 N일의 같은 시간대를 각각 범위로 만듦
+    - 아무것도 주지 않으면 현재 시각 기준 최근 60분
+    범위가 자정을 넘으면(start_time > end_time) 끝 시각을 다음 날로 처리합니다.
+    now를 생략하면 현재 KST 시각을 기준으로 합니다.
+    """
+    now = now or kst_now()
+    start, end = to_kst_naive(start), to_kst_naive(end)
+    if not 1 <= days <= MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"days는 1~{MAX_DAYS} 사이여야 합니다.")
+
+    if start_time is None and end_time is None:
+        end = end or now
+        start = start or end - DEFAULT_WINDOW
+        if start > end:
+            raise HTTPException(status_code=400, detail="start가 end보다 늦습니다.")
+        if days == 1:
+            return [(start, end)]
+        return [(start - timedelta(days=k), end - timedelta(days=k)) for k in range(days)]
+
+    # 시각(HH:MM:SS) 범위: 기준 날짜부터 과거 N일
+    base_day: date = (end or now).date()
+    end_clock = _parse_clock(end_time) if end_time else now.time()
+    start_clock = _parse_clock(start_time) if start_time else (datetime.combine(base_day, end_clock) - DEFAULT_WINDOW).time()
+    ranges = []
+    for k in range(days):
+        day = base_day - timedelta(days=k)
+        range_start = datetime.combine(day, start_clock)
+        range_end = datetime.combine(day, end_clock)
+        if range_end < range_start:
+            range_start -= timedelta(days=1)
+        ranges.append((range_start, range_end))
+    return ranges
+
+
+def datetime_in_ranges(ranges: List[Tuple[datetime, datetime]]):
+    """
+    datetime 컬럼을 함수로 감싸지 않는 범위 조건 (region_id, datetime 인덱스 범위 탐색 가능).
+    """
+    return or_(*[PopulationStation.datetime.between(range_start, range_end) for range_start, range_end in ranges])
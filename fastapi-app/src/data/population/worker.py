@@ -0,0 +1,46 @@
+"""
+수집 전용 워커 프로세스.
+웹 서버(main.py)와 별도로 실행하며, DB 임대로 배정받은 샤드의 지역만 수집합니다.
+여러 대를 띄우면 샤드가 나뉘어 분산 수집되고, 한 워커가 죽으면 임대 만료 후 다른 워커가 인수합니다.
+
+실행 (fastapi-app 디렉토리에서):
+    python -m src.data.population.worker
+
+웹 서버는 INGESTION_MODE=external 로 실행하여 내장 수집을 끕니다.
+"""
+import asyncio
+import signal
+
+from src.data.database import engine
+from src.data.population.background_task import background_task
+from src.data.population.citydata_client import create_http_client
+from src.data.population.citydata_parser import shutdown_parser_executor
+from src.data.population.lease import ShardLeaseManager
+
+
+async def main():
+    http_client = create_http_client()
+    leases = ShardLeaseManager()
+    print(f"수집 워커 시작: {leases.worker_id} (샤드 {leases.num_shards}개)")
+
+    task = asyncio.create_task(background_task(http_client, leases))
+
+    # SIGINT/SIGTERM 수신 시 수집 작업을 취소하고 임대를 반납한 뒤 종료
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, task.cancel)
+        except NotImplementedError:  # Windows
+            pass
+
+    try:
+        await task
+    finally:
+        await http_client.aclose()
+        shutdown_parser_executor()
+        await engine.dispose()
+        print("수집 워커 종료")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
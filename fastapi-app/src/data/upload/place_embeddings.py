@@ -0,0 +1,221 @@
+"""
+이미지 추천용 관광지 설명 텍스트의 CLIP 임베딩.
+
+설명 목록은 고정이므로 텍스트 임베딩을 요청마다 계산하지 않고 한 번만 계산해 L2 정규화한 뒤 .npy 파일로 저장합니다.
+파일 이름은 모델 파일(체크포인트, 설정, 토크나이저)과 설명 목록의 해시이므로, 둘 중 하나가 바뀔 때만 다시 계산합니다.
+시작 시 파일을 메모리 매핑(mmap_mode="r")으로 읽고, 추천은 이미지 벡터와의 내적(= 코사인 유사도) 한 번으로 끝납니다.
+"""
+import glob
+import hashlib
+import os
+from typing import Callable, Sequence
+
+import numpy as np
+
+# 관광지 설명 (place_name_mapping의 키와 같은 문장)
+PLACE_DESCRIPTIONS = (
+    "Gangnam MICE Special Tourist Zone, a modern business and convention district in Seoul, featuring COEX, luxury shopping malls, and vibrant nightlife",
+    "Dongdaemun Fashion Town Special Tourist Zone, a global fashion hub in Seoul, home to DDP, 24-hour shopping malls, and street markets with the latest trends",
+    "Myeong-dong Namdaemun Bukchang-dong Da-dong Mugyo-dong Special Tourist Zone, a major shopping district in Seoul, famous for beauty stores, street food, and Namdaemun Market",
+    "Itaewon Special Tourist Zone, a multicultural hotspot in Seoul, known for international restaurants, foreign-friendly shops, and a diverse nightlife scene",
+    "Jamsil Special Tourist Zone, a family-friendly entertainment district in Seoul, featuring Lotte World Theme Park, Lotte Tower, and Seokchon Lake",
+    "Jongno Cheonggye Special Tourist Zone, a historical and cultural area in Seoul, featuring traditional markets, Cheonggyecheon Stream, and heritage sites",
+    "HongDae Culture & Arts Special Tourist Zone, a youthful and artistic district in Seoul, known for indie music, street performances, and trendy fashion stores",
+    "Gyeongbokgung Palace, the largest and most iconic Joseon-era palace in Seoul, featuring traditional Korean architecture and the Royal Guard Changing Ceremony",
+    "Gwanghwamun & Deoksugung Palace, a historical area in Seoul, featuring Gwanghwamun Square, Deoksugung Palace, and the Changing of the Royal Guard",
+    "Bosingak, a historic bell pavilion in Seoul, famous for its New Year's Eve bell-ringing ceremony",
+    "Amsa Prehistoric Settlement Site, an ancient archaeological site in Seoul, showcasing Neolithic artifacts and pit houses",
+    "Changdeokgung Palace & Jongmyo Shrine, a UNESCO World Heritage site in Seoul, featuring a beautifully preserved Joseon-era palace and a royal ancestral shrine",
+    "Gasan Digital Complex Station, a major transportation hub in Seoul, located near tech business districts and outlet shopping malls",
+    "Gangnam Station, a bustling commercial and nightlife area in Seoul, known for shopping streets, restaurants, and entertainment venues",
+    "Konkuk University Station, a lively district in Seoul, featuring Star City Mall, Ttukseom Hangang Park, and vibrant student culture",
+    "Godeok Station, a gateway to the residential district of Godeok in Seoul, with nearby parks and modern urban developments",
+    "Express Bus Terminal Station, a major transit hub in Seoul, connected to shopping malls, express bus services, and underground markets",
+    "Seoul National University of Education Station, a transit point in Seoul, near educational institutions and business districts",
+    "Guro Digital Complex Station, a key transportation hub in Seoul, located in a major IT and tech business district",
+    "Guro Station, a major transit hub in Seoul, located near shopping areas and the Guro Industrial Complex",
+    "Gunja Station, a key transfer station in Seoul, providing access to nearby residential and commercial districts",
+    "Namguro Station, a local transit point in Seoul, serving the Guro district and surrounding neighborhoods",
+    "Daerim Station, a bustling area in Seoul, known for its vibrant Chinese-Korean community and authentic cuisine",
+    "Dongdaemun Station, a gateway to Dongdaemun Market in Seoul, surrounded by fashion malls and historical landmarks",
+    "Ttukseom Station, an access point to Ttukseom Hangang Park in Seoul, popular for outdoor activities and cultural events",
+    "Miasageori Station, a transit station in northern Seoul, providing access to shopping centers and residential areas",
+    "Balsan Station, a transport hub in western Seoul, located near Magok Industrial Complex and local business districts",
+    "Bukhansan Ui Station, a starting point for hiking trails in Bukhansan National Park, offering scenic mountain views",
+    "Sadang Station, a busy transfer station in Seoul, connecting commuters to southern districts and major transit lines",
+    "Samgakji Station, a historical transit point in Seoul, located near the War Memorial of Korea and Yongsan district",
+    "Seoul National University Station, the main access point to Seoul National University, surrounded by student-friendly shops and cafes",
+    "Seoul Botanic Park·Magongnaru Station, a gateway to Seoul Botanic Park, featuring themed greenhouses and ecological gardens",
+    "Seoul Station, a major transportation hub in Seoul, connecting KTX, subways, and an extensive shopping and business district",
+    "Seolleung Station, a historical and business area in Seoul, home to Seolleung and Jeongneung Royal Tombs, a UNESCO World Heritage site",
+    "Sungshin Women's University Station, a lively student district in Seoul, featuring shopping streets, cafes, and a vibrant university atmosphere",
+    "Suyu Station, a transit station in northern Seoul, located near traditional markets and hiking trails leading to Bukhansan National Park",
+    "Sinnonhyeon·Nonhyeon Station, a bustling commercial district in Seoul, known for nightlife, restaurants, and modern entertainment venues",
+    "Sindorim Station, a key transfer station in Seoul, connecting subway lines and adjacent to D-Cube City shopping mall and cultural spaces",
+    "Sillim Station, a busy commercial and residential area in Seoul, known for its dynamic food scene and startup-friendly business environment",
+    "Sinchon·Ewha Womans University Station, a youthful district in Seoul, famous for Ewha Womans University, Sinchon shopping streets, and student culture",
+    "Yangjae Station, a business and tech hub in Seoul, close to Yangjae Citizen’s Forest and major corporate offices",
+    "Yeoksam Station, a central business district in Seoul, home to major IT companies, co-working spaces, and premium dining options",
+    "Yeonsinnae Station, a suburban area in northern Seoul, offering access to Dobongsan and Bukhansan hiking trails",
+    "Omokgyo·Mok-dong Stadium Station, a family-friendly area in Seoul, featuring Mok-dong Ice Rink, sports facilities, and shopping centers",
+    "Wangsimni Station, a major transit hub in Seoul, connected to Wangsimni Square, shopping complexes, and cultural attractions",
+    "Yongsan Station, a key railway and KTX station in Seoul, home to Yongsan Electronics Market and large shopping complexes",
+    "Itaewon Station, the heart of Itaewon, known for its multicultural restaurants, nightlife, and vibrant expat community",
+    "Jangji Station, a residential district in southeastern Seoul, offering convenient access to shopping centers and local parks",
+    "Janghanpyeong Station, an area in eastern Seoul known for its used car market and proximity to Cheonggyecheon Stream",
+    "Cheonho Station, a busy commercial district in Seoul, located near department stores, entertainment venues, and Han River parks",
+    "Chongshin University(Isu) Station, a busy transfer station in Seoul, located near Chongshin University and local dining areas",
+    "Chungjeongno Station, a historical and business district in Seoul, providing access to cultural sites and government buildings",
+    "Hapjeong Station, a vibrant area in Seoul, known for trendy cafes, indie music venues, and access to Hongdae and Mangwon districts",
+    "Hyehwa Station, a cultural hotspot in Seoul, famous for Daehangno, small theaters, and street performances",
+    "Hongik University Station(Line 2), the gateway to Hongdae, Seoul’s youthful hub for art, nightlife, and indie music culture",
+    "Hoegi Station, a student-friendly area in Seoul, located near Kyung Hee University and traditional food markets",
+    "4·19 Cafe Street, a charming street in northern Seoul, lined with cafes and offering scenic views of Bukhansan Mountain",
+    "Garak Market, one of Seoul’s largest wholesale food markets, known for fresh seafood, meat, and produce",
+    "Garosu-gil, a trendy street in Seoul’s Gangnam district, famous for boutique shops, stylish cafes, and art galleries",
+    "Gwangjang(Traditional) Market, one of Seoul’s oldest markets, offering authentic Korean street food like bindaetteok and gimbap",
+    "Gimpo Airport, a major airport in Seoul serving domestic and international flights, connected to the city’s subway network",
+    "Naksan Park·Ihwa Village, a scenic area in Seoul featuring old city walls, street art, and panoramic night views",
+    "Noryangjin, a famous seafood market district in Seoul, known for its fresh fish auctions and raw seafood restaurants",
+    "Deoksugung-gil·Jeongdong-gil, a historic walking street in Seoul, lined with royal palaces, museums, and European-style architecture",
+    "Bangbae Food Alley, a hidden gem in Seoul’s Bangbae district, offering a variety of local Korean restaurants and street food",
+    "Bukchon Hanok Village, a picturesque neighborhood in Seoul, preserving traditional Korean hanok houses and cultural heritage",
+    "Seochon, a historic and artistic district in Seoul, located near Gyeongbokgung Palace and known for its traditional cafes and shops",
+    "Seongsu Cafe Street, a hipster-friendly area in Seoul, featuring industrial-style cafes, artisan bakeries, and creative spaces",
+    "Suyuri Food Alley, a local food district in northern Seoul, famous for its affordable Korean barbecue and traditional dishes",
+    "Ssangmun-dong Restaurant Street, a hidden gem in northern Seoul, known for its diverse local eateries and traditional Korean dishes",
+    "Apgujeong Rodeo Street, a luxury shopping district in Seoul, featuring high-end fashion brands, stylish cafes, and entertainment venues",
+    "Yeouido, Seoul’s financial district, home to major banks, skyscrapers, and the scenic Yeouido Hangang Park",
+    "Yeonnam-dong, a trendy neighborhood in Seoul, famous for its artistic vibe, indie cafes, and Gyeongui Line Forest Park",
+    "Yeongdeungpo Time Square, a major shopping and entertainment complex in Seoul, offering luxury stores, cinemas, and fine dining",
+    "Hankuk University of Foreign Studies, a global education hub in Seoul, surrounded by international restaurants and student-friendly cafes",
+    "Yongnidan-gil, a rising hotspot in Seoul’s Yongsan district, known for its unique fusion restaurants, small bars, and trendy cafes",
+    "Itaewon Antiques Street, a charming area in Seoul, featuring vintage furniture shops, unique collectibles, and a historic international atmosphere",
+    "Insa-dong, a cultural and artistic district in Seoul, famous for traditional Korean tea houses, art galleries, and souvenir shops",
+    "Changdong New Economic Center, a developing business hub in northern Seoul, focusing on tech startups and cultural innovation",
+    "Cheongdam-dong Luxury Fashion Street, a high-end shopping district in Seoul, home to global designer boutiques and flagship stores",
+    "Traditional Market in Cheongnyangni Jegi-dong, a bustling market in Seoul, offering fresh produce, herbal medicine, and street food",
+    "Haebangchon·Gyeongnidan-gil, a multicultural neighborhood in Seoul, known for international cuisine, indie cafes, and a vibrant expat community",
+    "DDP (Dongdaemun Design Plaza), an iconic modern landmark in Seoul, hosting exhibitions, fashion events, and futuristic architecture",
+    "DMC (Digital Media City), a high-tech business district in Seoul, featuring media companies, futuristic buildings, and digital innovation centers",
+    "Gangseo Hangang Park, a riverside park in western Seoul, popular for cycling, picnics, and scenic sunset views along the Han River",
+    "Gocheok Dome, South Korea’s first domed baseball stadium, hosting major sports events, concerts, and KBO League games",
+    "Gwangnaru Hangang Park, a nature-friendly park along the Han River, offering watersports, bike trails, and eco-friendly landscapes",
+    "Gwanghwamun Square, a historic plaza in central Seoul, featuring statues of King Sejong and Admiral Yi Sun-sin, with cultural landmarks nearby",
+    "The National Museum of Korea·Yongsan Family Park, a major museum in Seoul showcasing Korea’s rich history, located next to a peaceful urban park",
+    "Nanji Hangang Park, an eco-friendly riverside park in Seoul, known for its vast camping sites, bike trails, and music festivals",
+    "Namsan Park, a scenic urban park in central Seoul, home to N Seoul Tower and offering panoramic views of the city",
+    "Nodeul Island, a cultural and arts space on the Han River, featuring music performances, cafes, and creative studios",
+    "Ttukseom Hangang Park, a vibrant riverside park in Seoul, popular for water sports, picnics, and seasonal festivals",
+    "Mangwon Hangang Park, a local favorite for cycling, jogging, and enjoying peaceful riverside landscapes in western Seoul",
+    "Banpo Hangang Park, famous for the Banpo Rainbow Fountain and scenic night views of Seoul's skyline along the Han River",
+    "Dream Forest, one of the largest parks in northern Seoul, featuring walking trails, an observatory, and cultural spaces",
+    "Bulgwangcheon River, a picturesque urban stream in Seoul, lined with walking paths, bike lanes, and cherry blossoms in spring",
+    "Seoripul Park·Montmartre Park, a pair of serene parks in Seoul, offering scenic walking trails and a Parisian-inspired atmosphere",
+    "Seoul Plaza, a central gathering space in front of City Hall, hosting seasonal events, ice skating, and public performances",
+    "Seoul Grand Park, a massive recreational complex in Gwacheon, featuring a zoo, botanical garden, and amusement park",
+    "Seoul Forest, a large eco-friendly park in Seoul, offering deer feeding, bike trails, and scenic picnic spots",
+    "Achasan, a small but scenic mountain in eastern Seoul, popular for sunrise hikes and panoramic city views",
+    "Yanghwa Hangang Park, a peaceful riverside park in western Seoul, known for its flower gardens and riverside walking paths",
+    "Children's Grand Park, a family-friendly park in Seoul with a zoo, botanical garden, and playgrounds",
+    "Yeouido Hangang Park, a popular riverside park in Seoul, famous for cherry blossom festivals and stunning sunset views",
+    "World Cup Park, an eco-park in western Seoul, created on a former landfill site, featuring Haneul Park and migratory bird habitats",
+    "Eungbongsan, a small mountain in Seoul, known for its fortress ruins and stunning views of the Han River",
+    "Ichon Hangang Park, a tranquil riverside park in Seoul, featuring open green spaces, bike paths, and cultural sculptures",
+    "Jamsil (Seoul) Sports Complex, a major sports venue in Seoul, hosting international events, concerts, and baseball games",
+    "Jamsil Hangang Park, a scenic riverside park in eastern Seoul, offering waterfront leisure facilities and sports grounds",
+    "Jamwon Hangang Park, a peaceful section of the Han River parks, popular for yoga, jogging, and riverside relaxation",
+    "Cheonggyesan, a natural mountain near Seoul, known for its well-maintained hiking trails and lush forests",
+    "Cheongwadae, the former presidential residence of South Korea, now open to the public for cultural tours and historical exhibitions",
+    "Bukchang-dong Food Alley, a hidden gem in Seoul’s business district, famous for traditional Korean BBQ and seafood restaurants",
+    "Namdaemun Market, Korea’s largest traditional market, offering street food, souvenirs, and wholesale goods",
+    "Ikseon-dong, a charming neighborhood in Seoul, featuring narrow alleys lined with hanok-style cafes, boutique shops, and restaurants",
+)
+
+PLACE_EMBEDDINGS_DIR = os.getenv("PLACE_EMBEDDINGS_DIR", "./src/clip_model")  # 모델과 같은 폴더에 저장
+PLACE_EMBEDDINGS_PREFIX = "place_embeddings_"
+FINGERPRINT_READ_BYTES = 1024 * 1024  # 모델 파일 해시 시 한 번에 읽는 크기
+
+
+def clip_model_fingerprint(model_dir: str) -> bytes:
+    """
+    모델 폴더의 파일(체크포인트, 설정, 토크나이저) 이름과 내용의 해시.
+    같은 설정으로 다시 학습/변환한 체크포인트도 구분하며, 이 폴더에 함께 저장하는 임베딩 파일은 제외합니다.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    for root, dirs, files in os.walk(model_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.startswith(PLACE_EMBEDDINGS_PREFIX):
+                continue
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, model_dir).encode("utf-8") + b"\0")
+            with open(path, "rb") as f:
+                while chunk := f.read(FINGERPRINT_READ_BYTES):
+                    digest.update(chunk)
+    return digest.digest()
+
+
+def embeddings_key(model_fingerprint: bytes, descriptions: Sequence[str] = PLACE_DESCRIPTIONS) -> str:
+    """모델 식별 값과 설명 목록(순서 포함)의 해시"""
+    digest = hashlib.sha256(model_fingerprint)
+    for description in descriptions:
+        digest.update(b"\0" + description.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def embeddings_path(key: str, directory: str = PLACE_EMBEDDINGS_DIR) -> str:
+    return os.path.join(directory, f"{PLACE_EMBEDDINGS_PREFIX}{key}.npy")
+
+
+def l2_normalize(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def load_or_build(
+    model_fingerprint: bytes,
+    encode: Callable[[Sequence[str]], np.ndarray],
+    descriptions: Sequence[str] = PLACE_DESCRIPTIONS,
+    directory: str = PLACE_EMBEDDINGS_DIR,
+) -> np.ndarray:
+    """
+    저장된 임베딩을 메모리 매핑으로 읽습니다. 해시가 같은 파일이 없으면 encode(descriptions)로 계산해 저장합니다.
+    임시 파일에 쓴 뒤 교체하므로 여러 워커가 동시에 시작해도 읽는 쪽은 완성된 파일만 봅니다.
+    """
+    path = embeddings_path(embeddings_key(model_fingerprint, descriptions), directory)
+    if os.path.exists(path):
+        embeddings = np.load(path, mmap_mode="r")
+        if embeddings.shape[0] == len(descriptions):
+            print(f"관광지 임베딩을 불러옵니다: {path}")
+            return embeddings
+
+    print("관광지 임베딩을 계산합니다...")
+    embeddings = l2_normalize(encode(list(descriptions)))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, embeddings)
+    os.replace(tmp_path, path)
+
+    # 이전 모델/설명 목록의 파일 정리. 배포 중에는 다른 워커가 더 새 모델의 파일을 먼저 썼을 수 있으므로
+    # 이번 파일보다 오래된 것만 지우고, 다른 워커가 먼저 지운 파일은 건너뜀
+    current_mtime = os.path.getmtime(path)
+    for old_path in glob.glob(os.path.join(directory, f"{PLACE_EMBEDDINGS_PREFIX}*.npy")):
+        if old_path == path:
+            continue
+        try:
+            if os.path.getmtime(old_path) < current_mtime:
+                os.remove(old_path)
+        except FileNotFoundError:
+            pass
+    print(f"관광지 임베딩 저장 완료: {path}")
+    return np.load(path, mmap_mode="r")
+
+
+def rank_places(image_features, embeddings: np.ndarray) -> np.ndarray:
+    """이미지 벡터와 유사도가 높은 순서의 관광지 인덱스 (정규화한 벡터의 내적 = 코사인 유사도)"""
+    image_vector = l2_normalize(image_features).reshape(-1)
+    similarities = embeddings @ image_vector
+    return np.argsort(similarities)[::-1]
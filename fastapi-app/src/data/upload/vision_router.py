@@ -13,6 +13,7 @@ from fastapi.responses import JSONResponse
 
 from src.data.database import get_db
 from src.model.population import PopulationStation, Place
+from src.data.population.snapshot_cache import get_latest_snapshot
 from src.schema.population.population_schema import AgeGroupPopulationResponse, GenderPopulationResponse, PopulationRequest, PopulationResponse
 
 from langchain_openai import AzureChatOpenAI
@@ -166,15 +167,8 @@ async def get_gpt_response(
         if not region_id:
             raise HTTPException(status_code=400, detail="region_id가 제공되지 않았습니다.")
 
-        # 1. PopulationStation 데이터 가져오기 (가장 최근 1개 레코드)
-        query = (
-            select(PopulationStation)
-            .where(PopulationStation.region_id == region_id)
-            .order_by(PopulationStation.datetime.desc())
-            .limit(1)
-        )
-        result = await db.execute(query)
-        record = result.scalars().first()
+        # 1. PopulationStation 데이터 가져오기 (가장 최근 1개 레코드, 최신 데이터 캐시에서 조회)
+        record = await get_latest_snapshot(db, region_id)
 
         if not record:
             raise HTTPException(status_code=404, detail="해당 region_id의 PopulationStation 데이터를 찾을 수 없습니다.")
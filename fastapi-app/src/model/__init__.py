@@ -1,5 +1,5 @@
 from src.data.database import Base
-from src.model import model, population
+from src.model import model, population, population_rollup, ingestion
 
 # 모든 모델이 임포트되었으므로 Base.metadata에 모두 등록됨
 target_metadata = Base.metadata
@@ -0,0 +1,68 @@
+from sqlalchemy import Float, Integer, SmallInteger, type_coerce
+from sqlalchemy.types import TypeDecorator
+
+# 혼잡도 단계 -> 저장 코드 (SMALLINT)
+CONGEST_LEVEL_CODES = {"여유": 1, "보통": 2, "약간 붐빔": 3, "붐빔": 4}
+CONGEST_LEVEL_NAMES = {code: level for level, code in CONGEST_LEVEL_CODES.items()}
+
+
+class ScaledRate(TypeDecorator):
+    """
+    비율(%)을 scale배 한 정수로 저장합니다. (FLOAT/DOUBLE 대신 SMALLINT 2바이트)
+    citydata의 비율은 소수 첫째 자리까지이므로 scale=10이면 읽을 때 같은 값이 복원됩니다.
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, scale: int = 10):
+        super().__init__()
+        self.scale = scale
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int(round(float(value) * self.scale))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return value / self.scale
+
+
+class ScaledCount(ScaledRate):
+    """
+    파생 인구 수(비율 * 인구 / 100)를 scale배 한 정수로 저장합니다. (INTEGER 4바이트)
+    비율이 소수 첫째 자리까지이므로 값은 소수 셋째 자리까지이고, scale=1000이면 읽을 때 같은 값이 복원됩니다.
+    """
+    impl = Integer
+    cache_ok = True
+
+    def __init__(self, scale: int = 1000):
+        super().__init__(scale)
+
+
+def unscaled(column):
+    """
+    ScaledRate 컬럼을 SQL 안에서 원래 비율로 되돌리는 식. (AVG/MIN/MAX 같은 집계를 DB에서 계산할 때 사용)
+    정수 나눗셈이 되지 않도록 실수로 나눕니다.
+    """
+    return type_coerce(column, Float) / float(column.type.scale)
+
+
+class CongestionLevel(TypeDecorator):
+    """혼잡도 단계("여유" ~ "붐빔")를 SMALLINT 코드로 저장합니다. 알 수 없는 단계는 로그를 남기고 NULL로 저장합니다."""
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        code = CONGEST_LEVEL_CODES.get(value)
+        if code is None:
+            print(f"알 수 없는 혼잡도 단계는 NULL로 저장합니다: {value!r}")
+        return code
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return CONGEST_LEVEL_NAMES.get(value)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from src.data.database import Base
+
+
+class IngestionWorker(Base):
+    """수집 워커의 생존 신호(heartbeat). 살아있는 워커 수로 워커당 담당 샤드 수를 정합니다."""
+    __tablename__ = 'ingestion_worker'
+
+    worker_id = Column(String(64), primary_key=True)
+    hostname = Column(String(255), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=False, index=True)  # UTC
+
+
+class IngestionLease(Base):
+    """AREA_NM_LIST 샤드별 담당 워커 임대(lease). expires_at이 지나면 다른 워커가 가져갈 수 있습니다."""
+    __tablename__ = 'ingestion_lease'
+
+    shard_id = Column(Integer, primary_key=True, autoincrement=False)
+    owner_id = Column(String(64), nullable=True)
+    expires_at = Column(DateTime, nullable=True)  # UTC
+
+    def __repr__(self):
+        return f"<IngestionLease(shard_id={self.shard_id}, owner_id={self.owner_id}, expires_at={self.expires_at})>"
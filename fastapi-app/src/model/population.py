@@ -1,33 +1,93 @@
-from sqlalchemy import Column, Integer, Float, String, DateTime
+from sqlalchemy import Column, Integer, SmallInteger, String, DateTime, Index
+from sqlalchemy.orm import foreign, relationship
 from src.data.database import Base
+from src.model.column_types import CongestionLevel, ScaledCount, ScaledRate
+
+
+class CongestionMessage(Base):
+    """혼잡도 메시지 목록. 반복되는 메시지를 population 행마다 저장하지 않고 id로 참조합니다."""
+    __tablename__ = 'congestion_message'
+
+    id = Column(Integer, primary_key=True)
+    message = Column(String(255), nullable=False, unique=True)
 
-from sqlalchemy import Column, Integer, Float, String, DateTime
 
 class PopulationStation(Base):
     __tablename__ = 'population'
     
     datetime = Column(DateTime(timezone=True), primary_key=True, nullable=False, index=True)  
     region_id = Column(String(255), primary_key=True, nullable=False)              
-    male_rate = Column(Float, nullable=True)                 
-    female_rate = Column(Float, nullable=True)               
-    area_congest = Column(String(255), nullable=True)      
-    congestion_message = Column(String(255), nullable=True)
-    gen_10 = Column(Float, nullable=True)
-    gen_20 = Column(Float, nullable=True) 
-    gen_30 = Column(Float, nullable=True) 
-    gen_40 = Column(Float, nullable=True) 
-    gen_50 = Column(Float, nullable=True)  
-    gen_60 = Column(Float, nullable=True)       
-    gen_70 = Column(Float, nullable=True) 
+    # 비율은 10배 한 SMALLINT, 혼잡도 단계는 SMALLINT 코드로 저장 (읽을 때는 기존과 같은 float / 문자열)
+    male_rate = Column(ScaledRate(), nullable=True)                 
+    female_rate = Column(ScaledRate(), nullable=True)               
+    area_congest = Column(CongestionLevel(), nullable=True)      
+    # MySQL 파티션 테이블은 외래 키를 지원하지 않으므로 제약 없이 id만 저장
+    congestion_message_id = Column(SmallInteger, nullable=True)
+    gen_10 = Column(ScaledRate(), nullable=True)
+    gen_20 = Column(ScaledRate(), nullable=True) 
+    gen_30 = Column(ScaledRate(), nullable=True) 
+    gen_40 = Column(ScaledRate(), nullable=True) 
+    gen_50 = Column(ScaledRate(), nullable=True)  
+    gen_60 = Column(ScaledRate(), nullable=True)       
+    gen_70 = Column(ScaledRate(), nullable=True) 
     min_population = Column(Integer, nullable=True)           
     max_population = Column(Integer, nullable=True)           
 
+    # 파생 인구 수 (비율 * 인구 / 100). 수집 시 한 번 계산하여 1000배 한 INTEGER로 저장 (derived_counts.DERIVED_COUNTS)
+    male_min_population = Column(ScaledCount(), nullable=True)
+    male_max_population = Column(ScaledCount(), nullable=True)
+    female_min_population = Column(ScaledCount(), nullable=True)
+    female_max_population = Column(ScaledCount(), nullable=True)
+    gen_10_min = Column(ScaledCount(), nullable=True)
+    gen_10_max = Column(ScaledCount(), nullable=True)
+    gen_20_min = Column(ScaledCount(), nullable=True)
+    gen_20_max = Column(ScaledCount(), nullable=True)
+    gen_30_min = Column(ScaledCount(), nullable=True)
+    gen_30_max = Column(ScaledCount(), nullable=True)
+    gen_40_min = Column(ScaledCount(), nullable=True)
+    gen_40_max = Column(ScaledCount(), nullable=True)
+    gen_50_min = Column(ScaledCount(), nullable=True)
+    gen_50_max = Column(ScaledCount(), nullable=True)
+    gen_60_min = Column(ScaledCount(), nullable=True)
+    gen_60_max = Column(ScaledCount(), nullable=True)
+    gen_70_min = Column(ScaledCount(), nullable=True)
+    gen_70_max = Column(ScaledCount(), nullable=True)
+
+    # 혼잡도 메시지. 행(객체)을 읽을 때 같은 쿼리에서 LEFT JOIN으로 함께 읽음 (행마다 서브쿼리를 실행하지 않음)
+    message_ref = relationship(
+        CongestionMessage,
+        primaryjoin=lambda: foreign(PopulationStation.congestion_message_id) == CongestionMessage.id,
+        lazy="joined",
+        viewonly=True,
+    )
+
+    @property
+    def congestion_message(self):
+        # 조회 API는 기존처럼 congestion_message 문자열을 읽음
+        return self.message_ref.message if self.message_ref is not None else None
+
     def __repr__(self):
         return (
             f"<PopulationStation(datetime={self.datetime}, region_id={self.region_id}, "
             f"male_rate={self.male_rate}, female_rate={self.female_rate}, "
             f"min_population={self.min_population}, max_population={self.max_population})>"
         )
+
+# 컬럼 조회(select(*columns))에서 congestion_message를 읽을 때 쓰는 컬럼. join_congestion_message()로 조인한 쿼리에서 사용
+CONGESTION_MESSAGE_COLUMN = CongestionMessage.message.label("congestion_message")
+
+
+def population_columns(names):
+    """이름 목록 -> 조회할 컬럼. congestion_message는 congestion_message 테이블의 메시지입니다."""
+    return tuple(CONGESTION_MESSAGE_COLUMN if name == "congestion_message" else getattr(PopulationStation, name) for name in names)
+
+
+def join_congestion_message(query):
+    """population_columns()로 만든 컬럼 조회에 혼잡도 메시지 테이블을 조인합니다. (LEFT JOIN, 메시지 id 기본 키 조회)"""
+    return query.outerjoin(CongestionMessage, CongestionMessage.id == PopulationStation.congestion_message_id)
+
+# 지역별 조회(최신순 페이징, 시간 범위 조회)용 인덱스. 기본 키는 (datetime, region_id) 순서라 지역별 범위 탐색에 쓸 수 없음
+Index('ix_population_region_datetime', PopulationStation.region_id, PopulationStation.datetime.desc())
           
 class Place(Base):
     __tablename__ = "places"
@@ -0,0 +1,66 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime
+from src.data.database import Base
+
+
+class PopulationRollupMixin:
+    """
+    population 테이블의 시간/일 단위 집계 컬럼. (src.data.population.rollup.ROLLUP_MEASURES, CONGEST_LEVELS)
+    값마다 구간 내 최소/평균/최대를, 혼잡도는 단계별 샘플 수를 저장합니다. (비율 = 단계별 샘플 수 / samples)
+    """
+    # 기본 키는 (region_id, bucket) 순서: 지역별 기간 조회가 기본 키 범위 탐색 한 번으로 끝남
+    region_id = Column(String(255), primary_key=True, nullable=False)
+    bucket = Column(DateTime(timezone=True), primary_key=True, nullable=False)  # 구간 시작 시각 (KST)
+    samples = Column(Integer, nullable=False)  # 구간에 포함된 원본 행 수
+
+    min_population_min = Column(Float, nullable=True)
+    min_population_avg = Column(Float, nullable=True)
+    min_population_max = Column(Float, nullable=True)
+    max_population_min = Column(Float, nullable=True)
+    max_population_avg = Column(Float, nullable=True)
+    max_population_max = Column(Float, nullable=True)
+    male_rate_min = Column(Float, nullable=True)
+    male_rate_avg = Column(Float, nullable=True)
+    male_rate_max = Column(Float, nullable=True)
+    female_rate_min = Column(Float, nullable=True)
+    female_rate_avg = Column(Float, nullable=True)
+    female_rate_max = Column(Float, nullable=True)
+    gen_10_min = Column(Float, nullable=True)
+    gen_10_avg = Column(Float, nullable=True)
+    gen_10_max = Column(Float, nullable=True)
+    gen_20_min = Column(Float, nullable=True)
+    gen_20_avg = Column(Float, nullable=True)
+    gen_20_max = Column(Float, nullable=True)
+    gen_30_min = Column(Float, nullable=True)
+    gen_30_avg = Column(Float, nullable=True)
+    gen_30_max = Column(Float, nullable=True)
+    gen_40_min = Column(Float, nullable=True)
+    gen_40_avg = Column(Float, nullable=True)
+    gen_40_max = Column(Float, nullable=True)
+    gen_50_min = Column(Float, nullable=True)
+    gen_50_avg = Column(Float, nullable=True)
+    gen_50_max = Column(Float, nullable=True)
+    gen_60_min = Column(Float, nullable=True)
+    gen_60_avg = Column(Float, nullable=True)
+    gen_60_max = Column(Float, nullable=True)
+    gen_70_min = Column(Float, nullable=True)
+    gen_70_avg = Column(Float, nullable=True)
+    gen_70_max = Column(Float, nullable=True)
+
+    # 혼잡도(area_congest) 단계별 샘플 수
+    congest_relaxed = Column(Integer, nullable=False, default=0)  # 여유
+    congest_normal = Column(Integer, nullable=False, default=0)  # 보통
+    congest_slightly_busy = Column(Integer, nullable=False, default=0)  # 약간 붐빔
+    congest_busy = Column(Integer, nullable=False, default=0)  # 붐빔
+
+    def __repr__(self):
+        return f"<{type(self).__name__}(bucket={self.bucket}, region_id={self.region_id}, samples={self.samples})>"
+
+
+class PopulationHourly(PopulationRollupMixin, Base):
+    """시간 단위 집계. 수집 사이클마다 새 행이 들어간 시간 구간을 다시 계산합니다."""
+    __tablename__ = 'population_hourly'
+
+
+class PopulationDaily(PopulationRollupMixin, Base):
+    """일 단위 집계. population_hourly에서 다시 계산합니다."""
+    __tablename__ = 'population_daily'
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 class PopulationBase(BaseModel):
@@ -56,4 +56,36 @@ class AgeGroupPopulationResponse(BaseModel):
     
     class Config:
         from_attributes = True
-        populate_by_name = True
\ No newline at end of file
+        populate_by_name = True
+
+class PopulationBreakdownRow(BaseModel):
+    datetime: datetime
+    male_min_population: Optional[float] = None
+    male_max_population: Optional[float] = None
+    female_min_population: Optional[float] = None
+    female_max_population: Optional[float] = None
+    gen_10_min: Optional[float] = None
+    gen_10_max: Optional[float] = None
+    gen_20_min: Optional[float] = None
+    gen_20_max: Optional[float] = None
+    gen_30_min: Optional[float] = None
+    gen_30_max: Optional[float] = None
+    gen_40_min: Optional[float] = None
+    gen_40_max: Optional[float] = None
+    gen_50_min: Optional[float] = None
+    gen_50_max: Optional[float] = None
+    gen_60_min: Optional[float] = None
+    gen_60_max: Optional[float] = None
+    gen_70_min: Optional[float] = None
+    gen_70_max: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+        populate_by_name = True
+
+
+class PopulationBreakdownResponse(BaseModel):
+    region_id: str
+    layout: str  # "rows" 또는 "columnar"
+    rows: Optional[List[PopulationBreakdownRow]] = None  # layout=rows
+    columns: Optional[Dict[str, List[Any]]] = None  # layout=columnar: 컬럼 이름 -> 값 배열 (datetime 포함)
@@ -0,0 +1,42 @@
+import os
+import tempfile
+import time
+
+# src.data.database는 import 시점에 연결 문자열을 읽으므로 테스트용 SQLite 파일을 먼저 지정
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="seouleasy-tests-")
+os.environ.setdefault("SQLALCHEMY_DATABASE_URL", f"sqlite+aiosqlite:///{_TEST_DB_DIR}/test.db")
+
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def utc_local_clock(monkeypatch):
+    """서버 시간대를 UTC로 고정 (Docker 이미지 기본값). KST가 아닌 로컬 시계에서도 KST 기준으로 계산하는지 확인할 때 사용"""
+    monkeypatch.setenv("TZ", "UTC")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.fixture
+async def db():
+    """테이블을 새로 만든 세션. 테스트가 끝나면 테이블을 지우고 연결을 닫습니다. (테스트마다 이벤트 루프가 다름)"""
+    from src.data.database import AsyncSessionLocal, Base, engine
+    from src.data.population.population_writer import congestion_message_ids
+    import src.model  # noqa: F401  (테이블 등록)
+
+    congestion_message_ids._ids.clear()  # 메시지 id 캐시는 프로세스 단위이므로 테이블과 함께 비움
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        yield session
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
@@ -0,0 +1,126 @@
+import os
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func
+from sqlalchemy.future import select
+
+from src.data.population import archive, time_range
+from src.data.population.population_writer import insert_population_rows
+from src.model.population import PopulationStation
+
+DAY = date(2025, 1, 6)
+START = datetime(2025, 1, 6, 9)
+
+
+def make_rows(day_start=START, region_ids=("POI001", "POI002"), count=3):
+    return [
+        {
+            "datetime": day_start + timedelta(minutes=5 * i),
+            "region_id": region_id,
+            "male_rate": 48.5,
+            "female_rate": 51.5,
+            "gen_20": 30.0,
+            "area_congest": "보통",
+            "congestion_message": "보통 메시지",
+            "min_population": 1000 + i,
+            "max_population": 1500 + i,
+        }
+        for region_id in region_ids
+        for i in range(count)
+    ]
+
+
+def test_retention_is_off_by_default():
+    assert archive.RETENTION_DAYS == 0
+
+
+def test_retention_cutoff_uses_kst_date_on_utc_host(monkeypatch):
+    # 2025-01-06 20:00 UTC = 2025-01-07 05:00 KST. UTC 서버의 로컬 날짜는 하루 전
+    instant = datetime(2025, 1, 6, 20, tzinfo=timezone.utc)
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return instant.astimezone(tz) if tz else instant.replace(tzinfo=None)
+
+    monkeypatch.setattr(time_range, "datetime", FrozenDatetime)
+    monkeypatch.setattr(archive, "datetime", FrozenDatetime)
+    monkeypatch.setattr(archive, "RETENTION_DAYS", 7)
+    assert archive.retention_cutoff() == datetime(2024, 12, 31)
+
+
+@pytest.mark.anyio
+async def test_run_retention_does_nothing_when_off(monkeypatch):
+    called = []
+    monkeypatch.setattr(archive, "archive_before", lambda *args: called.append(args))
+    await archive.run_retention(interval=0)  # 꺼져 있으면 반복하지 않고 바로 끝남
+    assert called == []
+
+
+@pytest.mark.anyio
+async def test_cli_requires_before_when_retention_is_off(monkeypatch):
+    called = []
+
+    async def archive_before(*args):
+        called.append(args)
+        return 0, 0
+
+    monkeypatch.setattr(archive, "archive_before", archive_before)
+    await archive.main([])
+    assert called == []
+
+
+def test_write_day_merges_and_keeps_temp_file_out_of_partition(tmp_path):
+    archive_dir = str(tmp_path)
+    rows = [(row["datetime"], row["region_id"], row["min_population"]) for row in make_rows()]
+    names = ("datetime", "region_id", "min_population")
+    assert archive.write_day(DAY, archive.rows_to_table(rows[:4], names), archive_dir) == 4
+    # 이전 실행이 삭제 전에 중단된 경우: 같은 행을 다시 써도 중복되지 않음
+    assert archive.write_day(DAY, archive.rows_to_table(rows[2:], names), archive_dir) == 6
+    assert os.listdir(tmp_path / "date=2025-01-06") == [archive.ARCHIVE_FILE_NAME]
+    assert archive.archived_days(archive_dir) == [DAY]
+
+
+@pytest.mark.anyio
+async def test_archive_day_moves_rows_and_reads_them_back(db, tmp_path):
+    from src.data.database import AsyncSessionLocal
+
+    rows = make_rows() + make_rows(START + timedelta(days=1))
+    async with db.begin():
+        await insert_population_rows(db, rows)
+    archive_dir = str(tmp_path)
+
+    days, moved = await archive.archive_before(datetime(2025, 1, 7), AsyncSessionLocal, archive_dir)
+    assert (days, moved) == (1, 6)
+    remaining = (await db.execute(select(func.count()).select_from(PopulationStation))).scalar()
+    assert remaining == 6  # 기준일 이후 행은 그대로
+
+    # 쓰다 만 임시 파일이 남아 있어도 조회에 포함되지 않음
+    (tmp_path / ".2025-01-06.999.tmp").write_bytes(b"partial")
+    table = archive.read_archive("POI001", START, START + timedelta(minutes=5), ("datetime", "male_rate", "gen_20_min", "congestion_message"), archive_dir)
+    data = table.to_pydict()
+    assert data["datetime"] == [START, START + timedelta(minutes=5)]
+    assert data["male_rate"] == [48.5, 48.5]
+    assert data["gen_20_min"] == [pytest.approx(300.0), pytest.approx(300.3)]
+    assert data["congestion_message"] == ["보통 메시지"] * 2
+
+    day_table = archive.read_archive_day(DAY, START, START + timedelta(days=1), ["POI002"], ("datetime", "region_id", "min_population"), archive_dir)
+    assert day_table.column("region_id").to_pylist() == ["POI002"] * 3
+    assert day_table.column("min_population").to_pylist() == [1000, 1001, 1002]
+
+
+@pytest.mark.anyio
+async def test_merge_archived_series_prefers_db_rows(db, tmp_path, monkeypatch):
+    from src.data.database import AsyncSessionLocal
+
+    monkeypatch.chdir(tmp_path)  # 기본 ARCHIVE_DIR은 상대 경로
+    async with db.begin():
+        await insert_population_rows(db, make_rows(region_ids=("POI001",)))
+    await archive.archive_before(datetime(2025, 1, 7), AsyncSessionLocal)
+
+    # 삭제 전 DB에도 남아 있던 것처럼 같은 시각의 행을 넘김
+    hot = [(START + timedelta(minutes=10), 1, "db")]
+    merged = await archive.merge_archived_series("POI001", START, START + timedelta(hours=1), hot)
+    assert [row[0] for row in merged] == [START + timedelta(minutes=5 * i) for i in range(3)]
+    assert merged[-1] == hot[0]
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.data.population import http_cache, snapshot_cache
+from src.data.population.derived_counts import DERIVED_COUNTS
+from src.data.population.pagination import NEXT_CURSOR_HEADER
+from src.data.population.population_router import router
+from src.data.population.population_writer import insert_population_rows
+from src.data.population.snapshot_cache import LatestSnapshotStore
+
+START = datetime(2025, 4, 1, 9)
+
+
+def make_rows(count=5):
+    return [
+        {
+            "datetime": START + timedelta(minutes=5 * i),
+            "region_id": "POI001",
+            "male_rate": 40.0 + i,
+            "female_rate": 60.0 - i,
+            **{gen: 10.0 for gen in ("gen_10", "gen_20", "gen_30", "gen_40", "gen_50", "gen_60", "gen_70")},
+            "area_congest": "보통",
+            "min_population": 1000,
+            "max_population": 2000,
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+async def client(db, monkeypatch):
+    # 검증 값은 프로세스 전역 저장소가 아닌 빈 저장소 + DB에서
+    store = LatestSnapshotStore()
+    monkeypatch.setattr(snapshot_cache, "latest_snapshots", store)
+    monkeypatch.setattr(http_cache, "latest_snapshots", store)
+    async with db.begin():
+        await insert_population_rows(db, make_rows())
+    app = FastAPI()
+    app.include_router(router)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        yield http
+
+
+@pytest.mark.anyio
+async def test_rows_layout_latest_first(client):
+    response = await client.get("/populations/breakdown", params={"region_id": "POI001"})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["region_id"], body["layout"]) == ("POI001", "rows")
+    first = body["rows"][0]
+    assert set(first) == {"datetime", *DERIVED_COUNTS}
+    assert first["datetime"].startswith("2025-04-01T09:20")
+    assert first["male_min_population"] == pytest.approx(440.0)  # 44% * 1000
+    assert first["female_max_population"] == pytest.approx(1120.0)  # 56% * 2000
+    assert first["gen_30_max"] == pytest.approx(200.0)
+    assert NEXT_CURSOR_HEADER not in response.headers  # 한 페이지에 모두 들어옴
+
+
+@pytest.mark.anyio
+async def test_columnar_layout_matches_rows(client):
+    rows = (await client.get("/populations/breakdown", params={"region_id": "POI001"})).json()["rows"]
+    body = (await client.get("/populations/breakdown", params={"region_id": "POI001", "layout": "columnar"})).json()
+    assert body["layout"] == "columnar" and "rows" not in body
+    columns = body["columns"]
+    assert list(columns) == list(rows[0])
+    assert [dict(zip(columns, values)) for values in zip(*columns.values())] == rows
+
+
+@pytest.mark.anyio
+async def test_cursor_paging_walks_all_rows(client):
+    seen = []
+    params = {"region_id": "POI001", "limit": 2}
+    while True:
+        response = await client.get("/populations/breakdown", params=params)
+        assert response.status_code == 200
+        seen += [row["datetime"] for row in response.json()["rows"]]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+    assert len(seen) == 5 and seen == sorted(seen, reverse=True)
+
+
+@pytest.mark.anyio
+async def test_unknown_region_is_404_like_region(client):
+    breakdown = await client.get("/populations/breakdown", params={"region_id": "POI999"})
+    region = await client.get("/populations/region/POI999")
+    assert breakdown.status_code == region.status_code == 404
+    assert breakdown.json() == region.json()
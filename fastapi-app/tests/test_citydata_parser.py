@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import pytest
+
+from benchmarks.citydata_payload import build_citydata_xml
+from src.data.population.citydata_parser import CitydataStreamParser, parse_citydata, parse_citydata_stream
+
+PPLTN_TIME = datetime(2025, 3, 14, 18, 5)
+PAYLOAD = build_citydata_xml("서울역", "POI033", PPLTN_TIME, road_links=50, bus_stations=20, seed=1)
+
+
+def split(payload: bytes, size: int):
+    return [payload[i:i + size] for i in range(0, len(payload), size)]
+
+
+def test_parse_live_population():
+    rows = parse_citydata(PAYLOAD)
+    assert len(rows) == 1
+    row = rows[0]
+    assert row["region_id"] == "POI033"
+    assert row["datetime"] == PPLTN_TIME
+    assert isinstance(row["male_rate"], float) and isinstance(row["min_population"], int)
+    # 예측(FCST_PPLTN)의 FCST_CONGEST_LVL 등은 실시간 값으로 섞이지 않음
+    assert row["area_congest"] in ("여유", "보통", "약간 붐빔", "붐빔")
+    assert row["min_population"] <= row["max_population"]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 4096])
+def test_chunked_feed_matches_whole_payload(size):
+    parser = CitydataStreamParser()
+    for chunk in split(PAYLOAD, size):
+        if parser.feed(chunk):
+            break
+    assert parser.rows == parse_citydata(PAYLOAD)
+
+
+def test_stops_after_live_population():
+    parser = CitydataStreamParser()
+    chunks = split(PAYLOAD, 256)
+    fed = 0
+    for chunk in chunks:
+        fed += 1
+        if parser.feed(chunk):
+            break
+    assert parser.done
+    assert fed < len(chunks)  # 도로/버스/날씨 구간은 파싱하지 않음
+    assert parser.feed(b"<not-xml") is True  # 끝난 뒤의 조각은 무시
+
+
+def test_missing_update_time_returns_no_rows():
+    payload = PAYLOAD.replace(b"<PPLTN_TIME>", b"<OTHER_TIME>").replace(b"</PPLTN_TIME>", b"</OTHER_TIME>")
+    assert parse_citydata(payload) == []
+
+
+def test_unknown_congestion_level_keeps_the_row(capsys):
+    expected = parse_citydata(PAYLOAD)[0]
+    level = expected["area_congest"]
+    payload = PAYLOAD.replace(f"<AREA_CONGEST_LVL>{level}<".encode(), "<AREA_CONGEST_LVL>매우 붐빔<".encode(), 1)
+    rows = parse_citydata(payload)
+    assert rows == [{**expected, "area_congest": None}]  # 혼잡도 단계만 NULL, 나머지 값은 그대로
+    assert "매우 붐빔" in capsys.readouterr().out  # 원래 값은 로그로 남김
+
+
+@pytest.mark.anyio
+async def test_parse_stream_reads_whole_body():
+    consumed = []
+
+    async def chunks():
+        for chunk in split(PAYLOAD, 512):
+            consumed.append(chunk)
+            yield chunk
+
+    rows, parse_seconds = await parse_citydata_stream(chunks())
+    assert rows == parse_citydata(PAYLOAD)
+    assert b"".join(consumed) == PAYLOAD  # 파싱이 끝난 뒤에도 본문을 끝까지 받아 연결을 재사용
+    assert parse_seconds >= 0
@@ -0,0 +1,139 @@
+import io
+from datetime import date, datetime, timedelta
+
+import httpx
+import orjson
+import pyarrow.parquet as pq
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.future import select
+
+from src.data.population import archive
+from src.data.population.export import (
+    EXPORT_FIELDS,
+    CsvEncoder,
+    NdjsonEncoder,
+    ParquetEncoder,
+    export_population,
+    iter_population_chunks,
+)
+from src.data.population.population_router import router
+from src.data.population.population_writer import insert_population_rows
+from src.data.population.time_range import kst_now
+from src.model.population import PopulationStation, join_congestion_message, population_columns
+
+START = datetime(2025, 1, 6, 23, 50)
+NAMES = ("datetime", "region_id", "min_population", "male_rate")
+ROWS = [
+    (datetime(2025, 1, 6, 9, 0), "POI001", 1000, 48.5),
+    (datetime(2025, 1, 6, 9, 5), "POI001", None, None),
+]
+
+
+def make_rows(count=6):
+    # 자정을 지나는 5분 간격 행 (2025-01-06 23:50 ~ 2025-01-07 00:15)
+    return [
+        {
+            "datetime": START + timedelta(minutes=5 * i),
+            "region_id": "POI001",
+            "male_rate": 48.5,
+            "area_congest": "보통",
+            "congestion_message": "보통 메시지",
+            "min_population": 1000 + i,
+            "max_population": 1500 + i,
+        }
+        for i in range(count)
+    ]
+
+
+async def collect(chunks):
+    return [row async for chunk in chunks for row in chunk]
+
+
+def test_csv_encoder():
+    encoder = CsvEncoder(NAMES)
+    body = encoder.header() + encoder.encode(ROWS) + encoder.close()
+    assert body.decode("utf-8") == (
+        "datetime,region_id,min_population,male_rate\n"
+        "2025-01-06T09:00:00,POI001,1000,48.5\n"
+        "2025-01-06T09:05:00,POI001,,\n"
+    )
+
+
+def test_ndjson_encoder():
+    encoder = NdjsonEncoder(NAMES)
+    lines = (encoder.header() + encoder.encode(ROWS) + encoder.close()).splitlines()
+    assert [orjson.loads(line) for line in lines] == [
+        {"datetime": "2025-01-06T09:00:00", "region_id": "POI001", "min_population": 1000, "male_rate": 48.5},
+        {"datetime": "2025-01-06T09:05:00", "region_id": "POI001", "min_population": None, "male_rate": None},
+    ]
+
+
+def test_parquet_encoder_writes_one_row_group_per_chunk():
+    encoder = ParquetEncoder(NAMES)
+    body = encoder.header() + encoder.encode(ROWS[:1]) + encoder.encode(ROWS[1:]) + encoder.close()
+    parquet = pq.ParquetFile(io.BytesIO(body))
+    assert parquet.metadata.num_row_groups == 2
+    assert parquet.read().to_pydict() == {name: list(column) for name, column in zip(NAMES, zip(*ROWS))}
+
+
+@pytest.mark.anyio
+async def test_archived_day_is_not_read_again_from_db(db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # 기본 ARCHIVE_DIR은 상대 경로
+    async with db.begin():
+        await insert_population_rows(db, make_rows())
+    # 아카이브 파일을 쓰고 DB에서 지우기 전 상태 (같은 행이 양쪽에 있음)
+    query = join_congestion_message(select(*population_columns(archive.ARCHIVE_FIELDS))).where(
+        PopulationStation.datetime < datetime(2025, 1, 7)
+    )
+    rows = (await db.execute(query)).all()
+    archive.write_day(date(2025, 1, 6), archive.rows_to_table(rows))
+
+    exported = await collect(iter_population_chunks(None, START, START + timedelta(hours=1)))
+    assert [row[0].replace(tzinfo=None) for row in exported] == [row["datetime"] for row in make_rows()]
+    assert exported[0][EXPORT_FIELDS.index("congestion_message")] == "보통 메시지"
+    # 범위가 아카이브된 날짜 안에서 끝나면 DB는 조회하지 않음
+    assert len(await collect(iter_population_chunks(None, START, START + timedelta(minutes=5)))) == 2
+
+
+@pytest.mark.anyio
+async def test_export_population_streams_csv(db):
+    async with db.begin():
+        await insert_population_rows(db, make_rows())
+    body = b"".join([part async for part in export_population("csv", ["POI001"], START, START + timedelta(minutes=10))])
+    lines = body.decode("utf-8").splitlines()
+    assert lines[0] == ",".join(EXPORT_FIELDS)
+    assert len(lines) == 4
+
+
+@pytest.mark.anyio
+async def test_export_endpoint_accepts_tz_aware_bounds(db):
+    async with db.begin():
+        await insert_population_rows(db, make_rows())
+    app = FastAPI()
+    app.include_router(router)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        # 2025-01-06 15:00Z = 2025-01-07 00:00 KST
+        response = await client.get("/populations/export", params={
+            "start": "2025-01-06T15:00:00Z", "end": "2025-01-07T00:30:00+09:00", "format": "ndjson",
+        })
+        assert response.status_code == 200
+    exported = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [row["datetime"][:16] for row in exported] == ["2025-01-07T00:00", "2025-01-07T00:05", "2025-01-07T00:10", "2025-01-07T00:15"]
+
+
+@pytest.mark.anyio
+async def test_export_default_end_is_kst_now_on_utc_host(db, utc_local_clock):
+    # KST 기준 10분 전 ~ 지금. UTC 시각을 기본 끝으로 쓰면 9시간 전까지만 내보내 모두 빠짐
+    now = kst_now().replace(second=0, microsecond=0)
+    rows = [{**row, "datetime": now - timedelta(minutes=10 - 5 * i)} for i, row in enumerate(make_rows(3))]
+    async with db.begin():
+        await insert_population_rows(db, rows)
+    app = FastAPI()
+    app.include_router(router)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/populations/export", params={
+            "start": (now - timedelta(hours=1)).isoformat(), "format": "ndjson",
+        })
+    assert response.status_code == 200
+    assert len(response.content.splitlines()) == 3
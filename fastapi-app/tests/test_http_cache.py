@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+
+from starlette.requests import Request
+
+from src.data.population.http_cache import HTTP_CACHE_MAX_AGE, HTTP_CACHE_MIN_AGE, build_validators, window_version
+
+NEWEST = datetime(2025, 4, 10, 18, 30)
+
+
+def make_request(query="region_id=POI001", headers=None):
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/populations/series", "query_string": query.encode(), "headers": raw_headers})
+
+
+def validators(request=None, newest=NEWEST, expected_next=NEWEST + timedelta(minutes=5), version="", now=NEWEST + timedelta(minutes=2)):
+    return build_validators(request or make_request(), newest, expected_next, version, now)
+
+
+def test_etag_depends_on_data_time_request_and_version():
+    etag = validators().etag
+    assert etag.startswith('W/"20250410183000-')
+    assert validators().etag == etag
+    assert validators(newest=NEWEST + timedelta(minutes=5)).etag != etag
+    assert validators(make_request("region_id=POI002")).etag != etag
+    assert validators(make_request(headers={"Accept": "application/vnd.apache.arrow.stream"})).etag != etag
+    assert validators(version="202504101730-202504101830").etag != etag
+
+
+def test_max_age_is_time_until_next_update_clamped():
+    assert validators().max_age == 180
+    assert validators(expected_next=NEWEST - timedelta(minutes=1)).max_age == HTTP_CACHE_MIN_AGE
+    assert validators(expected_next=NEWEST + timedelta(hours=2)).max_age == HTTP_CACHE_MAX_AGE
+
+
+def test_last_modified_is_utc():
+    assert validators().last_modified == datetime(2025, 4, 10, 9, 30, tzinfo=timezone.utc)
+
+
+def test_conditional_requests():
+    current = validators()
+    assert current.is_not_modified(make_request(headers={"If-None-Match": current.etag}))
+    assert current.is_not_modified(make_request(headers={"If-None-Match": f'"other", {current.etag.removeprefix("W/")}'}))
+    assert not current.is_not_modified(make_request(headers={"If-None-Match": '"other"'}))
+    # If-None-Match가 있으면 If-Modified-Since는 보지 않음
+    assert not current.is_not_modified(make_request(headers={"If-None-Match": '"other"', "If-Modified-Since": "Thu, 10 Apr 2025 10:00:00 GMT"}))
+    assert current.is_not_modified(make_request(headers={"If-Modified-Since": "Thu, 10 Apr 2025 09:30:00 GMT"}))
+    assert not current.is_not_modified(make_request(headers={"If-Modified-Since": "Thu, 10 Apr 2025 09:29:00 GMT"}))
+    assert not current.is_not_modified(make_request(headers={"If-Modified-Since": "garbage"}))
+
+
+def test_sliding_window_changes_etag_when_rows_leave_the_window():
+    # 같은 URL(end 생략)이라도 범위가 움직여 포함되는 행이 바뀌면 ETag가 달라야 함
+    def etag_at(now):
+        return validators(version=window_version([(now - timedelta(minutes=60), now)])).etag
+
+    now = datetime(2025, 4, 10, 18, 32, 10)
+    assert etag_at(now) == etag_at(now + timedelta(seconds=40))  # 포함되는 행(17:33~18:32)이 같음
+    assert etag_at(now) != etag_at(now + timedelta(seconds=60))
+
+
+def test_window_version_rounds_to_minute_grid():
+    assert window_version([(datetime(2025, 4, 10, 17, 30), datetime(2025, 4, 10, 18, 30, 59))]) == "202504101730-202504101830"
+    assert window_version([(datetime(2025, 4, 10, 17, 30, 0, 1), datetime(2025, 4, 10, 18, 30))]) == "202504101731-202504101830"
+    assert window_version([(datetime(2025, 4, 9, 18), datetime(2025, 4, 9, 19)), (datetime(2025, 4, 10, 18), datetime(2025, 4, 10, 19))]) == (
+        "202504091800-202504091900,202504101800-202504101900"
+    )
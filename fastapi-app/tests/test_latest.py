@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.data.population import http_cache, population_router
+from src.data.population.population_writer import insert_population_rows
+from src.data.population.snapshot_cache import SNAPSHOT_FIELDS, LatestSnapshotStore
+
+START = datetime(2025, 4, 1, 9)
+
+
+def make_row(region_id, minutes, level="보통"):
+    return {
+        "datetime": START + timedelta(minutes=minutes),
+        "region_id": region_id,
+        "male_rate": 48.5,
+        "female_rate": 51.5,
+        "area_congest": level,
+        "congestion_message": f"{level} 메시지",
+        "min_population": 1000 + minutes,
+        "max_population": 1500 + minutes,
+    }
+
+
+@pytest.fixture
+def store(monkeypatch):
+    # 프로세스 전역 저장소 대신 테스트마다 빈 저장소 사용
+    store = LatestSnapshotStore()
+    monkeypatch.setattr(population_router, "latest_snapshots", store)
+    monkeypatch.setattr(http_cache, "latest_snapshots", store)
+    return store
+
+
+def client():
+    app = FastAPI()
+    app.include_router(population_router.router)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.anyio
+async def test_latest_reads_db_when_cache_is_cold(db, store):
+    async with db.begin():
+        await insert_population_rows(db, [make_row("POI002", 0), make_row("POI001", 0), make_row("POI001", 5, "붐빔")])
+    async with client() as http:
+        response = await http.get("/populations/latest")
+    assert response.status_code == 200
+    body = response.json()
+    assert [row["region_id"] for row in body] == ["POI001", "POI002"]
+    assert set(body[0]) == set(SNAPSHOT_FIELDS)
+    assert body[0]["datetime"].startswith("2025-04-01T09:05")
+    assert (body[0]["area_congest"], body[0]["congestion_message"], body[0]["male_rate"]) == ("붐빔", "붐빔 메시지", 48.5)
+    # 조회한 최신 행은 저장소에 반영
+    assert len(store) == 2
+
+
+@pytest.mark.anyio
+async def test_latest_answers_from_warm_cache(db, store):
+    store.update_many([make_row("POI001", 0), make_row("POI003", 0)])
+    store.warmed = True
+    async with client() as http:
+        everything = await http.get("/populations/latest")
+        subset = await http.get("/populations/latest", params={"region_ids": "POI003,POI001"})
+    # DB는 비어 있으므로 캐시에서 응답한 것
+    assert [row["region_id"] for row in everything.json()] == ["POI001", "POI003"]
+    assert [row["region_id"] for row in subset.json()] == ["POI001", "POI003"]
+
+
+@pytest.mark.anyio
+async def test_latest_etag_and_304(db, store):
+    store.update_many([make_row("POI001", 0), make_row("POI002", 0)])
+    store.warmed = True
+    async with client() as http:
+        first = await http.get("/populations/latest")
+        etag = first.headers["etag"]
+        assert first.headers["last-modified"] == "Tue, 01 Apr 2025 00:00:00 GMT"  # 09:00 KST
+        assert "max-age=" in first.headers["cache-control"]
+
+        not_modified = await http.get("/populations/latest", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+
+        # 한 지역만 새 데이터가 들어와도 ETag가 바뀜
+        store.update_many([make_row("POI002", 5)])
+        changed = await http.get("/populations/latest", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()[1]["datetime"].startswith("2025-04-01T09:05")
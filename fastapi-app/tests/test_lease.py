@@ -0,0 +1,71 @@
+from collections import Counter
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import update
+
+from src.data.database import AsyncSessionLocal
+from src.data.population.areas import AREA_NM_LIST
+from src.data.population.lease import ShardLeaseManager, _utcnow, shard_of
+from src.model.ingestion import IngestionLease, IngestionWorker
+
+pytestmark = pytest.mark.anyio
+
+
+def manager(worker_id, num_shards=8):
+    return ShardLeaseManager(worker_id=worker_id, num_shards=num_shards, lease_ttl=60, session_factory=AsyncSessionLocal)
+
+
+def test_shard_of_is_stable_and_spread():
+    assert shard_of("서울역", 8) == shard_of("서울역", 8)
+    counts = Counter(shard_of(area_name, 8) for area_name in AREA_NM_LIST)
+    assert set(counts) == set(range(8))
+
+
+async def test_single_worker_takes_all_shards(db):
+    worker = manager("a")
+    await worker.sync()
+    assert worker.owned_shards == set(range(8))
+    assert worker.is_leader
+    assert all(worker.owns(area_name) for area_name in AREA_NM_LIST)
+
+
+async def test_new_worker_gets_its_share(db):
+    a, b, c = manager("a"), manager("b"), manager("c")
+    await a.sync()
+    await b.sync()  # a가 아직 전부 가지고 있어 b는 인수할 샤드가 없음
+    assert b.owned_shards == set()
+    await a.sync()  # 워커 2개 -> 몫 4개, 나머지 반납
+    await b.sync()
+    assert len(a.owned_shards) == len(b.owned_shards) == 4
+    assert a.owned_shards.isdisjoint(b.owned_shards)
+
+    await c.sync()  # 워커 3개 -> 몫 ceil(8/3) = 3개
+    await a.sync()
+    await b.sync()
+    await c.sync()
+    assert [len(w.owned_shards) for w in (a, b, c)] == [3, 3, 2]
+    assert a.owned_shards | b.owned_shards | c.owned_shards == set(range(8))
+
+
+async def test_expired_leases_are_taken_over(db):
+    a, b = manager("a"), manager("b")
+    await a.sync()
+    await b.sync()
+    # a의 생존 신호와 임대가 끊긴 상황
+    expired = _utcnow() - timedelta(seconds=120)
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(update(IngestionWorker).where(IngestionWorker.worker_id == "a").values(heartbeat_at=expired))
+            await session.execute(update(IngestionLease).where(IngestionLease.owner_id == "a").values(expires_at=expired))
+    await b.sync()
+    assert b.owned_shards == set(range(8))
+
+
+async def test_release_frees_shards(db):
+    a, b = manager("a"), manager("b")
+    await a.sync()
+    await a.release()
+    assert a.owned_shards == set() and not a.owns(AREA_NM_LIST[0])
+    await b.sync()
+    assert b.owned_shards == set(range(8))
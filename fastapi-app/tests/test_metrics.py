@@ -0,0 +1,32 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.data.metrics import metrics_router
+from src.data.metrics.metrics import track_request_latency
+from src.data.population.population_router import router
+
+
+def make_app():
+    app = FastAPI()
+    app.include_router(router)
+    app.include_router(metrics_router.router)
+    app.middleware("http")(track_request_latency)
+    return app
+
+
+@pytest.mark.anyio
+async def test_request_latency_is_labelled_with_route_template(db):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=make_app()), base_url="http://test") as client:
+        assert (await client.get("/populations/region/POI999")).status_code == 404
+        await client.get("/populations/no-such-path")
+        await client.get("/docs")  # TRACKED_PREFIXES 밖의 경로는 기록하지 않음
+        response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'seouleasy_http_request_seconds_count{method="GET",route="/populations/region/{region_id}",status_code="404"}' in body
+    assert 'route="unmatched"' in body
+    # 실제 경로 값은 라벨에 들어가지 않음 (라벨 수가 요청 값마다 늘어나지 않음)
+    assert "POI999" not in body and "no-such-path" not in body and 'route="/docs"' not in body
+    assert "seouleasy_ingestion_stage_seconds" in body
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy.future import select
+
+from src.data.population.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, paginate_latest_first, set_next_cursor
+from src.data.population.population_writer import insert_population_rows
+from src.model.population import PopulationStation
+
+
+def test_cursor_round_trip():
+    value = datetime(2025, 4, 1, 9, 5, 30, 123456)
+    cursor = encode_cursor(value)
+    assert "=" not in cursor  # URL에 그대로 쓸 수 있도록 패딩 제거
+    assert decode_cursor(cursor) == value
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor!", encode_cursor(datetime(2025, 4, 1))[:-3], "bm90IGEgZGF0ZQ"])
+def test_invalid_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor)
+    assert e.value.status_code == 400
+
+
+def test_next_cursor_only_for_full_page():
+    records = [{"datetime": datetime(2025, 4, 1, 9, minute)} for minute in (10, 5)]
+    response = Response()
+    set_next_cursor(response, records, limit=3)
+    assert NEXT_CURSOR_HEADER not in response.headers
+    set_next_cursor(response, records, limit=2)
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == datetime(2025, 4, 1, 9, 5)
+
+
+@pytest.mark.anyio
+async def test_pages_follow_cursor(db):
+    rows = [
+        {"datetime": datetime(2025, 4, 1, 9, minute), "region_id": region_id, "area_congest": "보통"}
+        for minute in range(0, 50, 5) for region_id in ("POI001", "POI002")
+    ]
+    async with db.begin():
+        await insert_population_rows(db, rows)
+
+    query = select(PopulationStation.datetime).where(PopulationStation.region_id == "POI001")
+    seen, cursor = [], None
+    while True:
+        page = (await db.execute(paginate_latest_first(query, 4, cursor))).mappings().all()
+        seen.extend(row["datetime"].minute for row in page)
+        response = Response()
+        set_next_cursor(response, page, 4)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+    assert seen == list(range(45, -5, -5))
+
+    # 하위 호환 offset
+    page = (await db.execute(paginate_latest_first(query, 2, offset=3))).scalars().all()
+    assert [value.minute for value in page] == [30, 25]
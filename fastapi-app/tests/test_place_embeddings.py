@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+
+from src.data.upload import place_embeddings
+from src.data.upload.place_embeddings import clip_model_fingerprint, embeddings_path, load_or_build, rank_places
+
+DESCRIPTIONS = ("first place", "second place", "third place")
+
+
+class CountingEncoder:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, descriptions):
+        self.calls += 1
+        return np.arange(len(descriptions) * 4, dtype=np.float32).reshape(len(descriptions), 4) + 1
+
+
+def embedding_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.startswith(place_embeddings.PLACE_EMBEDDINGS_PREFIX))
+
+
+def test_builds_once_then_memory_maps(tmp_path):
+    encode = CountingEncoder()
+    first = load_or_build(b"model-a", encode, DESCRIPTIONS, str(tmp_path))
+    second = load_or_build(b"model-a", encode, DESCRIPTIONS, str(tmp_path))
+    assert encode.calls == 1
+    assert isinstance(second, np.memmap)
+    assert np.allclose(np.linalg.norm(second, axis=1), 1.0)
+    assert np.array_equal(first, second)
+
+
+def test_cleanup_removes_only_older_files(tmp_path):
+    directory = str(tmp_path)
+    load_or_build(b"model-a", CountingEncoder(), DESCRIPTIONS, directory)
+    old_path = os.path.join(directory, embedding_files(directory)[0])
+    os.utime(old_path, (1, 1))
+    # 배포 중 다른 워커가 더 새 모델의 파일을 먼저 쓴 경우
+    newer_path = embeddings_path("newer", directory)
+    np.save(newer_path, np.zeros((3, 4), dtype=np.float32))
+    future = os.path.getmtime(newer_path) + 60
+    os.utime(newer_path, (future, future))
+
+    load_or_build(b"model-b", CountingEncoder(), DESCRIPTIONS, directory)
+    assert not os.path.exists(old_path)
+    assert os.path.exists(newer_path)
+    assert len(embedding_files(directory)) == 2
+
+
+def test_cleanup_skips_files_removed_by_another_worker(tmp_path, monkeypatch):
+    directory = str(tmp_path)
+    load_or_build(b"model-a", CountingEncoder(), DESCRIPTIONS, directory)
+    os.utime(os.path.join(directory, embedding_files(directory)[0]), (1, 1))
+
+    def remove(path):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(place_embeddings.os, "remove", remove)
+    embeddings = load_or_build(b"model-b", CountingEncoder(), DESCRIPTIONS, directory)
+    assert embeddings.shape == (3, 4)
+
+
+def test_fingerprint_follows_checkpoint_contents(tmp_path):
+    (tmp_path / "config.json").write_text("{}")
+    (tmp_path / "model.safetensors").write_bytes(b"weights-v1")
+    before = clip_model_fingerprint(str(tmp_path))
+    # 같은 폴더에 저장하는 임베딩 파일은 모델 식별에 포함되지 않음
+    np.save(embeddings_path("abc", str(tmp_path)), np.zeros((1, 1)))
+    assert clip_model_fingerprint(str(tmp_path)) == before
+    (tmp_path / "model.safetensors").write_bytes(b"weights-v2")
+    assert clip_model_fingerprint(str(tmp_path)) != before
+
+
+def test_rank_places_by_cosine_similarity():
+    embeddings = place_embeddings.l2_normalize([[1, 0], [0, 1], [1, 1]])
+    assert rank_places(np.array([[0.1, 2.0]]), embeddings).tolist() == [1, 2, 0]
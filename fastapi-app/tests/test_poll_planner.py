@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+from src.data.population.poll_planner import (
+    DEFAULT_CADENCE,
+    EARLY_POLL_RATIO,
+    FAILURE_RETRY,
+    MAX_BACKOFF,
+    STALE_RETRY,
+    PollPlanner,
+)
+
+UPDATE_TIME = datetime(2025, 3, 14, 18, 5)
+
+
+def test_next_poll_anchored_to_update_time():
+    planner = PollPlanner(["서울역"])
+    # PPLTN_TIME 2분 뒤에 받은 응답: 다음 PPLTN_TIME(+5분)의 10% 전, 즉 2.5분 뒤 요청
+    assert planner.observe("서울역", UPDATE_TIME, now=1000.0, wall_now=UPDATE_TIME + timedelta(minutes=2))
+    expected = DEFAULT_CADENCE * (1 - EARLY_POLL_RATIO) - 120
+    assert planner.states["서울역"].next_poll_at == 1000.0 + expected
+
+
+def test_late_response_does_not_push_next_poll():
+    planner = PollPlanner(["서울역"])
+    planner.observe("서울역", UPDATE_TIME, now=1000.0, wall_now=UPDATE_TIME + timedelta(minutes=1))
+    first = planner.states["서울역"].next_poll_at
+    # 같은 PPLTN_TIME을 3분 늦게 받아도 다음 요청은 데이터 시각 기준 (요청 시각 기준이면 3분 밀림)
+    late = PollPlanner(["서울역"])
+    late.observe("서울역", UPDATE_TIME, now=1000.0 + 180, wall_now=UPDATE_TIME + timedelta(minutes=4))
+    assert late.states["서울역"].next_poll_at == first
+
+
+def test_overdue_update_retries_after_stale_retry():
+    planner = PollPlanner(["서울역"])
+    planner.observe("서울역", UPDATE_TIME, now=1000.0, wall_now=UPDATE_TIME + timedelta(minutes=20))
+    assert planner.states["서울역"].next_poll_at == 1000.0 + STALE_RETRY
+
+
+def test_future_update_time_waits_at_most_one_cadence():
+    planner = PollPlanner(["서울역"])
+    planner.observe("서울역", UPDATE_TIME, now=1000.0, wall_now=UPDATE_TIME - timedelta(hours=1))
+    assert planner.states["서울역"].next_poll_at == 1000.0 + DEFAULT_CADENCE
+
+
+def test_cadence_smoothing():
+    planner = PollPlanner(["서울역"])
+    planner.observe("서울역", UPDATE_TIME, now=0.0, wall_now=UPDATE_TIME)
+    planner.observe("서울역", UPDATE_TIME + timedelta(minutes=10), now=600.0, wall_now=UPDATE_TIME + timedelta(minutes=10))
+    assert planner.states["서울역"].cadence == 0.3 * 600 + 0.7 * DEFAULT_CADENCE
+
+
+def test_stale_backoff_doubles_until_cadence():
+    planner = PollPlanner(["서울역"])
+    planner.observe("서울역", UPDATE_TIME, now=0.0, wall_now=UPDATE_TIME)
+    delays = []
+    for _ in range(10):
+        assert not planner.observe("서울역", UPDATE_TIME, now=0.0)
+        delays.append(planner.states["서울역"].next_poll_at)
+    assert delays[:3] == [STALE_RETRY, STALE_RETRY * 2, STALE_RETRY * 4]
+    # 상한은 관측된 갱신 주기 (복구된 피드를 한 주기 안에 다시 요청)
+    assert delays[-1] == DEFAULT_CADENCE < MAX_BACKOFF
+    # 새 데이터가 오면 초기화
+    planner.observe("서울역", UPDATE_TIME + timedelta(minutes=5), now=0.0, wall_now=UPDATE_TIME + timedelta(minutes=5))
+    assert planner.states["서울역"].stale_count == 0
+
+
+def test_failure_backoff_and_due():
+    planner = PollPlanner(["서울역", "강남역"])
+    assert planner.due(0.0) == ["서울역", "강남역"]
+    planner.observe_failure("서울역", 0.0)
+    planner.observe_failure("서울역", 0.0)
+    assert planner.states["서울역"].next_poll_at == FAILURE_RETRY * 2
+    assert planner.due(0.0) == ["강남역"]
+    assert planner.due(0.0, accept=lambda area_name: area_name != "강남역") == []
+    assert planner.seconds_until_next(0.0, accept=lambda area_name: area_name == "서울역") == FAILURE_RETRY * 2
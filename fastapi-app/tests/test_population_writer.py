@@ -0,0 +1,85 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import Integer, func
+from sqlalchemy.future import select
+
+from src.data.population.derived_counts import DERIVED_COUNTS, derive_count
+from src.data.population.population_writer import insert_population_rows
+from src.model.population import PopulationStation, join_congestion_message, population_columns
+
+pytestmark = pytest.mark.anyio
+
+
+def make_row(region_id, minute, level="보통"):
+    return {
+        "datetime": datetime(2025, 4, 1, 9, minute),
+        "region_id": region_id,
+        "male_rate": 48.7,
+        "female_rate": 51.3,
+        "area_congest": level,
+        "congestion_message": f"{level} 메시지",
+        "min_population": 1000,
+        "max_population": 1200,
+    }
+
+
+async def test_inserts_new_rows_and_skips_duplicates(db):
+    rows = [make_row("POI001", 0), make_row("POI002", 0)]
+    async with db.begin():
+        assert await insert_population_rows(db, rows) == 2
+    async with db.begin():
+        assert await insert_population_rows(db, rows + [make_row("POI001", 5)]) == 1
+        count = (await db.execute(select(func.count()).select_from(PopulationStation))).scalar()
+    assert count == 3
+
+
+async def test_empty_batch_is_a_no_op(db):
+    assert await insert_population_rows(db, []) == 0
+
+
+async def test_round_trips_values_through_compact_storage(db):
+    async with db.begin():
+        await insert_population_rows(db, [make_row("POI001", 0, "약간 붐빔")])
+    record = (await db.execute(select(PopulationStation))).scalars().one()
+    assert (record.male_rate, record.area_congest, record.congestion_message) == (48.7, "약간 붐빔", "약간 붐빔 메시지")
+
+
+async def test_derived_counts_are_stored_at_ingest(db):
+    row = {**make_row("POI001", 0), "min_population": 1234}
+    empty = {**make_row("POI002", 0), "male_rate": None, "min_population": 0}
+    async with db.begin():
+        await insert_population_rows(db, [row, empty])
+    records = (await db.execute(select(PopulationStation).order_by(PopulationStation.region_id))).scalars().all()
+    for record, source in zip(records, [row, empty]):
+        for column, (rate_column, population_column) in DERIVED_COUNTS.items():
+            expected = derive_count(source.get(rate_column), source.get(population_column))
+            assert getattr(record, column) == pytest.approx(expected), column
+    assert records[0].male_min_population == pytest.approx(600.958)  # 1000배 한 정수로 저장해도 같은 값
+    stored = (await db.execute(select(PopulationStation.__table__.c.male_min_population.cast(Integer)).where(
+        PopulationStation.region_id == "POI001"
+    ))).scalar()
+    assert stored == 600958
+    assert records[1].male_max_population is None  # 비율이 없으면 None
+    assert records[1].female_min_population is None  # 인구가 0이면 None
+
+
+async def test_congestion_message_is_joined_in_the_same_query(db):
+    async with db.begin():
+        await insert_population_rows(db, [make_row("POI001", 0), {**make_row("POI002", 0), "congestion_message": None}])
+    query = select(PopulationStation).order_by(PopulationStation.region_id)
+    assert "LEFT OUTER JOIN congestion_message" in str(query.compile())
+    records = (await db.execute(query)).unique().scalars().all()
+    assert [record.congestion_message for record in records] == ["보통 메시지", None]
+
+    columns = join_congestion_message(select(*population_columns(["region_id", "congestion_message", "gen_10_min"])))
+    rows = (await db.execute(columns.order_by(PopulationStation.region_id))).all()
+    assert [tuple(row) for row in rows] == [("POI001", "보통 메시지", None), ("POI002", None, None)]
+
+
+async def test_unknown_congestion_level_is_stored_as_null(db, capsys):
+    async with db.begin():
+        await insert_population_rows(db, [make_row("POI001", 0, "매우 붐빔")])
+    record = (await db.execute(select(PopulationStation))).scalars().one()
+    assert (record.area_congest, record.male_rate, record.congestion_message) == (None, 48.7, "매우 붐빔 메시지")
+    assert "매우 붐빔" in capsys.readouterr().out
@@ -0,0 +1,146 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.data.population import profiles
+from src.data.population.population_writer import insert_population_rows
+from src.data.population.profiles import ProfileEngine
+from src.data.population.snapshot_cache import LatestSnapshotStore, PopulationSnapshot
+
+MONDAY = datetime(2025, 4, 7, 9, 0)
+
+
+def snapshot(when, region_id="POI001", level="보통", min_population=1000):
+    return PopulationSnapshot(
+        datetime=when, region_id=region_id, area_congest=level,
+        min_population=min_population, max_population=min_population + 500,
+    )
+
+
+def same_state(a: ProfileEngine, b: ProfileEngine) -> bool:
+    left, right = a.state(), b.state()
+    return all(np.array_equal(left[name], right[name]) for name in left)
+
+
+def test_slot_of():
+    engine = ProfileEngine(slot_minutes=60)
+    assert engine.slots == 24
+    assert engine.slot_of(MONDAY) == (0, 9)
+    assert engine.slot_of(datetime(2025, 4, 13, 23, 59)) == (6, 23)
+    assert ProfileEngine(slot_minutes=5).slot_of(datetime(2025, 4, 8, 9, 7)) == (1, 109)
+    with pytest.raises(ValueError):
+        ProfileEngine(slot_minutes=7)
+
+
+def test_observe_accumulates_and_skips_old_rows():
+    engine = ProfileEngine()
+    engine.loaded = True
+    assert engine.observe(snapshot(MONDAY, min_population=1000))
+    assert engine.observe(snapshot(MONDAY + timedelta(minutes=5), level="붐빔", min_population=2000))
+    assert not engine.observe(snapshot(MONDAY))  # 이미 더한 시각
+    profile = engine.profile("POI001", weekday=0)
+    assert profile["samples"][0][9] == 2
+    assert profile["min_population"][0][9] == 1500.0
+    assert profile["congestion"]["congest_normal"][0][9] == 0.5
+    assert profile["congestion"]["congest_busy"][0][9] == 0.5
+    assert np.isnan(profile["min_population"][0][10])  # 샘플 없는 칸
+    assert engine.profile("POI999") is None
+
+
+def test_row_listener_receives_every_stored_row():
+    # 지역별 최신 한 건이 아니라 저장된 행 전체가 프로필에 더해져야 함 (다른 프로세스가 여러 행을 저장한 경우)
+    store = LatestSnapshotStore()
+    engine = ProfileEngine()
+    engine.loaded = True
+    store.add_row_listener(engine.observe_many)
+    rows = [
+        {"datetime": MONDAY + timedelta(minutes=5 * i), "region_id": "POI001", "area_congest": "보통",
+         "min_population": 1000, "max_population": 1500}
+        for i in range(3)
+    ]
+    changed = store.update_many(rows)
+    assert len(changed) == 1
+    assert engine.profile("POI001", weekday=0)["samples"][0][9] == 3
+
+
+def test_rows_before_load_are_not_added():
+    engine = ProfileEngine()
+    engine.observe_many([snapshot(MONDAY)])
+    assert len(engine) == 0
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "profiles.npz")
+    engine = ProfileEngine()
+    engine.loaded = True
+    engine.observe(snapshot(MONDAY))
+    engine.save(path)
+    loaded = ProfileEngine()
+    assert loaded.load(path)
+    assert same_state(loaded, engine)
+    assert not ProfileEngine(slot_minutes=30).load(path)
+
+
+def test_rebuild_lock_allows_one_process(tmp_path):
+    path = str(tmp_path / "profiles.npz")
+    assert profiles._claim_rebuild(path)
+    assert not profiles._claim_rebuild(path)
+    # 중단된 프로세스가 남긴 오래된 잠금 파일은 무시
+    stale = time.time() - profiles.PROFILE_REBUILD_LOCK_TTL - 1
+    os.utime(profiles._lock_path(path), (stale, stale))
+    assert profiles._claim_rebuild(path)
+    profiles._release_rebuild(path)
+    profiles._release_rebuild(path)
+    assert not os.path.exists(profiles._lock_path(path))
+
+
+@pytest.mark.anyio
+async def test_only_lock_holder_rebuilds_and_others_load_file(db, tmp_path):
+    from src.data.database import AsyncSessionLocal
+
+    rows = [
+        {"datetime": MONDAY + timedelta(minutes=5 * i), "region_id": "POI001", "area_congest": "여유",
+         "min_population": 1000, "max_population": 1500}
+        for i in range(4)
+    ]
+    async with db.begin():
+        await insert_population_rows(db, rows)
+    path = str(tmp_path / "profiles.npz")
+
+    follower = ProfileEngine()
+    assert profiles._claim_rebuild(path)  # 다른 프로세스가 만드는 중
+    await follower.load_or_rebuild(path, AsyncSessionLocal)
+    assert not follower.loaded and len(follower) == 0
+    profiles._release_rebuild(path)
+
+    leader = ProfileEngine()
+    await leader.load_or_rebuild(path, AsyncSessionLocal)
+    assert leader.loaded and os.path.exists(path)
+    assert leader.profile("POI001", weekday=0)["samples"][0][9] == 4
+
+    assert await follower.load_async(path, AsyncSessionLocal)
+    assert same_state(follower, leader)
+
+
+@pytest.mark.anyio
+async def test_rebuild_counts_rows_inserted_out_of_order(db, monkeypatch):
+    from src.data.database import AsyncSessionLocal
+
+    # 최근 데이터를 먼저 저장하고 과거 이력을 나중에 채운 경우 (백필). 청크 여러 개로 나누어 읽음
+    monkeypatch.setattr(profiles, "PROFILE_REBUILD_CHUNK", 10)
+    rows = [
+        {"datetime": MONDAY + timedelta(minutes=5 * i), "region_id": "POI001", "area_congest": "보통",
+         "min_population": 1000, "max_population": 1500}
+        for i in range(40)
+    ]
+    async with db.begin():
+        await insert_population_rows(db, rows[20:])
+    async with db.begin():
+        await insert_population_rows(db, rows[:20])
+
+    engine = ProfileEngine()
+    await engine.rebuild(AsyncSessionLocal)
+    assert int(engine.state()["samples"].sum()) == 40
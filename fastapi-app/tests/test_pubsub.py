@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.data.population.population_router import router, stream_populations
+from src.data.population.pubsub import SnapshotBroker, format_sse, snapshot_broker
+from src.data.population.snapshot_cache import PopulationSnapshot
+
+
+def snapshot(region_id, minute=0):
+    return PopulationSnapshot(datetime=datetime(2025, 4, 1, 9, minute), region_id=region_id, area_congest="보통")
+
+
+def test_publish_only_to_matching_subscribers():
+    broker = SnapshotBroker()
+    everything = broker.subscribe()
+    only_poi001 = broker.subscribe(["POI001"])
+    broker.publish([snapshot("POI001"), snapshot("POI002")])
+    assert everything.queue.qsize() == 2
+    assert [only_poi001.queue.get_nowait().region_id] == ["POI001"]
+
+
+def test_slow_subscriber_drops_oldest():
+    broker = SnapshotBroker()
+    subscription = broker.subscribe()
+    subscription.queue = type(subscription.queue)(maxsize=2)
+    broker.publish([snapshot("POI001", minute) for minute in (0, 5, 10)])
+    assert subscription.dropped == 1
+    assert subscription.queue.get_nowait().datetime.minute == 5
+
+
+def test_subscriber_limit_and_unsubscribe():
+    broker = SnapshotBroker(max_subscribers=1)
+    subscription = broker.subscribe(["POI001"])
+    with pytest.raises(OverflowError):
+        broker.subscribe()
+    broker.unsubscribe(subscription)
+    broker.unsubscribe(subscription)  # 두 번 불려도 안전
+    assert len(broker) == 0
+    broker.subscribe()
+
+
+def test_format_sse():
+    event = format_sse(snapshot("POI001", 5))
+    assert event.startswith(b"id: POI001:202504010905\nevent: snapshot\ndata: {")
+    assert event.endswith(b"\n\n")
+
+
+@pytest.mark.anyio
+async def test_stream_subscribes_before_response_starts():
+    before = len(snapshot_broker)
+    response = await stream_populations(region_ids=["POI001"])
+    # 본문이 시작되기 전에 이미 구독되어 있어, 동시에 들어온 요청도 최대치를 정확히 셈
+    assert len(snapshot_broker) == before + 1
+    # 본문을 읽지 못하고 연결이 끊겨도 background에서 해제
+    await response.background()
+    assert len(snapshot_broker) == before
+
+
+def test_stream_full_is_503(monkeypatch):
+    monkeypatch.setattr(snapshot_broker, "max_subscribers", 0)
+    app = FastAPI()
+    app.include_router(router)
+    response = TestClient(app).get("/populations/stream")
+    assert response.status_code == 503
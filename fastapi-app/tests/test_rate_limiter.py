@@ -0,0 +1,35 @@
+import asyncio
+import time
+
+import pytest
+
+from src.data.population.rate_limiter import TokenBucket
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_burst_up_to_capacity_without_waiting():
+    bucket = TokenBucket(rate=1, capacity=5)
+    started = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    assert time.monotonic() - started < 0.05
+
+
+async def test_waits_for_refill_after_burst():
+    bucket = TokenBucket(rate=20, capacity=1)
+    await bucket.acquire()
+    started = time.monotonic()
+    await bucket.acquire()
+    assert time.monotonic() - started >= 0.04  # 1 / 20초
+
+
+async def test_rate_zero_disables_limit():
+    bucket = TokenBucket(rate=0, capacity=1)
+    started = time.monotonic()
+    await asyncio.gather(*(bucket.acquire() for _ in range(100)))
+    assert time.monotonic() - started < 0.05
+
+
+def test_capacity_at_least_one():
+    assert TokenBucket(rate=1, capacity=0).capacity == 1
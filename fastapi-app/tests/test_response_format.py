@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+
+import httpx
+import orjson
+import pyarrow as pa
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
+from starlette.requests import Request
+
+from src.data.population import http_cache, population_router, response_format, snapshot_cache
+from src.data.population.poll_planner import KST
+from src.data.population.population_writer import insert_population_rows
+from src.data.population.response_format import (
+    ARROW_MEDIA_TYPE,
+    COLUMNAR_JSON_MEDIA_TYPE,
+    columnar_media_type,
+    orjson_response,
+)
+from src.data.population.snapshot_cache import LatestSnapshotStore
+
+START = datetime(2025, 4, 1, 9)
+
+
+def make_request(accept=None):
+    headers = [(b"accept", accept.encode())] if accept else []
+    return Request({"type": "http", "method": "GET", "path": "/populations/latest", "query_string": b"", "headers": headers})
+
+
+def make_rows(count=3):
+    return [
+        {
+            "datetime": START + timedelta(minutes=5 * i),
+            "region_id": "POI001",
+            "male_rate": 48.5,
+            "female_rate": None if i == 1 else 51.5,
+            "area_congest": "보통",
+            "congestion_message": "보통 메시지",
+            "min_population": 1000 + i,
+            "max_population": 1500 + i,
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+async def client(db, monkeypatch):
+    store = LatestSnapshotStore()
+    monkeypatch.setattr(snapshot_cache, "latest_snapshots", store)
+    monkeypatch.setattr(http_cache, "latest_snapshots", store)
+    monkeypatch.setattr(population_router, "latest_snapshots", store)
+    async with db.begin():
+        await insert_population_rows(db, make_rows())
+    app = FastAPI()
+    app.include_router(population_router.router)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        yield http
+
+
+@pytest.mark.parametrize("accept, media_type", [
+    (None, None),
+    ("application/json", None),
+    ("*/*", None),
+    (COLUMNAR_JSON_MEDIA_TYPE, COLUMNAR_JSON_MEDIA_TYPE),
+    (f"{ARROW_MEDIA_TYPE}, application/json;q=0.5", ARROW_MEDIA_TYPE),
+])
+def test_accept_negotiation(accept, media_type):
+    assert columnar_media_type(make_request(accept)) == media_type
+
+
+def test_arrow_without_pyarrow_is_406(monkeypatch):
+    monkeypatch.setattr(response_format, "ARROW_AVAILABLE", False)
+    with pytest.raises(HTTPException) as e:
+        columnar_media_type(make_request(ARROW_MEDIA_TYPE))
+    assert e.value.status_code == 406
+
+
+@pytest.mark.anyio
+async def test_columnar_json_round_trips_to_default_rows(client):
+    default = await client.get("/populations/region/POI001")
+    columnar = await client.get("/populations/region/POI001", headers={"Accept": COLUMNAR_JSON_MEDIA_TYPE})
+    assert default.headers["content-type"] == "application/json"
+    assert columnar.headers["content-type"] == COLUMNAR_JSON_MEDIA_TYPE
+    assert columnar.headers["vary"] == "Accept"
+    assert default.headers["etag"] != columnar.headers["etag"]  # 표현이 다르면 ETag도 다름
+    columns = columnar.json()["columns"]
+    assert [dict(zip(columns, values)) for values in zip(*columns.values())] == default.json()
+
+
+@pytest.mark.anyio
+async def test_arrow_stream_round_trips_to_default_rows(client):
+    default = (await client.get("/populations/region/POI001")).json()
+    response = await client.get("/populations/region/POI001", headers={"Accept": ARROW_MEDIA_TYPE})
+    assert response.headers["content-type"] == ARROW_MEDIA_TYPE
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == len(default) == 3
+    assert table.column_names == list(default[0])
+    rows = table.to_pylist()
+    for row, expected in zip(rows, default):
+        assert row.pop("datetime").replace(tzinfo=None).isoformat() == expected.pop("datetime")[:19]
+        assert row == expected
+
+
+@pytest.mark.anyio
+async def test_latest_supports_columnar_layouts(client):
+    default = (await client.get("/populations/latest")).json()
+    columns = (await client.get("/populations/latest", headers={"Accept": COLUMNAR_JSON_MEDIA_TYPE})).json()["columns"]
+    assert [dict(zip(columns, values)) for values in zip(*columns.values())] == default
+    arrow = await client.get("/populations/latest", headers={"Accept": ARROW_MEDIA_TYPE})
+    assert pa.ipc.open_stream(arrow.content).read_all().column("region_id").to_pylist() == ["POI001"]
+
+
+def test_orjson_response_serializes_datetimes_nan_none_and_dataclasses():
+    snapshot = snapshot_cache.PopulationSnapshot(datetime=START, region_id="POI001", male_rate=float("nan"))
+    response = orjson_response({
+        "naive": START,
+        "aware": START.replace(tzinfo=KST),
+        "nan": float("nan"),
+        "none": None,
+        "snapshot": snapshot,
+    })
+    assert response.media_type == "application/json"
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["vary"] == "Accept"
+    body = orjson.loads(response.body)
+    assert body["naive"] == "2025-04-01T09:00:00"  # 기존 JSON 응답(isoformat)과 같은 형식
+    assert body["aware"] == "2025-04-01T09:00:00+09:00"
+    assert body["nan"] is None and body["none"] is None  # NaN은 유효한 JSON인 null로
+    assert body["snapshot"]["region_id"] == "POI001" and body["snapshot"]["male_rate"] is None
+    assert orjson_response([], COLUMNAR_JSON_MEDIA_TYPE).media_type == COLUMNAR_JSON_MEDIA_TYPE
+
+
+def test_router_default_response_class_is_orjson():
+    assert population_router.router.default_response_class is ORJSONResponse
+    assert ORJSONResponse(content={"at": START, "nan": float("nan")}).body == b'{"at":"2025-04-01T09:00:00","nan":null}'
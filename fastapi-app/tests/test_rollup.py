@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from sqlalchemy.future import select
+
+from src.data.population.population_router import router
+from src.data.population.population_writer import insert_population_rows
+from src.data.population.rollup import (
+    SERIES_NAMES,
+    SERIES_RESOLUTION_HEADER,
+    choose_resolution,
+    series_query,
+    update_rollups,
+)
+from src.data.population.time_range import kst_now
+from src.model.population_rollup import PopulationDaily, PopulationHourly
+
+START = datetime(2025, 4, 1, 9)
+
+
+def make_rows(region_id="POI001", hours=2):
+    # 5분 간격, 혼잡도는 한 시간 안에서 보통 -> 붐빔 번갈아
+    return [
+        {
+            "datetime": START + timedelta(minutes=5 * i),
+            "region_id": region_id,
+            "male_rate": 40.0 + i % 12,
+            "female_rate": 60.0 - i % 12,
+            "area_congest": "보통" if i % 2 == 0 else "붐빔",
+            "min_population": 1000 + 10 * (i % 12),
+            "max_population": 1500 + 10 * (i % 12),
+        }
+        for i in range(12 * hours)
+    ]
+
+
+@pytest.mark.parametrize("span, resolution", [
+    (timedelta(hours=48), "raw"),
+    (timedelta(hours=49), "hourly"),
+    (timedelta(days=14), "hourly"),
+    (timedelta(days=15), "daily"),
+])
+def test_choose_resolution_auto(span, resolution):
+    assert choose_resolution(START, START + span) == resolution
+
+
+def test_choose_resolution_limits():
+    assert choose_resolution(START, START + timedelta(days=20), "raw") == "raw"
+    for span, resolution in [(timedelta(days=32), "raw"), (timedelta(days=401), "auto")]:
+        with pytest.raises(HTTPException) as e:
+            choose_resolution(START, START + span, resolution)
+        assert e.value.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_hourly_and_daily_rollups(db):
+    rows = make_rows()
+    async with db.begin():
+        await insert_population_rows(db, rows)
+        await update_rollups(db, rows)
+
+    hourly = (await db.execute(select(PopulationHourly).order_by(PopulationHourly.bucket))).scalars().all()
+    assert [row.bucket.replace(tzinfo=None) for row in hourly] == [START, START + timedelta(hours=1)]
+    first = hourly[0]
+    assert first.samples == 12
+    assert (first.min_population_min, first.min_population_max) == (1000, 1110)
+    assert first.min_population_avg == pytest.approx(1055)
+    assert first.male_rate_min == pytest.approx(40.0) and first.male_rate_max == pytest.approx(51.0)
+    assert (first.congest_normal, first.congest_busy, first.congest_relaxed) == (6, 6, 0)
+
+    daily = (await db.execute(select(PopulationDaily))).scalars().one()
+    assert daily.bucket.replace(tzinfo=None) == datetime(2025, 4, 1)
+    assert daily.samples == 24
+    assert daily.min_population_avg == pytest.approx(1055)
+
+
+@pytest.mark.anyio
+async def test_rollup_recomputes_bucket_with_late_rows(db):
+    rows = make_rows(hours=1)
+    async with db.begin():
+        await insert_population_rows(db, rows[:6])
+        await update_rollups(db, rows[:6])
+    async with db.begin():
+        await insert_population_rows(db, rows[6:])
+        await update_rollups(db, rows[6:])
+    hourly = (await db.execute(select(PopulationHourly))).scalars().one()
+    assert hourly.samples == 12
+
+
+@pytest.mark.anyio
+async def test_series_query_columns_match_across_resolutions(db):
+    rows = make_rows()
+    async with db.begin():
+        await insert_population_rows(db, rows)
+        await update_rollups(db, rows)
+    end = START + timedelta(hours=2)
+    raw = (await db.execute(series_query("POI001", START, end, "raw"))).all()
+    hourly = (await db.execute(series_query("POI001", START + timedelta(minutes=30), end, "hourly"))).all()
+    assert tuple(raw[0]._fields) == tuple(hourly[0]._fields) == SERIES_NAMES
+    assert len(raw) == 24
+    assert len(hourly) == 2  # 시작 시각은 구간 시작으로 내림
+    shares = dict(zip(SERIES_NAMES, hourly[0]))
+    assert shares["congest_busy_share"] == pytest.approx(0.5)
+
+
+@pytest.mark.anyio
+async def test_series_endpoint_accepts_tz_aware_bounds(db):
+    rows = make_rows()
+    async with db.begin():
+        await insert_population_rows(db, rows)
+        await update_rollups(db, rows)
+    app = FastAPI()
+    app.include_router(router)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        # start만 시간대와 함께 주고 end는 생략 (tz 없는 현재 시각과 비교)
+        response = await client.get("/populations/series", params={"region_id": "POI001", "start": "2025-04-01T00:00:00Z"})
+        assert response.status_code == 400  # 범위 초과 (비교 오류로 500이 나지 않음)
+        response = await client.get("/populations/series", params={
+            "region_id": "POI001", "start": "2025-04-01T00:00:00Z", "end": "2025-04-01T10:00:00+09:00",
+        })
+    assert response.status_code == 200
+    assert response.headers[SERIES_RESOLUTION_HEADER] == "raw"
+    body = response.json()
+    # 00:00Z = 09:00 KST 부터 10:00 KST 까지 (양 끝 포함)
+    assert len(body) == 13
+    assert body[0]["datetime"].startswith("2025-04-01T09:00")
+
+
+@pytest.mark.anyio
+async def test_series_default_end_is_kst_now_on_utc_host(db, utc_local_clock):
+    # 최근 데이터 (KST 기준 10분 전, 5분 전). UTC 시각 기준이면 9시간 뒤의 미래 데이터로 보여 빠짐
+    now = kst_now().replace(second=0, microsecond=0)
+    rows = [{**row, "datetime": now - timedelta(minutes=10 - 5 * i)} for i, row in enumerate(make_rows()[:2])]
+    async with db.begin():
+        await insert_population_rows(db, rows)
+    app = FastAPI()
+    app.include_router(router)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/populations/series", params={"region_id": "POI001"})
+    assert response.status_code == 200
+    assert response.headers[SERIES_RESOLUTION_HEADER] == "raw"
+    assert len(response.json()) == 2
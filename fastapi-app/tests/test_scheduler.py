@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from src.data.population.scheduler import run_cycle
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_slow_area_does_not_block_other_workers():
+    delays = {"slow": 0.3, "a": 0.01, "b": 0.01, "c": 0.01}
+
+    async def handler(area):
+        await asyncio.sleep(delays[area])
+        return area
+
+    report = await run_cycle(list(delays), handler, concurrency=2, area_timeout=1, cycle_deadline=5)
+    assert sorted(r.result for r in report.by_status("ok")) == sorted(delays)
+    # 느린 지역 하나가 슬롯 하나만 차지하므로 전체 시간은 느린 지역 처리 시간과 비슷
+    assert report.makespan < 0.45
+
+
+async def test_area_timeout_and_error_are_reported():
+    async def handler(area):
+        if area == "hang":
+            await asyncio.sleep(5)
+        if area == "boom":
+            raise ValueError("bad payload")
+        return area
+
+    report = await run_cycle(["hang", "boom", "ok"], handler, concurrency=3, area_timeout=0.05, cycle_deadline=5)
+    assert [r.area_name for r in report.by_status("timeout")] == ["hang"]
+    assert report.by_status("error")[0].error == "bad payload"
+    assert [r.area_name for r in report.by_status("ok")] == ["ok"]
+
+
+async def test_cycle_deadline_skips_unstarted_areas():
+    async def handler(area):
+        await asyncio.sleep(0.1)
+
+    report = await run_cycle(["a", "b", "c", "d"], handler, concurrency=1, area_timeout=1, cycle_deadline=0.15)
+    # 첫 지역은 완료, 두 번째는 남은 시간만큼만 실행되어 타임아웃, 나머지는 시작하지 않음
+    assert [r.area_name for r in report.by_status("ok")] == ["a"]
+    assert [r.area_name for r in report.by_status("timeout")] == ["b"]
+    assert report.skipped == ["c", "d"]
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.data.population import snapshot_cache
+from src.data.population.population_writer import insert_population_rows
+from src.data.population.snapshot_cache import LatestSnapshotStore, PopulationSnapshot, get_latest_snapshot
+
+START = datetime(2025, 4, 1, 9)
+
+
+def make_row(region_id, minutes, level="보통"):
+    return {
+        "datetime": START + timedelta(minutes=minutes),
+        "region_id": region_id,
+        "male_rate": 48.5,
+        "area_congest": level,
+        "congestion_message": f"{level} 메시지",
+        "min_population": 1000 + minutes,
+        "max_population": 1500 + minutes,
+    }
+
+
+def test_update_many_writes_through_and_keeps_newest():
+    store = LatestSnapshotStore()
+    changed = store.update_many([make_row("POI001", 0), make_row("POI001", 5), make_row("POI002", 0)])
+    assert sorted(snapshot.region_id for snapshot in changed) == ["POI001", "POI002"]
+    assert store.get("POI001").datetime == START + timedelta(minutes=5)
+    assert store.get("POI001").congestion_message == "보통 메시지"
+    # 늦게 도착한 과거 데이터로 덮어쓰지 않음
+    assert store.update_many([make_row("POI001", 0, "붐빔")]) == []
+    assert store.get("POI001").area_congest == "보통"
+    assert store.get_many(["POI002", "POI999"]).keys() == {"POI002"}
+    assert store.newest_datetime == START + timedelta(minutes=5)
+
+
+def test_expected_next_update_uses_last_interval():
+    store = LatestSnapshotStore()
+    default = timedelta(minutes=5)
+    assert store.expected_next_update("POI001", default) is None
+    store.update_many([make_row("POI001", 0)])
+    assert store.expected_next_update("POI001", default) == START + default
+    store.update_many([make_row("POI001", 10)])
+    assert store.expected_next_update("POI001", default) == START + timedelta(minutes=20)
+
+
+def test_listeners_get_changed_snapshots_and_errors_are_isolated():
+    store = LatestSnapshotStore()
+    changed_calls, row_calls = [], []
+
+    def broken(snapshots):
+        raise RuntimeError("listener failed")
+
+    store.add_listener(broken)
+    store.add_listener(changed_calls.append)
+    store.add_row_listener(row_calls.append)
+    store.update_many([make_row("POI001", 0), make_row("POI001", 5)])
+    assert [[snapshot.region_id for snapshot in call] for call in changed_calls] == [["POI001"]]
+    assert len(row_calls[0]) == 2  # 행 리스너는 저장된 행 전체
+    # 바뀐 지역이 없으면 변경 리스너는 호출하지 않음
+    store.update_many([make_row("POI001", 5)])
+    assert len(changed_calls) == 1
+
+
+@pytest.mark.anyio
+async def test_warm_and_refresh_pick_up_rows_from_other_processes(db):
+    from src.data.database import AsyncSessionLocal
+
+    async with db.begin():
+        await insert_population_rows(db, [make_row("POI001", 0), make_row("POI002", 0), make_row("POI001", 5)])
+    store = LatestSnapshotStore()
+    row_calls = []
+    store.add_row_listener(row_calls.append)
+    await store.warm(AsyncSessionLocal)
+    assert store.warmed and len(store) == 2
+    assert store.get("POI001").datetime.replace(tzinfo=None) == START + timedelta(minutes=5)
+    assert row_calls == []  # warm은 이미 반영된 과거 행이므로 행 리스너에 넘기지 않음
+
+    # 다른 프로세스가 저장한 행
+    async with db.begin():
+        await insert_population_rows(db, [make_row("POI002", 5, "붐빔"), make_row("POI002", 10, "붐빔")])
+    changed = await store.refresh(AsyncSessionLocal)
+    assert [snapshot.region_id for snapshot in changed] == ["POI002"]
+    assert store.get("POI002").datetime.replace(tzinfo=None) == START + timedelta(minutes=10)
+    assert store.get("POI002").congestion_message == "붐빔 메시지"
+    assert [snapshot.datetime.replace(tzinfo=None) for snapshot in row_calls[0]] == sorted(
+        snapshot.datetime.replace(tzinfo=None) for snapshot in row_calls[0]
+    )
+
+
+@pytest.mark.anyio
+async def test_refresh_on_empty_store_warms(db):
+    from src.data.database import AsyncSessionLocal
+
+    async with db.begin():
+        await insert_population_rows(db, [make_row("POI001", 0)])
+    store = LatestSnapshotStore()
+    assert [snapshot.region_id for snapshot in await store.refresh(AsyncSessionLocal)] == ["POI001"]
+    assert store.warmed
+
+
+@pytest.mark.anyio
+async def test_get_latest_snapshot_falls_back_to_db(db, monkeypatch):
+    store = LatestSnapshotStore()
+    monkeypatch.setattr(snapshot_cache, "latest_snapshots", store)
+    async with db.begin():
+        await insert_population_rows(db, [make_row("POI001", 0), make_row("POI001", 5)])
+
+    snapshot = await get_latest_snapshot(db, "POI001")
+    assert snapshot.datetime.replace(tzinfo=None) == START + timedelta(minutes=5)
+    assert store.get("POI001") == snapshot  # DB에서 읽은 값은 저장소에 넣음
+    assert await get_latest_snapshot(db, "POI999") is None
+
+    # 저장소에 있으면 DB를 보지 않음
+    cached = PopulationSnapshot(datetime=START + timedelta(hours=1), region_id="POI003")
+    store.put(cached)
+    assert await get_latest_snapshot(db, "POI003") is cached
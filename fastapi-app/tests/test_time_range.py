@@ -0,0 +1,76 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from src.data.population.time_range import DEFAULT_WINDOW, build_time_ranges, kst_now, to_kst_naive
+
+NOW = datetime(2025, 4, 10, 18, 30)
+
+
+def test_default_is_last_hour():
+    assert build_time_ranges(now=NOW) == [(NOW - DEFAULT_WINDOW, NOW)]
+
+
+def test_explicit_range_and_missing_side():
+    start = datetime(2025, 4, 1, 9)
+    assert build_time_ranges(start, start + timedelta(hours=2), now=NOW) == [(start, start + timedelta(hours=2))]
+    assert build_time_ranges(start=NOW - timedelta(minutes=10), now=NOW) == [(NOW - timedelta(minutes=10), NOW)]
+    assert build_time_ranges(end=start, now=NOW) == [(start - DEFAULT_WINDOW, start)]
+
+
+def test_explicit_range_repeated_over_days():
+    start, end = datetime(2025, 4, 10, 9), datetime(2025, 4, 10, 10)
+    ranges = build_time_ranges(start, end, days=3, now=NOW)
+    assert ranges == [(start - timedelta(days=k), end - timedelta(days=k)) for k in range(3)]
+
+
+def test_same_clock_range_over_days():
+    ranges = build_time_ranges(start_time="18:00", end_time="19:00", days=2, now=NOW)
+    assert ranges == [
+        (datetime(2025, 4, 10, 18), datetime(2025, 4, 10, 19)),
+        (datetime(2025, 4, 9, 18), datetime(2025, 4, 9, 19)),
+    ]
+
+
+def test_clock_range_across_midnight():
+    assert build_time_ranges(start_time="23:30", end_time="00:30", now=NOW) == [
+        (datetime(2025, 4, 9, 23, 30), datetime(2025, 4, 10, 0, 30)),
+    ]
+
+
+def test_clock_range_defaults():
+    # end_time 생략: 현재 시각, start_time 생략: end_time 60분 전
+    assert build_time_ranges(start_time="18:00", now=NOW) == [(datetime(2025, 4, 10, 18), NOW)]
+    assert build_time_ranges(end_time="09:00", now=NOW) == [(datetime(2025, 4, 10, 8), datetime(2025, 4, 10, 9))]
+
+
+def test_tz_aware_values_are_converted_to_kst():
+    start = datetime(2025, 4, 10, 0, 0, tzinfo=timezone.utc)  # 09:00 KST
+    assert to_kst_naive(start) == datetime(2025, 4, 10, 9)
+    assert to_kst_naive(NOW) == NOW
+    # tz 있는 start와 tz 없는 현재 시각을 섞어도 비교 오류 없이 계산
+    assert build_time_ranges(start=start, now=NOW) == [(datetime(2025, 4, 10, 9), NOW)]
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"days": 0},
+    {"days": 32},
+    {"start": NOW, "end": NOW - timedelta(minutes=1)},
+    {"start_time": "25:00"},
+])
+def test_invalid_values_are_400(kwargs):
+    with pytest.raises(HTTPException) as e:
+        build_time_ranges(now=NOW, **kwargs)
+    assert e.value.status_code == 400
+
+
+def test_default_now_is_kst_on_utc_host(utc_local_clock):
+    # 저장된 datetime은 KST이므로 UTC 서버에서도 최근 60분은 KST 기준이어야 함
+    assert time.localtime().tm_gmtoff == 0
+    expected = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=9)
+    [(start, end)] = build_time_ranges()
+    assert abs((end - expected).total_seconds()) < 5
+    assert end - start == DEFAULT_WINDOW
+    assert abs((kst_now() - expected).total_seconds()) < 5